@@ -0,0 +1,49 @@
+"""Add quote_daily_popularity rollup table
+
+Revision ID: 8f2d41c7a9b3
+Revises: 344950a73d7c
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d41c7a9b3'
+down_revision: Union[str, Sequence[str], None] = '344950a73d7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('quote_daily_popularity',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('source_type', sa.String(length=20), nullable=False),
+    sa.Column('quote_id', sa.Integer(), nullable=False),
+    sa.Column('bookmark_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['quote_id'], ['quotes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('date', 'source_type', 'quote_id')
+    )
+    op.create_index('ix_quote_daily_popularity_lookup', 'quote_daily_popularity', ['source_type', 'date', 'bookmark_count'], unique=False)
+
+    # 기존 북마크로 집계 테이블 채우기 (backfill)
+    op.execute(
+        """
+        INSERT INTO quote_daily_popularity (date, source_type, quote_id, bookmark_count)
+        SELECT DATE(b.created_at), s.source_type, b.quote_id, COUNT(*)
+        FROM bookmarks b
+        JOIN quotes q ON q.id = b.quote_id
+        JOIN sources s ON s.id = q.source_id
+        GROUP BY DATE(b.created_at), s.source_type, b.quote_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_quote_daily_popularity_lookup', table_name='quote_daily_popularity')
+    op.drop_table('quote_daily_popularity')
@@ -0,0 +1,38 @@
+"""Add trending_scores snapshot table
+
+Revision ID: a7d2e94b1c63
+Revises: f3c8d1e6a952
+Create Date: 2026-10-18 18:34:51.207719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e94b1c63'
+down_revision: Union[str, Sequence[str], None] = 'f3c8d1e6a952'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'trending_scores',
+        sa.Column('scope', sa.String(length=40), nullable=False),
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key'),
+    )
+    op.create_index('ix_trending_scores_updated_at', 'trending_scores', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trending_scores_updated_at', table_name='trending_scores')
+    op.drop_table('trending_scores')
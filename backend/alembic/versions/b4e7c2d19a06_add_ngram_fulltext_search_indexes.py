@@ -0,0 +1,46 @@
+"""Add ngram FULLTEXT indexes for search
+
+Revision ID: b4e7c2d19a06
+Revises: 8f2d41c7a9b3
+Create Date: 2026-10-18 14:03:27.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e7c2d19a06'
+down_revision: Union[str, Sequence[str], None] = '8f2d41c7a9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (인덱스 이름, 테이블, 컬럼) - 한국어는 공백 단위 토큰화가 안 맞으므로 ngram 파서 사용
+FULLTEXT_INDEXES = [
+    ('ft_quotes_content', 'quotes', ['content']),
+    ('ft_tags_name', 'tags', ['name']),
+    ('ft_sources_title_creator', 'sources', ['title', 'creator']),
+    ('ft_books_author', 'books', ['author']),
+    ('ft_movies_director', 'movies', ['director']),
+    ('ft_producers_name', 'producers', ['name']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FULLTEXT ... WITH PARSER ngram 은 MySQL 전용. 다른 DB에서는 리포지토리가 ILIKE 검색으로 동작함
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, table, columns in FULLTEXT_INDEXES:
+        op.execute(f"CREATE FULLTEXT INDEX {name} ON {table} ({', '.join(columns)}) WITH PARSER ngram")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, table, _ in reversed(FULLTEXT_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,33 @@
+"""Add registry_versions for in-memory registries
+
+Revision ID: b9e4f27c0d15
+Revises: a7d2e94b1c63
+Create Date: 2026-10-18 19:21:37.640183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4f27c0d15'
+down_revision: Union[str, Sequence[str], None] = 'a7d2e94b1c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'registry_versions',
+        sa.Column('name', sa.String(length=40), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('registry_versions')
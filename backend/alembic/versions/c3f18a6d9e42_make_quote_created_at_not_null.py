@@ -0,0 +1,41 @@
+"""Make quotes.created_at NOT NULL
+
+Revision ID: c3f18a6d9e42
+Revises: b9e4f27c0d15
+Create Date: 2026-10-18 21:04:52.318407
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f18a6d9e42'
+down_revision: Union[str, Sequence[str], None] = 'b9e4f27c0d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 커서 페이지((created_at, id) keyset)는 NULL을 인코딩/비교할 수 없으므로 채워 둠 (backfill).
+    # 가장 오래된 문장 시각으로 채워서 최신순 목록의 맨 뒤에 오게 함 (문장이 모두 NULL이면 현재 시각)
+    oldest = op.get_bind().execute(sa.text("SELECT MIN(created_at) FROM quotes")).scalar()
+    op.execute(
+        sa.text("UPDATE quotes SET created_at = COALESCE(:oldest, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+        .bindparams(sa.bindparam('oldest', oldest, type_=sa.DateTime()))
+    )
+    op.alter_column('quotes', 'created_at',
+               existing_type=sa.DateTime(),
+               existing_server_default=sa.text('now()'),
+               nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('quotes', 'created_at',
+               existing_type=sa.DateTime(),
+               existing_server_default=sa.text('now()'),
+               nullable=True)
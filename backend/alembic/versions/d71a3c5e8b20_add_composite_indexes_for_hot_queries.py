@@ -0,0 +1,66 @@
+"""Add composite indexes for hot repository queries
+
+Revision ID: d71a3c5e8b20
+Revises: b4e7c2d19a06
+Create Date: 2026-10-18 16:21:09.384512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71a3c5e8b20'
+down_revision: Union[str, Sequence[str], None] = 'b4e7c2d19a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (인덱스 이름, 테이블, 컬럼) - 리포지토리 쿼리의 WHERE/ORDER BY 모양 그대로. scripts/check_query_plans.py로 확인
+INDEXES = [
+    ('ix_bookmarks_user_created', 'bookmarks', ['user_id', 'created_at']),
+    ('ix_bookmarks_created_quote', 'bookmarks', ['created_at', 'quote_id']),
+    ('ix_quotes_user_created', 'quotes', ['user_id', 'created_at']),
+    ('ix_quotes_source_id', 'quotes', ['source_id']),
+    ('ix_sources_source_type', 'sources', ['source_type']),
+    ('ix_sources_title_creator', 'sources', ['title', 'creator']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def _restore_fk_indexes() -> None:
+    """MySQL: upgrade 때 새 인덱스로 대체(자동 삭제)된 FK의 암묵적 인덱스를 되살림.
+
+    FK가 쓰는 인덱스는 삭제가 거부되므로 아래 인덱스를 지우기 전에 만들어야 함. 이름은 MySQL이 FK를
+    만들 때 붙이는 것과 같은 FK 제약 이름으로 두어서, downgrade 후 상태가 upgrade 전과 같아지게 함
+    (대체 인덱스가 이미 있으면 아무것도 만들지 않음).
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    inspector = sa.inspect(bind)
+    dropping = {name for name, _, _ in INDEXES}
+    for table in dict.fromkeys(table for _, table, _ in INDEXES):
+        leading_columns = {
+            index['column_names'][0] for index in inspector.get_indexes(table) if index['name'] not in dropping
+        }
+        leading_columns.update(inspector.get_pk_constraint(table)['constrained_columns'][:1])
+        for fk in inspector.get_foreign_keys(table):
+            column = fk['constrained_columns'][0]
+            if column not in leading_columns:
+                op.create_index(fk['name'], table, [column], unique=False)
+                leading_columns.add(column)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _restore_fk_indexes()
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
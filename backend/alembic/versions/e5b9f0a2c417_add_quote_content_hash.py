@@ -0,0 +1,65 @@
+"""Add quotes.content_hash for AI quote deduplication
+
+Revision ID: e5b9f0a2c417
+Revises: d71a3c5e8b20
+Create Date: 2026-10-18 17:02:44.910238
+
+"""
+import hashlib
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9f0a2c417'
+down_revision: Union[str, Sequence[str], None] = 'd71a3c5e8b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def content_hash(content: str) -> str:
+    # app.repositories.quote.content_hash 와 같은 규칙 (마이그레이션은 앱 코드에 의존하지 않도록 복사)
+    normalized = " ".join(unicodedata.normalize("NFC", content or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quotes', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # 백필: 같은 내용이 여러 행이면 기존 중복 검사(ORDER BY id DESC)가 고르던 최신 행을 대표로 지정
+    bind = op.get_bind()
+    seen = set()
+    updates = []
+    last_id = None
+    while True:
+        query = "SELECT id, content FROM quotes"
+        params = {"limit": BATCH_SIZE}
+        if last_id is not None:
+            query += " WHERE id < :last_id"
+            params["last_id"] = last_id
+        rows = bind.execute(sa.text(query + " ORDER BY id DESC LIMIT :limit"), params).all()
+        if not rows:
+            break
+        for id, content in rows:
+            digest = content_hash(content)
+            if digest not in seen:
+                seen.add(digest)
+                updates.append({"id": id, "content_hash": digest})
+        last_id = rows[-1][0]
+        if updates:
+            bind.execute(sa.text("UPDATE quotes SET content_hash = :content_hash WHERE id = :id"), updates)
+            updates = []
+
+    op.create_index('uq_quotes_content_hash', 'quotes', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_quotes_content_hash', table_name='quotes')
+    op.drop_column('quotes', 'content_hash')
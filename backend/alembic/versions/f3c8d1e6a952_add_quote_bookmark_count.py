@@ -0,0 +1,38 @@
+"""Add denormalized quotes.bookmark_count
+
+Revision ID: f3c8d1e6a952
+Revises: e5b9f0a2c417
+Create Date: 2026-10-18 17:48:12.556031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8d1e6a952'
+down_revision: Union[str, Sequence[str], None] = 'e5b9f0a2c417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quotes', sa.Column('bookmark_count', sa.Integer(), server_default='0', nullable=False))
+
+    # 기존 북마크로 채우기 (backfill)
+    op.execute(
+        """
+        UPDATE quotes
+        SET bookmark_count = (SELECT COUNT(*) FROM bookmarks b WHERE b.quote_id = quotes.id)
+        """
+    )
+    op.create_index('ix_quotes_bookmark_count', 'quotes', ['bookmark_count'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_quotes_bookmark_count', table_name='quotes')
+    op.drop_column('quotes', 'bookmark_count')
@@ -0,0 +1,96 @@
+import logging
+import os
+import sys
+
+from fastapi import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Add project root llm folder to sys.path for llm import
+LLM_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../llm"))
+if LLM_DIR not in sys.path:
+    sys.path.append(LLM_DIR)
+
+AI_IMPORT_ERROR = None
+try:
+    from ai_service import AIService
+    from aladin_cache import AladinCache
+except ImportError as e:
+    logger.error(f"Could not import AIService from llm folder: {e}")
+    AI_IMPORT_ERROR = e
+    AIService = None
+
+
+def build_ai_service(http_session=None):
+    """AIService를 설정값으로 생성합니다. AI_BACKEND=fake이면 Vertex/알라딘 대신 가짜 클라이언트를 사용합니다."""
+    if AIService is None:
+        return None
+
+    vertex_client = aladin_client = None
+    if settings.ai_backend == "fake":
+        from fake_clients import FakeAladinClient, FakeVertexAIClient
+
+        vertex_client = FakeVertexAIClient(
+            seed=settings.fake_ai_seed,
+            latency_ms=settings.fake_ai_latency_ms,
+            latency_sigma=settings.fake_ai_latency_sigma,
+            error_rate=settings.fake_ai_error_rate,
+            malformed_rate=settings.fake_ai_malformed_rate,
+        )
+        aladin_client = FakeAladinClient(
+            seed=settings.fake_ai_seed,
+            latency_ms=settings.fake_aladin_latency_ms,
+            error_rate=settings.fake_aladin_error_rate,
+        )
+        logger.info("AIService uses fake Vertex/Aladin clients (AI_BACKEND=fake).")
+
+    return AIService(
+        project_id=settings.google_project_id,
+        location="us-central1",  # Force us-central1
+        aladin_api_key=settings.aladin_api_key,
+        http_session=http_session,
+        aladin_cache=AladinCache(
+            settings.aladin_cache_path,
+            hit_ttl=settings.aladin_cache_ttl_days * 24 * 60 * 60,
+            miss_ttl=settings.aladin_negative_cache_ttl_hours * 60 * 60,
+        ),
+        vertex_options=settings.vertex_client_options(),
+        vertex_client=vertex_client,
+        aladin_client=aladin_client,
+    )
+
+
+def init_ai_services(state, http_session=None):
+    """앱 전체에서 공유할 AIService / AIRecommendationService를 한 번만 생성해 app.state에 저장합니다."""
+    from app.services.ai_recommendation_service import AIRecommendationService
+
+    if getattr(state, "ai_service", None) is None:
+        state.ai_service = build_ai_service(http_session=http_session)
+    elif http_session is not None:
+        state.ai_service.set_http_session(http_session)
+    if getattr(state, "ai_rec_service", None) is None:
+        state.ai_rec_service = AIRecommendationService(state.ai_service)
+    return state.ai_service
+
+
+async def close_ai_services(state):
+    ai_service = getattr(state, "ai_service", None)
+    if ai_service is not None:
+        await ai_service.close()
+    state.ai_service = None
+    state.ai_rec_service = None
+
+
+def get_ai_service(request: Request):
+    """공유 AIService 의존성. lifespan을 거치지 않은 경우(테스트 등)에는 첫 요청 시 생성합니다."""
+    state = request.app.state
+    if getattr(state, "ai_rec_service", None) is None:
+        init_ai_services(state)
+    return state.ai_service
+
+
+def get_ai_recommendation_service(request: Request):
+    get_ai_service(request)
+    return request.app.state.ai_rec_service
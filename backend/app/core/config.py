@@ -2,6 +2,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 import os
 import sys
+import tempfile
 
 
 class Settings(BaseSettings):
@@ -12,13 +13,73 @@ class Settings(BaseSettings):
     # 동기 DB URL
     sync_database_url: str = Field(..., alias="SYNC_DATABASE_URL")
 
+    # 서버 시작 시 DB 생성 + alembic upgrade 실행 여부.
+    # Cloud Run 등에서는 false로 두고 배포 단계에서 `python migrate.py`를 한 번 실행 (콜드 스타트 단축)
+    run_migrations_on_startup: bool = Field(True, alias="RUN_MIGRATIONS_ON_STARTUP")
+
+    # 검색 백엔드: "db"(기본, FULLTEXT/ILIKE) 또는 "memory"(시작 시 빌드하는 인메모리 역색인)
+    search_backend: str = Field("db", alias="SEARCH_BACKEND")
+    # memory 백엔드 재빌드 주기(초). 다른 워커의 쓰기를 반영. 0이면 재빌드 안 함
+    search_index_refresh_seconds: float = Field(0, alias="SEARCH_INDEX_REFRESH_SECONDS")
+    # 검색 하위 쿼리(문장/출처/태그) 동시 실행 시간 제한(초). 넘기면 부분 결과(partial=true) 반환. 0이면 제한 없음
+    search_timeout_seconds: float = Field(2.0, alias="SEARCH_TIMEOUT_SECONDS")
+    # 검색 결과 캐시: "memory"(단일 워커 전용, 무효화 버전도 워커별), "sqlite"(로컬 파일, 여러 워커가 공유) 또는 "off"
+    search_cache_backend: str = Field("memory", alias="SEARCH_CACHE_BACKEND")
+    search_cache_path: str = Field(
+        os.path.join(tempfile.gettempdir(), "search_cache.sqlite3"), alias="SEARCH_CACHE_PATH"
+    )
+    search_cache_ttl_seconds: float = Field(60, alias="SEARCH_CACHE_TTL_SECONDS")
+    search_cache_max_entries: int = Field(1000, alias="SEARCH_CACHE_MAX_ENTRIES")
+    # 자동완성 트라이 재빌드 주기(초). 다른 워커의 출처/태그 쓰기와 문장 수 변화를 반영. 0이면 재빌드 안 함
+    suggest_refresh_seconds: float = Field(300, alias="SUGGEST_REFRESH_SECONDS")
+
+    # 트렌딩 점수 반감기(시간)와 DB 스냅샷 주기(초). 스냅샷이 0이면 워커 메모리에만 유지
+    trending_half_life_hours: float = Field(24, alias="TRENDING_HALF_LIFE_HOURS")
+    trending_snapshot_seconds: float = Field(300, alias="TRENDING_SNAPSHOT_SECONDS")
+    # 태그 레지스트리가 다른 워커의 태그 변경(registry_versions)을 확인하는 주기(초). 0이면 확인 안 함
+    tag_registry_sync_seconds: float = Field(5, alias="TAG_REGISTRY_SYNC_SECONDS")
+    # 랜덤 문장 샘플러의 source_type별 id 배열 재로드 주기(초)
+    quote_sampler_refresh_seconds: float = Field(300, alias="QUOTE_SAMPLER_REFRESH_SECONDS")
+
     # Google Vertex AI 설정
     google_project_id: str = Field(..., alias="GOOGLE_PROJECT_ID")
     google_location: str = Field("us-central1", alias="GOOGLE_LOCATION")
     google_application_credentials: str | None = Field(None, alias="GOOGLE_APPLICATION_CREDENTIALS")
+
+    # AI 백엔드 선택: "vertex"(기본) 또는 "fake"(부하 테스트용 가짜 Vertex/알라딘 클라이언트)
+    ai_backend: str = Field("vertex", alias="AI_BACKEND")
+    fake_ai_seed: int = Field(0, alias="FAKE_AI_SEED")
+    fake_ai_latency_ms: float = Field(800, alias="FAKE_AI_LATENCY_MS")
+    fake_ai_latency_sigma: float = Field(0.5, alias="FAKE_AI_LATENCY_SIGMA")
+    fake_ai_error_rate: float = Field(0.0, alias="FAKE_AI_ERROR_RATE")
+    fake_ai_malformed_rate: float = Field(0.0, alias="FAKE_AI_MALFORMED_RATE")
+    fake_aladin_latency_ms: float = Field(150, alias="FAKE_ALADIN_LATENCY_MS")
+    fake_aladin_error_rate: float = Field(0.0, alias="FAKE_ALADIN_ERROR_RATE")
+
+    # Vertex AI 호출 보호 설정 (동시성 제한, 토큰 버킷, 재시도, 서킷 브레이커)
+    vertex_max_concurrency: int = Field(8, alias="VERTEX_MAX_CONCURRENCY")
+    vertex_rate_per_second: float = Field(5, alias="VERTEX_RATE_PER_SECOND")
+    vertex_burst: int = Field(10, alias="VERTEX_BURST")
+    vertex_max_retries: int = Field(2, alias="VERTEX_MAX_RETRIES")
+    vertex_request_timeout: float = Field(30, alias="VERTEX_REQUEST_TIMEOUT")
+    vertex_breaker_failure_threshold: int = Field(5, alias="VERTEX_BREAKER_FAILURE_THRESHOLD")
+    vertex_breaker_reset_timeout: float = Field(30, alias="VERTEX_BREAKER_RESET_TIMEOUT")
     
     # Aladin API 설정
     aladin_api_key: str = Field("", alias="ALADIN_API_KEY")
+    # 알라딘 표지/링크 영속 캐시 (로컬 SQLite 파일, 미검색 결과도 negative cache로 저장)
+    aladin_cache_path: str = Field(
+        os.path.join(tempfile.gettempdir(), "aladin_cache.sqlite3"), alias="ALADIN_CACHE_PATH"
+    )
+    aladin_cache_ttl_days: float = Field(30, alias="ALADIN_CACHE_TTL_DAYS")
+    aladin_negative_cache_ttl_hours: float = Field(24, alias="ALADIN_NEGATIVE_CACHE_TTL_HOURS")
+
+    # 외부 API 공용 HTTP 커넥션 풀 설정 (llm/ 클라이언트가 공유)
+    http_pool_limit: int = Field(100, alias="HTTP_POOL_LIMIT")
+    http_pool_limit_per_host: int = Field(20, alias="HTTP_POOL_LIMIT_PER_HOST")
+    http_keepalive_timeout: float = Field(30, alias="HTTP_KEEPALIVE_TIMEOUT")
+    http_dns_cache_ttl: int = Field(300, alias="HTTP_DNS_CACHE_TTL")
+    http_timeout: float = Field(10, alias="HTTP_TIMEOUT")
 
     secret_key: str = Field(..., alias="SECRET_KEY")
     jwt_algo: str = Field("HS256", alias="ALGORITHM")
@@ -26,6 +87,18 @@ class Settings(BaseSettings):
         30, alias="ACCESS_TOKEN_EXPIRE_MINUTES"
     )  # 30분
 
+    def vertex_client_options(self) -> dict:
+        """VertexAIClient keyword arguments built from the VERTEX_* settings."""
+        return {
+            "max_concurrency": self.vertex_max_concurrency,
+            "rate_per_second": self.vertex_rate_per_second,
+            "burst": self.vertex_burst,
+            "max_retries": self.vertex_max_retries,
+            "request_timeout": self.vertex_request_timeout,
+            "breaker_failure_threshold": self.vertex_breaker_failure_threshold,
+            "breaker_reset_timeout": self.vertex_breaker_reset_timeout,
+        }
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), ".env"),
         case_sensitive=True,
@@ -0,0 +1,52 @@
+import unicodedata
+
+# 한글 음절 분해 (유니코드 조합형: 가 = 0xAC00, 초성 19 x 중성 21 x 종성 28)
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"]
+
+# 겹모음/겹받침은 입력 순서대로 풀어 둠 (ㅘ = ㅗ + ㅏ). 타이핑 중인 "오"도 "왕"의 접두어가 되도록
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def is_syllable(char: str) -> bool:
+    return HANGUL_BASE <= ord(char) <= HANGUL_END
+
+
+def is_choseong_only(text: str) -> bool:
+    """"ㅇㅁㄴ"처럼 자음(초성)만으로 된 입력인지 (공백 무시)."""
+    chars = [c for c in text if not c.isspace()]
+    return bool(chars) and all(c in CHOSEONG for c in chars)
+
+
+def normalize(text: str) -> str:
+    # NFKC는 호환 자모(ㅇ)를 첫가끝 자모(ᄋ)로 바꿔 버리므로 NFC 사용
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+
+def decompose(text: str) -> str:
+    """음절을 자모 시퀀스로 분해. "왕자" -> "ㅇㅗㅏㅇㅈㅏ". 한글이 아닌 글자는 그대로 둠."""
+    jamo = []
+    for char in normalize(text):
+        if is_syllable(char):
+            offset = ord(char) - HANGUL_BASE
+            jamo.append(CHOSEONG[offset // 588])
+            jamo.append(JUNGSEONG[(offset % 588) // 28])
+            jamo.append(JONGSEONG[offset % 28])
+        else:
+            jamo.append(char)
+    return "".join(COMPOUND_JAMO.get(j, j) for j in "".join(jamo))
+
+
+def choseong(text: str) -> str:
+    """초성만 추출. "어린 왕자" -> "ㅇㄹ ㅇㅈ". 한글이 아닌 글자는 그대로 둠."""
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_BASE) // 588] if is_syllable(char) else char
+        for char in normalize(text)
+    )
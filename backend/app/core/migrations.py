@@ -0,0 +1,33 @@
+import logging
+import os
+import subprocess
+import sys
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+
+def ensure_database():
+    """데이터베이스가 없으면 생성합니다 (동기 엔진을 잠깐 만들었다가 바로 정리)."""
+    from sqlalchemy import create_engine
+    from sqlalchemy_utils import create_database, database_exists
+
+    engine = create_engine(settings.sync_database_url)
+    try:
+        if not database_exists(engine.url):
+            create_database(engine.url)
+            logger.info("Created database.")
+    finally:
+        engine.dispose()
+
+
+def run_migrations(check: bool = True):
+    """alembic upgrade head 실행. env.py가 자체 이벤트 루프를 돌리므로 별도 프로세스로 실행합니다."""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR,
+        check=check,
+    )
@@ -0,0 +1,37 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """콜드 스타트 구간별 소요 시간을 기록합니다 (import, 엔진 생성, 마이그레이션, AI 서비스 초기화 등)."""
+
+    def __init__(self):
+        self.timings: List[Tuple[str, float]] = []
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.timings.append((phase, seconds))
+
+    @contextmanager
+    def measure(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started)
+
+    def as_dict(self) -> dict:
+        return {phase: round(seconds * 1000, 1) for phase, seconds in self.timings}
+
+    def report(self, since: float) -> str:
+        """`since`는 프로세스가 main을 import하기 시작한 perf_counter 값. 구간은 겹칠 수 있음 (async_engine은 imports에 포함)."""
+        total = time.perf_counter() - since
+        lines = [f"Startup timing (total {total * 1000:.1f} ms):"]
+        lines += [f"  {phase:<24}{seconds * 1000:>10.1f} ms" for phase, seconds in self.timings]
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer()
@@ -1,9 +1,13 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from app.core.config import settings
+from app.core.startup_timing import startup_timer
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
-engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+with startup_timer.measure("async_engine"):
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
 
 AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -18,13 +22,24 @@ async def get_async_db():
             await db.close()
 
 
-# 동기 DB 사용을 위한 코드. alembic에서 사용함
-sync_engine = create_engine(settings.sync_database_url)
-SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+# 동기 DB 사용을 위한 코드. alembic/스크립트에서만 쓰므로 처음 사용할 때 엔진을 만듦 (콜드 스타트 비용 제외)
+@lru_cache(maxsize=None)
+def get_sync_engine():
+    return create_engine(settings.sync_database_url)
+
+
+SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 def get_db():
-    db = SyncSessionLocal()
+    db = SyncSessionLocal(bind=get_sync_engine())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def __getattr__(name):
+    # 기존 `from app.database import sync_engine` 사용처 호환
+    if name == "sync_engine":
+        return get_sync_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,3 +11,6 @@ from .publisher import Publisher
 from .bookmark import Bookmark
 from .producer import Producer
 from .source import Source
+from .quote_daily_popularity import QuoteDailyPopularity
+from .trending_score import TrendingScore
+from .registry_version import RegistryVersion
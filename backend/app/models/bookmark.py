@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy import func
 from app.database import Base
@@ -12,4 +12,9 @@ class Bookmark(Base):
 
     quote = relationship("Quote", back_populates="bookmarks")
     folder = relationship("BookmarkFolder", back_populates="bookmarks")
+
+    __table_args__ = (
+        Index("ix_bookmarks_user_created", "user_id", "created_at"),  # 유저별 북마크 최신순 (offset/커서 페이지)
+        Index("ix_bookmarks_created_quote", "created_at", "quote_id"),  # 날짜별 인기 집계 (quote_daily_popularity 재구축)
+    )
     
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, TEXT, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, TEXT, ForeignKey, Index
 from sqlalchemy import func
 from app.database import Base  
 from sqlalchemy.orm import relationship
@@ -13,10 +13,21 @@ class Quote(Base):
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
     content = Column(TEXT, nullable=False)
     page = Column(String(255), nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)  # 커서 페이지 정렬 키
+    # 정규화한 content의 sha256. 같은 내용의 문장 중 대표 한 행에만 채워짐 (AI 문구 저장 시 중복 판별, unique)
+    content_hash = Column(String(64), nullable=True)
+    # 북마크 수 (비정규화). 북마크 추가/삭제 시 증분 갱신, scripts/reconcile_quote_bookmark_counts.py로 보정
+    bookmark_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     tags = relationship("Tag", secondary=quote_tags, back_populates="quotes", lazy="selectin")
     source = relationship("Source")
     bookmarks = relationship("Bookmark", back_populates="quote", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_quotes_user_created", "user_id", "created_at"),  # 유저가 업로드한 문장 최신순
+        Index("ix_quotes_source_id", "source_id"),  # 출처별 문장, source_type 조인
+        Index("uq_quotes_content_hash", "content_hash", unique=True),
+        Index("ix_quotes_bookmark_count", "bookmark_count"),  # 북마크 많은 순 Top-N
+    )
+
     
\ No newline at end of file
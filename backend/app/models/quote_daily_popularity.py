@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from app.database import Base
+
+
+# 일별 인기 문장 집계 테이블 (bookmarks를 날짜/소스 타입별로 미리 집계)
+# 북마크 생성/삭제 시 증분 갱신되며, scripts/backfill_quote_daily_popularity.py로 재구축할 수 있습니다.
+class QuoteDailyPopularity(Base):
+    __tablename__ = "quote_daily_popularity"
+
+    date = Column(Date, primary_key=True)
+    source_type = Column(String(20), primary_key=True)
+    quote_id = Column(Integer, ForeignKey("quotes.id", ondelete="CASCADE"), primary_key=True)
+    bookmark_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_quote_daily_popularity_lookup", "source_type", "date", "bookmark_count"),
+    )
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+# 워커별 인메모리 레지스트리(app/services/tag_registry.py 등)의 버전. 원본 테이블을 바꾸는 트랜잭션에서 같이 올림
+class RegistryVersion(Base):
+    __tablename__ = "registry_versions"
+
+    name = Column(String(40), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, JSON, Index
 from sqlalchemy import func
 from app.database import Base
 
@@ -15,3 +15,8 @@ class Source(Base):
     release_year = Column(Integer, nullable=True)
     isbn = Column(String(255), nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sources_source_type", "source_type"),
+        Index("ix_sources_title_creator", "title", "creator"),  # 제목+작가로 기존 출처 찾기 (AI 문구 저장)
+    )
@@ -14,11 +14,17 @@ class Tag(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, nullable=False)
 
-    quotes = relationship("Quote", secondary=quote_tags, back_populates="tags", lazy="selectin")
+    # 태그에 달린 문장/영화는 코퍼스 크기만큼 커지므로 자동으로 읽지 않음. 필요하면 쿼리에서 selectinload(Tag.quotes)로 명시
+    # (실수로 지연 로드하면 raise). 연결 행은 TagRepository.remove가 삭제 전에 직접 지움
+    quotes = relationship(
+        "Quote", secondary=quote_tags, back_populates="tags", lazy="raise_on_sql", passive_deletes=True
+    )
 
     ### Movie와의 다대다 관계 설정 ###
     movies = relationship(
         "Movie",
         secondary=movie_tag_association,
-        back_populates="tags"
+        back_populates="tags",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
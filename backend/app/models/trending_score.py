@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from app.database import Base
+
+
+# 트렌딩 점수 스냅샷 (app/services/trending.py). 점수는 updated_at 시점 값이고 읽을 때 반감기로 감쇠시킴
+# scope: "quote", "quote:<source_type>", "tag", "source_type" / key: 문장 id, 태그 id 또는 source_type
+class TrendingScore(Base):
+    __tablename__ = "trending_scores"
+
+    scope = Column(String(40), primary_key=True)
+    key = Column(String(64), primary_key=True)
+    score = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, nullable=False)
+    # 여러 워커가 같은 행을 동시에 합칠 때 쓰는 낙관적 잠금 버전
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_trending_scores_updated_at", "updated_at"),  # 오래된 행 정리
+    )
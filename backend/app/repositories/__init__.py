@@ -8,3 +8,6 @@ from .producer import producer_repository
 from .source import source_repository
 from .movie import movie_repo
 from .drama import drama_repo
+from .quote_daily_popularity import quote_daily_popularity_repository
+from .trending_score import trending_score_repository
+from .registry_version import registry_version_repository
@@ -15,6 +15,15 @@ class BaseRepository(Generic[ModelType]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_many(self, db: AsyncSession, ids: list[int]) -> list[ModelType]:
+        """id 목록을 IN 쿼리 한 번으로 조회. 결과는 ids 순서를 따르고 없는 id는 빠짐."""
+        if not ids:
+            return []
+        statement = select(self.model).filter(self.model.id.in_(ids))
+        result = await db.execute(statement)
+        by_id = {obj.id: obj for obj in result.scalars().all()}
+        return [by_id[id] for id in ids if id in by_id]
+
     async def get_all(self, db: AsyncSession) -> list[ModelType]:
         statement = select(self.model)
         result = await db.execute(statement)
@@ -1,9 +1,20 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
 from app.models import Book
 from app.repositories.base import BaseRepository
 
 
 class BookRepository(BaseRepository[Book]):
-    pass
+    async def get_many(self, db: AsyncSession, ids: list[int]) -> list[Book]:
+        # BookRead가 publisher를 포함하므로 함께 로드 (비동기 세션에서 lazy load 불가)
+        if not ids:
+            return []
+        statement = select(self.model).options(selectinload(self.model.publisher)).filter(self.model.id.in_(ids))
+        result = await db.execute(statement)
+        by_id = {book.id: book for book in result.scalars().all()}
+        return [by_id[id] for id in ids if id in by_id]
 
 
 book_repository = BookRepository(Book)
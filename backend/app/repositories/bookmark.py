@@ -1,5 +1,7 @@
 from app.models import Bookmark, Quote
 from app.repositories.base import BaseRepository
+from app.repositories.keyset import after_position
+from datetime import datetime
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -19,7 +21,11 @@ class BookmarkRepository(BaseRepository[Bookmark]):
             await db.commit()
         return obj
 
-    async def get_by_user_id(self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 10) -> list[Bookmark]:
+    async def get_by_user_id(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 10,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Bookmark]:
+        """최신순 북마크. after=(created_at, quote_id)를 주면 OFFSET 대신 그 위치 다음부터 (keyset)."""
         statement = (
             select(self.model)
             .options(
@@ -27,10 +33,13 @@ class BookmarkRepository(BaseRepository[Bookmark]):
                 selectinload(self.model.quote).selectinload(Quote.tags)
             )
             .filter(self.model.user_id == user_id)
-            .order_by(self.model.created_at.desc()) # 최신순 기본 정합성
-            .offset(skip)
+            .order_by(self.model.created_at.desc(), self.model.quote_id.desc()) # 최신순, 같은 시각은 quote_id로 고정
             .limit(limit)
         )
+        if after is not None:
+            statement = statement.filter(after_position(self.model.created_at, self.model.quote_id, after))
+        else:
+            statement = statement.offset(skip)
         result = await db.execute(statement)
         return result.scalars().all()
 
@@ -0,0 +1,21 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# MySQL ngram 파서의 기본 ngram_token_size. 이보다 짧은 검색어는 FULLTEXT 인덱스로 찾을 수 없음
+NGRAM_TOKEN_SIZE = 2
+
+
+def use_fulltext(db: AsyncSession, query: str) -> bool:
+    """MySQL FULLTEXT(ngram) 인덱스를 쓸 수 있는지. 그 외 DB(테스트용 SQLite 등)나 한 글자 검색은 ILIKE로 처리."""
+    bind = db.bind
+    return bind is not None and bind.dialect.name == "mysql" and len(query.strip()) >= NGRAM_TOKEN_SIZE
+
+
+def match_phrase(*columns, query: str):
+    """MATCH(columns) AGAINST('"query"' IN BOOLEAN MODE).
+
+    따옴표로 감싼 구문 검색이라 ngram 토큰이 연속으로 모두 일치해야 함 (= 기존 '%q%' 부분 일치와 같은 결과).
+    WHERE 조건과 관련도 점수(ORDER BY) 양쪽에 그대로 사용.
+    """
+    phrase = '"' + " ".join(query.replace('"', " ").split()) + '"'
+    return mysql.match(*columns, against=phrase).in_boolean_mode()
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def after_position(created_col, id_col, after: Optional[Tuple[datetime, int]]):
+    """(created_at DESC, id DESC) 순서에서 after 위치 다음 행들만 남기는 조건.
+
+    튜플 비교 대신 OR로 풀어 써서 (user_id, created_at) 인덱스 범위 스캔을 그대로 사용.
+    after가 None이면 None (첫 페이지).
+    """
+    if after is None:
+        return None
+    created_at, id = after
+    return or_(created_col < created_at, and_(created_col == created_at, id_col < id))
@@ -1,27 +1,172 @@
-from sqlalchemy import func, desc, or_
+import hashlib
+import unicodedata
+
+from sqlalchemy import func, desc, or_, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, time, timedelta
+from datetime import datetime, timedelta
 from sqlalchemy.orm import selectinload
 
-from app.models import Quote, Bookmark, Source, Tag
+from app.models import Quote, Bookmark, Source, Tag, QuoteDailyPopularity
+from app.models.quote_tag import quote_tags
 from app.repositories.base import BaseRepository
+from app.repositories.fulltext import match_phrase, use_fulltext
+from app.repositories.keyset import after_position
+
+
+def content_hash(content: str) -> str:
+    """문장 중복 판별용 해시: NFC 정규화 + 공백 정리 후 sha256 (마이그레이션 백필과 같은 규칙)."""
+    normalized = " ".join(unicodedata.normalize("NFC", content or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
 class QuoteRepository(BaseRepository[Quote]):
+    HAND_OVER_BATCH_SIZE = 500
+
+    async def create(self, db: AsyncSession, *, obj_in) -> Quote:
+        quote = await super().create(db, obj_in=obj_in)
+        await self._claim_content_hash(db, quote_id=quote.id, digest=content_hash(quote.content))
+        return quote
+
+    async def update(self, db: AsyncSession, *, db_obj, obj_in) -> Quote:
+        """content가 바뀌면 대표 자리(content_hash)를 같은 내용의 남은 문장에 넘기고 새 내용으로 다시 잡음. 커밋은 한 번."""
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        new_hash = content_hash(update_data["content"]) if "content" in update_data else None
+        if new_hash is None or update_data["content"] == db_obj.content or new_hash == db_obj.content_hash:
+            return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
+        previous_hash = db_obj.content_hash
+        for field, value in update_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+        db_obj.content_hash = None
+        await db.flush()
+        if previous_hash is not None:
+            await self._hand_over_content_hash(db, digest=previous_hash, content=db_obj.content)
+        await self._claim_content_hash(db, quote_id=db_obj.id, digest=new_hash)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Quote:
+        """대표 문장을 지우면 같은 내용의 남은 문장에 content_hash를 넘김."""
+        quote = await self.get(db, id)
+        previous_hash, previous_content = quote.content_hash, quote.content
+        await db.delete(quote)
+        await db.flush()
+        if previous_hash is not None:
+            await self._hand_over_content_hash(db, digest=previous_hash, content=previous_content)
+        await db.commit()
+        return quote
+
+    async def _claim_content_hash(self, db: AsyncSession, *, quote_id: int, digest: str) -> bool:
+        """같은 내용의 대표 행이 아직 없으면 이 문장을 대표로 지정. 이미 있으면 content_hash는 NULL로 둠."""
+        try:
+            # unique 충돌 시 savepoint만 롤백 (ORM 객체는 건드리지 않도록 synchronize_session=False)
+            async with db.begin_nested():
+                await db.execute(
+                    update(self.model)
+                    .where(self.model.id == quote_id)
+                    .values(content_hash=digest)
+                    .execution_options(synchronize_session=False)
+                )
+        except IntegrityError:
+            return False
+        return True
+
+    async def _hand_over_content_hash(self, db: AsyncSession, *, digest: str, content: str) -> None:
+        """대표 자리가 빈 content_hash를 같은 내용의 남은 문장 중 최신 행에 넘김 (마이그레이션 백필과 같은 기준).
+
+        content_hash가 NULL인 행은 대표가 아닌 중복 문장뿐이라 수가 적음. 저장된 내용이 NFC/NFD 어느 쪽이든
+        찾을 수 있도록 내용으로 좁히지 않고, NULL 해시 행을 최신순으로 배치씩 읽어 해시를 비교함 (대표 문장 수정/삭제 때만 실행).
+        """
+        last_id = None
+        while True:
+            statement = (
+                select(self.model.id, self.model.content)
+                .filter(self.model.content_hash.is_(None))
+                .order_by(self.model.id.desc())
+                .limit(self.HAND_OVER_BATCH_SIZE)
+            )
+            if last_id is not None:
+                statement = statement.filter(self.model.id < last_id)
+            rows = (await db.execute(statement)).all()
+            for quote_id, candidate in rows:
+                if content_hash(candidate) == digest:
+                    await self._claim_content_hash(db, quote_id=quote_id, digest=digest)
+                    return
+            if len(rows) < self.HAND_OVER_BATCH_SIZE:
+                return
+            last_id = rows[-1].id
+
+    async def get_by_content(self, db: AsyncSession, content: str) -> Quote | None:
+        """정규화한 내용이 같은 대표 문장 (content_hash unique 인덱스 조회)."""
+        statement = select(self.model).filter(self.model.content_hash == content_hash(content))
+        result = await db.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def create_with_content_hash(self, db: AsyncSession, *, obj_in) -> Quote:
+        """content_hash를 채워서 삽입. 같은 내용이 이미 있으면 IntegrityError (호출 측에서 savepoint로 감싸고 재조회)."""
+        quote = self.model(**obj_in.model_dump(exclude_none=True), content_hash=content_hash(obj_in.content))
+        db.add(quote)
+        await db.flush()
+        return quote
+
+    async def get_trending_keys(self, db: AsyncSession, *, quote_id: int) -> tuple[str | None, list[int]]:
+        """트렌딩 점수를 올릴 (source_type, 태그 id 목록). 문장이 없으면 (None, [])."""
+        statement = (
+            select(Source.source_type, quote_tags.c.tag_id)
+            .select_from(self.model)
+            .join(Source, Source.id == self.model.source_id)
+            .outerjoin(quote_tags, quote_tags.c.quote_id == self.model.id)
+            .filter(self.model.id == quote_id)
+        )
+        rows = (await db.execute(statement)).all()
+        if not rows:
+            return None, []
+        return rows[0][0], [tag_id for _, tag_id in rows if tag_id is not None]
+
     async def get_most_bookmarked(self, db: AsyncSession, limit: int = 10) -> list[Quote]:
+        # bookmarks 전체 GROUP BY 대신 비정규화된 bookmark_count 인덱스를 역순으로 읽음
         statement = (
             select(self.model)
-            .join(Bookmark, self.model.id == Bookmark.quote_id)
             .options(selectinload(self.model.source), selectinload(self.model.tags))
-            .group_by(self.model.id)
-            .order_by(func.count(Bookmark.quote_id).desc())
+            .filter(self.model.bookmark_count > 0)
+            .order_by(self.model.bookmark_count.desc(), self.model.id.desc())
             .limit(limit)
         )
         result = await db.execute(statement)
         return result.scalars().all()
 
+    async def adjust_bookmark_count(self, db: AsyncSession, *, quote_id: int, delta: int) -> None:
+        """bookmark_count를 DB에서 원자적으로 증감 (SET bookmark_count = bookmark_count + delta, 음수가 되지 않게). Does not commit."""
+        await db.execute(
+            update(self.model)
+            .where(self.model.id == quote_id, self.model.bookmark_count + delta >= 0)
+            .values(bookmark_count=self.model.bookmark_count + delta)
+        )
+
+    async def reconcile_bookmark_counts(self, db: AsyncSession) -> int:
+        """bookmarks 테이블 기준으로 어긋난 bookmark_count를 다시 계산. 고친 행 수 반환. Does not commit."""
+        actual = (
+            select(func.count())
+            .select_from(Bookmark)
+            .where(Bookmark.quote_id == self.model.id)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(self.model)
+            .where(self.model.bookmark_count != actual)
+            .values(bookmark_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     async def search(self, db: AsyncSession, query: str, source_type: str | None = None, limit: int = 10) -> list[Quote]:
+        if use_fulltext(db, query):
+            return await self._fulltext_search(db, query=query, source_type=source_type, limit=limit)
+
         statement = (
             select(self.model)
             .outerjoin(self.model.tags)
@@ -39,15 +184,60 @@ class QuoteRepository(BaseRepository[Quote]):
         result = await db.execute(statement)
         return result.scalars().all()
 
-    async def get_by_user_id(self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 10) -> list[Quote]:
+    async def get_many(self, db: AsyncSession, ids: list[int]) -> list[Quote]:
+        if not ids:
+            return []
+        result = await db.execute(
+            select(self.model)
+            .options(selectinload(self.model.source), selectinload(self.model.tags))
+            .filter(self.model.id.in_(ids))
+        )
+        by_id = {quote.id: quote for quote in result.scalars().all()}
+        return [by_id[quote_id] for quote_id in ids if quote_id in by_id]
+
+    async def _fulltext_search(self, db: AsyncSession, *, query: str, source_type: str | None, limit: int) -> list[Quote]:
+        # 본문 매치와 태그 매치를 각각 FULLTEXT 인덱스로 찾고 (OR로 묶으면 인덱스를 못 탐) 관련도 순으로 합침
+        content_score = match_phrase(self.model.content, query=query)
+        tag_score = match_phrase(Tag.name, query=query)
+        content_hits = select(self.model.id.label("quote_id"), content_score.label("score")).filter(content_score)
+        tag_hits = (
+            select(quote_tags.c.quote_id.label("quote_id"), tag_score.label("score"))
+            .join(Tag, Tag.id == quote_tags.c.tag_id)
+            .filter(tag_score)
+        )
+        hits = union_all(content_hits, tag_hits).subquery()
+
+        ranked = (
+            select(hits.c.quote_id, func.max(hits.c.score).label("score"))
+            .group_by(hits.c.quote_id)
+            .order_by(desc("score"), hits.c.quote_id.desc())
+            .limit(limit)
+        )
+        if source_type:
+            ranked = (
+                ranked.join(self.model, self.model.id == hits.c.quote_id)
+                .join(Source, Source.id == self.model.source_id)
+                .filter(Source.source_type == source_type)
+            )
+        quote_ids = [row.quote_id for row in await db.execute(ranked)]
+        return await self.get_many(db, quote_ids)
+
+    async def get_by_user_id(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 10,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Quote]:
+        """최신순 업로드 문장. after=(created_at, id)를 주면 OFFSET 대신 그 위치 다음부터 (keyset)."""
         statement = (
             select(self.model)
             .options(selectinload(self.model.source), selectinload(self.model.tags))
             .filter(self.model.user_id == user_id)
-            .order_by(self.model.created_at.desc()) # 최신순
-            .offset(skip)
+            .order_by(self.model.created_at.desc(), self.model.id.desc()) # 최신순, 같은 시각은 id로 고정
             .limit(limit)
         )
+        if after is not None:
+            statement = statement.filter(after_position(self.model.created_at, self.model.id, after))
+        else:
+            statement = statement.offset(skip)
         result = await db.execute(statement)
         return result.scalars().all()
 
@@ -79,47 +269,36 @@ class QuoteRepository(BaseRepository[Quote]):
         result = await db.execute(statement)
         return result.scalars().all()
 
-    async def get_random_by_source_type(
-        self, db: AsyncSession, *, source_type: str, limit: int = 3
-    ) -> list[Quote]:
+    async def get_ids_with_source_type(self, db: AsyncSession, *, after_id: int = 0) -> list[tuple[int, str]]:
+        """id가 after_id보다 큰 (문장 id, source_type). 랜덤 샘플러(app/services/quote_sampler.py)의 id 배열용."""
         statement = (
-            select(self.model)
-            .join(Source)
-            .filter(Source.source_type == source_type)
-            .options(selectinload(self.model.source), selectinload(self.model.tags))
-            .order_by(func.random())
-            .limit(limit)
+            select(self.model.id, Source.source_type)
+            .join(Source, Source.id == self.model.source_id)
+            .filter(self.model.id > after_id)
         )
         result = await db.execute(statement)
-        return result.scalars().all()
+        return result.all()
 
     async def get_todays_most_popular_by_source_type(
         self, db: AsyncSession, *, source_type: str
     ) -> tuple[Quote, Source] | None:
+        # 오늘(없으면 가장 최근 날짜)의 최다 북마크 문장을 일별 집계 테이블에서 한 번에 조회
         today = datetime.utcnow().date()
 
-        for i in range(365):  # check for the last year
-            target_date = today - timedelta(days=i)
-            start_of_day = datetime.combine(target_date, time.min)
-            end_of_day = datetime.combine(target_date, time.max)
-
-            statement = (
-                select(self.model, Source)
-                .join(Bookmark, self.model.id == Bookmark.quote_id)
-                .join(Source, self.model.source_id == Source.id)
-                .filter(Source.source_type == source_type)
-                .filter(Bookmark.created_at >= start_of_day)
-                .filter(Bookmark.created_at <= end_of_day)
-                .group_by(self.model.id, Source.id)
-                .order_by(func.count(Bookmark.quote_id).desc())
-                .limit(1)
-            )
-            result = await db.execute(statement)
-            popular_quote = result.first()
-            if popular_quote:
-                return popular_quote
-
-        return None
+        statement = (
+            select(self.model, Source)
+            .join(QuoteDailyPopularity, self.model.id == QuoteDailyPopularity.quote_id)
+            .join(Source, self.model.source_id == Source.id)
+            .filter(QuoteDailyPopularity.source_type == source_type)
+            .filter(QuoteDailyPopularity.date <= today)
+            .filter(QuoteDailyPopularity.date > today - timedelta(days=365))  # check for the last year
+            .filter(QuoteDailyPopularity.bookmark_count > 0)
+            .filter(Source.source_type == source_type)
+            .order_by(QuoteDailyPopularity.date.desc(), QuoteDailyPopularity.bookmark_count.desc())
+            .limit(1)
+        )
+        result = await db.execute(statement)
+        return result.first()
 
 
 quote_repository = QuoteRepository(Quote)
@@ -0,0 +1,64 @@
+from datetime import date
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Bookmark, Quote, QuoteDailyPopularity, Source
+from app.repositories.base import BaseRepository
+
+
+class QuoteDailyPopularityRepository(BaseRepository[QuoteDailyPopularity]):
+    async def increment(self, db: AsyncSession, *, quote_id: int, day: date, delta: int = 1) -> None:
+        """Adjust the bookmark count of a quote for the given day. Does not commit."""
+        source_type = (
+            await db.execute(
+                select(Source.source_type)
+                .join(Quote, Quote.source_id == Source.id)
+                .filter(Quote.id == quote_id)
+            )
+        ).scalar_one_or_none()
+        if source_type is None:
+            return
+
+        key = (
+            (self.model.date == day)
+            & (self.model.source_type == source_type)
+            & (self.model.quote_id == quote_id)
+        )
+        statement = update(self.model).where(key).values(bookmark_count=self.model.bookmark_count + delta)
+        result = await db.execute(statement)
+        if result.rowcount or delta <= 0:
+            return
+
+        try:
+            # 같은 날 같은 문장의 첫 북마크가 동시에 들어오면 PK 충돌이 날 수 있으므로 savepoint 안에서 삽입
+            async with db.begin_nested():
+                await db.execute(
+                    insert(self.model).values(
+                        date=day, source_type=source_type, quote_id=quote_id, bookmark_count=delta
+                    )
+                )
+        except IntegrityError:
+            await db.execute(statement)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Recompute the whole table from bookmarks. Does not commit."""
+        await db.execute(delete(self.model))
+        day = func.date(Bookmark.created_at)
+        rows = (
+            select(day, Source.source_type, Bookmark.quote_id, func.count())
+            .join(Quote, Quote.id == Bookmark.quote_id)
+            .join(Source, Source.id == Quote.source_id)
+            .group_by(day, Source.source_type, Bookmark.quote_id)
+        )
+        result = await db.execute(
+            insert(self.model).from_select(
+                ["date", "source_type", "quote_id", "bookmark_count"], rows
+            )
+        )
+        return result.rowcount
+
+
+quote_daily_popularity_repository = QuoteDailyPopularityRepository(QuoteDailyPopularity)
@@ -0,0 +1,30 @@
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import RegistryVersion
+from app.repositories.base import BaseRepository
+
+
+class RegistryVersionRepository(BaseRepository[RegistryVersion]):
+    async def get_version(self, db: AsyncSession, *, name: str) -> int:
+        statement = select(self.model.version).filter(self.model.name == name)
+        result = await db.execute(statement)
+        return result.scalar_one_or_none() or 0
+
+    async def bump(self, db: AsyncSession, *, name: str) -> int:
+        """버전을 1 올리고 새 버전을 반환. Does not commit (원본 변경과 같은 트랜잭션에서 커밋)."""
+        statement = update(self.model).where(self.model.name == name).values(version=self.model.version + 1)
+        result = await db.execute(statement)
+        if not result.rowcount:
+            try:
+                # 첫 버전 행을 동시에 만들면 PK 충돌이 날 수 있으므로 savepoint 안에서 삽입
+                async with db.begin_nested():
+                    await db.execute(insert(self.model).values(name=name, version=1))
+            except IntegrityError:
+                await db.execute(statement)
+        return await self.get_version(db, name=name)
+
+
+registry_version_repository = RegistryVersionRepository(RegistryVersion)
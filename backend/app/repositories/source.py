@@ -1,10 +1,11 @@
-from sqlalchemy import or_
+from sqlalchemy import desc, func, or_, union_all
 from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.models import Book, Drama, Movie, Producer, Source
 from app.repositories.base import BaseRepository
+from app.repositories.fulltext import match_phrase, use_fulltext
 
 
 class SourceRepository(BaseRepository[Source]):
@@ -14,6 +15,9 @@ class SourceRepository(BaseRepository[Source]):
         return result.scalars().first()
 
     async def search(self, db: AsyncSession, query: str, source_type: str | None = None, limit: int = 10) -> list[Source]:
+        if use_fulltext(db, query):
+            return await self._fulltext_search(db, query=query, source_type=source_type, limit=limit)
+
         book_alias = aliased(Book)
         movie_alias = aliased(Movie)
         drama_alias = aliased(Drama)
@@ -43,5 +47,37 @@ class SourceRepository(BaseRepository[Source]):
         result = await db.execute(statement)
         return result.scalars().unique().all()
 
+    async def _fulltext_search(self, db: AsyncSession, *, query: str, source_type: str | None, limit: int) -> list[Source]:
+        # 제목/제작자, 저자, 감독, 프로듀서를 각각 FULLTEXT 인덱스로 찾고 관련도 최댓값 순으로 합침
+        title_score = match_phrase(self.model.title, self.model.creator, query=query)
+        author_score = match_phrase(Book.author, query=query)
+        director_score = match_phrase(Movie.director, query=query)
+        producer_score = match_phrase(Producer.name, query=query)
+
+        hits = union_all(
+            select(self.model.id.label("source_id"), title_score.label("score")).filter(title_score),
+            select(self.model.id, author_score)
+            .join(Book, (self.model.source_type == "book") & (self.model.details_id == Book.id))
+            .filter(author_score),
+            select(self.model.id, director_score)
+            .join(Movie, (self.model.source_type == "movie") & (self.model.details_id == Movie.id))
+            .filter(director_score),
+            select(self.model.id, producer_score)
+            .join(Drama, (self.model.source_type == "drama") & (self.model.details_id == Drama.id))
+            .join(Producer, Drama.producer_id == Producer.id)
+            .filter(producer_score),
+        ).subquery()
+
+        ranked = (
+            select(hits.c.source_id, func.max(hits.c.score).label("score"))
+            .group_by(hits.c.source_id)
+            .order_by(desc("score"), hits.c.source_id)
+            .limit(limit)
+        )
+        if source_type:
+            ranked = ranked.join(self.model, self.model.id == hits.c.source_id).filter(self.model.source_type == source_type)
+        source_ids = [row.source_id for row in await db.execute(ranked)]
+        return await self.get_many(db, source_ids)
+
 
 source_repository = SourceRepository(Source)
\ No newline at end of file
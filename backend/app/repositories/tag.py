@@ -1,8 +1,27 @@
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.models import Tag
+from app.models.movie import movie_tag_association
+from app.models.quote_tag import quote_tags
 from app.repositories.base import BaseRepository
+from app.repositories.fulltext import match_phrase, use_fulltext
+
+
+def tag_name_key(name: str) -> str:
+    """태그 이름 비교 키. MySQL 기본 콜레이션처럼 대소문자를 무시 ("Hope"와 "hope"는 같은 태그)."""
+    return name.casefold()
+
+
+def unique_tag_names(names) -> list[str]:
+    """빈 이름을 빼고 비교 키 기준으로 중복 제거 (처음 나온 표기 유지)."""
+    unique: dict[str, str] = {}
+    for name in names:
+        if name:
+            unique.setdefault(tag_name_key(name), name)
+    return list(unique.values())
 
 
 class TagRepository(BaseRepository[Tag]):
@@ -11,14 +30,70 @@ class TagRepository(BaseRepository[Tag]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
-    async def search(self, db: AsyncSession, query: str, limit: int = 10) -> list[Tag]:
-        statement = (
-            select(self.model)
-            .filter(self.model.name.ilike(f"%{query}%"))
-            .limit(limit)
-        )
+    async def get_id_names(self, db: AsyncSession) -> list[tuple[int, str]]:
+        """전체 (id, name). 태그 레지스트리 로드용 (관계 로드 없이 컬럼만)."""
+        result = await db.execute(select(self.model.id, self.model.name).order_by(self.model.id))
+        return result.all()
+
+    async def get_or_create_many(self, db: AsyncSession, names: list[str]) -> list[Tag]:
+        """이름 목록을 IN 쿼리 한 번으로 찾고, 없는 이름은 다중 행 INSERT 한 번으로 생성.
+        unique_tag_names(names) 순서로 반환 (대소문자만 다른 기존 태그는 그대로 재사용). Does not commit.
+
+        다른 요청이 같은 이름을 먼저 만들면 unique 충돌로 savepoint만 롤백하고, 다시 조회해서 남은 이름만 재시도.
+        DB가 돌려준 행은 tag_name_key로 맞춤 (대소문자 무시 콜레이션에서는 "Hope"로 찾아도 "hope" 행이 옴).
+        """
+        names = unique_tag_names(names)
+        if not names:
+            return []
+        by_name = {tag_name_key(tag.name): tag for tag in await self._get_by_names(db, names)}
+        missing = [name for name in names if tag_name_key(name) not in by_name]
+        while missing:
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(self.model), [{"name": name} for name in missing])
+            except IntegrityError:
+                pass
+            # MySQL은 INSERT ... RETURNING이 없으므로 넣은 (또는 다른 요청이 넣은) 행을 다시 읽음
+            by_name.update((tag_name_key(tag.name), tag) for tag in await self._get_by_names(db, missing))
+            still_missing = [name for name in missing if tag_name_key(name) not in by_name]
+            if len(still_missing) == len(missing):
+                raise RuntimeError(f"could not create tags: {missing}")
+            missing = still_missing
+        return [by_name[tag_name_key(name)] for name in names]
+
+    async def _get_by_names(self, db: AsyncSession, names: list[str]) -> list[Tag]:
+        statement = select(self.model).filter(self.model.name.in_(names))
         result = await db.execute(statement)
         return result.scalars().all()
 
+    async def get_many(self, db: AsyncSession, ids: list[int]) -> list:
+        """(id, name) 행만 조회 (ORM 객체/관계 로드 없음). ids 순서, 없는 id는 빠짐."""
+        if not ids:
+            return []
+        statement = select(self.model.id, self.model.name).filter(self.model.id.in_(ids))
+        by_id = {row.id: row for row in (await db.execute(statement)).all()}
+        return [by_id[id] for id in ids if id in by_id]
+
+    async def search(self, db: AsyncSession, query: str, limit: int = 10) -> list:
+        """이름 검색. 응답에 필요한 (id, name) 컬럼만 조회."""
+        columns = select(self.model.id, self.model.name)
+        if use_fulltext(db, query):
+            score = match_phrase(self.model.name, query=query)
+            statement = columns.filter(score).order_by(score.desc()).limit(limit)
+        else:
+            statement = (
+                columns
+                .filter(self.model.name.ilike(f"%{query}%"))
+                .limit(limit)
+            )
+        result = await db.execute(statement)
+        return result.all()
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Tag:
+        # Tag.quotes / Tag.movies를 읽지 않고 연결 행을 한 번에 삭제 (movie_tag는 FK CASCADE가 없음)
+        await db.execute(delete(quote_tags).where(quote_tags.c.tag_id == id))
+        await db.execute(delete(movie_tag_association).where(movie_tag_association.c.tag_id == id))
+        return await super().remove(db, id=id)
+
 
 tag_repository = TagRepository(Tag)
@@ -0,0 +1,77 @@
+import math
+from datetime import datetime
+
+from sqlalchemy import Integer, cast, delete, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Quote, TrendingScore
+from app.repositories.base import BaseRepository
+
+
+class TrendingScoreRepository(BaseRepository[TrendingScore]):
+    MAX_MERGE_ATTEMPTS = 5
+
+    def _quote_scope(self):
+        return or_(self.model.scope == "quote", self.model.scope.like("quote:%"))
+
+    async def get_all_scores(self, db: AsyncSession) -> list[tuple[str, str, float, datetime]]:
+        """저장된 점수 전체. 문장 scope 행은 문장이 남아 있는 것만."""
+        quote_scope = self._quote_scope()
+        statement = (
+            select(self.model.scope, self.model.key, self.model.score, self.model.updated_at)
+            .outerjoin(Quote, quote_scope & (Quote.id == cast(self.model.key, Integer)))
+            .filter(~quote_scope | Quote.id.isnot(None))
+        )
+        result = await db.execute(statement)
+        return result.all()
+
+    async def delete_quote(self, db: AsyncSession, *, quote_id: int) -> int:
+        """삭제되는 문장의 문장 scope 행을 지움. Does not commit."""
+        result = await db.execute(
+            delete(self.model).where(self._quote_scope() & (self.model.key == str(quote_id)))
+        )
+        return result.rowcount
+
+    async def merge(
+        self, db: AsyncSession, *, scope: str, key: str, delta: float, at: datetime, decay_rate: float
+    ) -> None:
+        """저장된 점수를 at 시점으로 감쇠시킨 뒤 delta를 더함 (0 미만이면 0). Does not commit.
+
+        여러 워커가 같은 행을 동시에 합칠 수 있으므로 version으로 낙관적 잠금, 첫 삽입 충돌은 savepoint로 처리.
+        """
+        key_filter = (self.model.scope == scope) & (self.model.key == key)
+        for _ in range(self.MAX_MERGE_ATTEMPTS):
+            row = (await db.execute(
+                select(self.model.score, self.model.updated_at, self.model.version).filter(key_filter)
+            )).first()
+            if row is None:
+                try:
+                    async with db.begin_nested():
+                        await db.execute(insert(self.model).values(
+                            scope=scope, key=key, score=max(0.0, delta), updated_at=at, version=0
+                        ))
+                    return
+                except IntegrityError:
+                    continue
+
+            score, updated_at, version = row
+            age = max(0.0, (at - updated_at).total_seconds())
+            merged = max(0.0, score * math.exp(-decay_rate * age) + delta)
+            result = await db.execute(
+                update(self.model)
+                .where(key_filter & (self.model.version == version))
+                .values(score=merged, updated_at=max(at, updated_at), version=version + 1)
+            )
+            if result.rowcount:
+                return
+        raise RuntimeError(f"trending score {scope}/{key} kept changing during merge")
+
+    async def prune(self, db: AsyncSession, *, before: datetime) -> int:
+        """before 이후로 갱신되지 않은 (감쇠로 사실상 0인) 행 삭제. Does not commit."""
+        result = await db.execute(delete(self.model).where(self.model.updated_at < before))
+        return result.rowcount
+
+
+trending_score_repository = TrendingScoreRepository(TrendingScore)
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
 from app.schemas import BookmarkCreate, BookmarkRead, QuoteRead
-from app.schemas.pagination import PaginatedResponse
+from app.schemas.pagination import CursorPage, PaginatedResponse
 from app.services import bookmark_service
 import math
-from app.models import Bookmark
 from app.services import quote_service  # Need quote service to create new quotes
+from app.services.search_cache import search_cache
+from app.services.search_index import search_index
+from app.services.suggest import suggest_service
 
 router = APIRouter(prefix="/bookmark", tags=["Bookmark"])
 
+logger = logging.getLogger(__name__)
+
 # 유저의 북마크 조회 (Paging 지원)
 @router.get("/user/{user_id}", response_model=PaginatedResponse[QuoteRead])
 async def get_bookmarks_by_user(
@@ -30,9 +36,33 @@ async def get_bookmarks_by_user(
         total_pages=total_pages
     )
 
+# 유저의 북마크 조회 (커서 방식: 깊은 페이지도 일정한 비용, 총 개수는 with_total=true 일 때만)
+@router.get("/user/{user_id}/cursor", response_model=CursorPage[QuoteRead])
+async def get_bookmarks_by_user_cursor(
+    user_id: int,
+    cursor: str | None = None,
+    size: int = Query(10, ge=1, le=100),
+    with_total: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        items, next_cursor, total = await bookmark_service.get_by_user_id_cursor(
+            db, user_id=user_id, cursor=cursor, size=size, with_total=with_total
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return CursorPage(
+        items=[bookmark.quote for bookmark in items],
+        size=size,
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+        total=total,
+    )
+
 async def _ensure_ai_quote_exists(db: AsyncSession, bookmark_in: BookmarkCreate) -> int:
     """AI 추천 문구가 DB에 없는 경우(id <= 0) 새로 생성하거나 기존 것을 찾아 ID를 반환합니다.
-    동일한 내용의 문구가 있으면 기존 ID를 반환하여 중복을 방지합니다.
+    동일한 내용의 문구가 있으면 기존 ID를 반환하여 중복을 방지합니다 (content_hash unique 인덱스).
+    새로 만든 문구/출처는 바로 커밋하고 검색 인덱스, 자동완성, 검색 캐시에 반영합니다.
     """
     if bookmark_in.quote_id > 0 or not bookmark_in.quote_data:
         return bookmark_in.quote_id
@@ -41,57 +71,75 @@ async def _ensure_ai_quote_exists(db: AsyncSession, bookmark_in: BookmarkCreate)
         from app.schemas import QuoteCreate, SourceCreate
         from app.services import source_service, quote_service
         from sqlalchemy import select
-        from app.models import Quote, Source
+        from sqlalchemy.exc import IntegrityError
+        from app.models import Source
         
         q_data = bookmark_in.quote_data
         content = q_data.get('content')
         title = q_data.get('source_title', 'Unknown Source')
         author = q_data.get('author') or q_data.get('creator') or 'Unknown'
         
-        print(f"DEBUG: Ensuring AI quote exists: {content[:30]}...")
+        logger.debug(f"Ensuring AI quote exists: {content[:30]}...")
         
-        # 1. 이미 동일한 내용의 문구가 있는지 확인 (가장 최신 것 하나 선택)
-        stmt = select(Quote).where(Quote.content == content).order_by(Quote.id.desc())
-        result = await db.execute(stmt)
-        existing_quote = result.scalars().first() # Use first() instead of scalar_one_or_none() to avoid 500 on duplicates
+        # 1. 이미 동일한 내용의 문구가 있는지 확인 (정규화한 내용의 해시로 인덱스 조회)
+        existing_quote = await quote_service.repository.get_by_content(db, content)
         if existing_quote:
-            print(f"DEBUG: Existing quote found (ID: {existing_quote.id}). Reusing.")
+            logger.debug(f"Existing quote found (ID: {existing_quote.id}). Reusing.")
             return existing_quote.id
 
-        # 2. Source 생성 전 기존 소스 확인 (중복 방지)
-        stmt_source = select(Source).filter(Source.title == title, Source.creator == author).order_by(Source.id.desc())
-        source_result = await db.execute(stmt_source)
-        existing_source = source_result.scalars().first()
-        
-        if existing_source:
-            source_id = existing_source.id
-            print(f"DEBUG: Existing source found (ID: {source_id}).")
+        try:
+            # 같은 문구를 동시에 토글하면 한쪽만 삽입에 성공함. 진 쪽은 savepoint(출처 생성 포함)를 롤백하고 재조회
+            async with db.begin_nested():
+                # 2. Source 생성 전 기존 소스 확인 (중복 방지)
+                stmt_source = select(Source).filter(Source.title == title, Source.creator == author).order_by(Source.id.desc())
+                source_result = await db.execute(stmt_source)
+                existing_source = source_result.scalars().first()
+
+                new_source = None
+                if existing_source:
+                    source_id = existing_source.id
+                    logger.debug(f"Existing source found (ID: {source_id}).")
+                else:
+                    # Source 신규 생성
+                    raw_type = q_data.get('source_type', 'book').lower()
+                    allowed_types = ["book", "movie", "drama", "tv", "speech", "other"]
+                    source_type = raw_type if raw_type in allowed_types else "other"
+
+                    new_source = await source_service.repository.create(db, obj_in=SourceCreate(
+                        title=title,
+                        creator=author,
+                        source_type=source_type
+                    ))
+                    await db.flush()
+                    source_id = new_source.id
+
+                # 4. Quote 생성
+                new_quote = await quote_service.repository.create_with_content_hash(db, obj_in=QuoteCreate(
+                    content=content,
+                    source_id=source_id,
+                    user_id=bookmark_in.user_id
+                ))
+                quote_id = new_quote.id
+                new_source_fields = new_source and (new_source.title, new_source.creator, new_source.source_type)
+        except IntegrityError:
+            existing_quote = await quote_service.repository.get_by_content(db, content)
+            if existing_quote is None:
+                raise
+            logger.debug(f"Concurrent insert detected, reusing quote (ID: {existing_quote.id}).")
+            return existing_quote.id
+
+        # 5. 커밋 후 검색 인덱스/자동완성/검색 캐시 반영 (문장·출처 생성 라우트와 같은 순서)
+        await db.commit()
+        await search_index.refresh_quote(db, quote_id)
+        if new_source_fields:
+            await search_index.refresh_source(db, source_id)
+            suggest_service.index_source(source_id, *new_source_fields)
+            await search_cache.bump("quote", "source")
         else:
-            # Source 신규 생성
-            raw_type = q_data.get('source_type', 'book').lower()
-            allowed_types = ["book", "movie", "drama", "tv", "speech", "other"]
-            source_type = raw_type if raw_type in allowed_types else "other"
-            
-            new_source = await source_service.repository.create(db, obj_in=SourceCreate(
-                title=title,
-                creator=author,
-                source_type=source_type
-            ))
-            await db.flush()
-            source_id = new_source.id
-        
-        # 4. Quote 생성
-        new_quote = await quote_service.repository.create(db, obj_in=QuoteCreate(
-            content=content,
-            source_id=source_id,
-            user_id=bookmark_in.user_id
-        ))
-        await db.flush()
-        return new_quote.id
+            await search_cache.bump("quote")
+        return quote_id
     except Exception as e:
-        print(f"CRITICAL: Error in _ensure_ai_quote_exists: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning(f"Error in _ensure_ai_quote_exists: {e}", exc_info=True)
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"AI 문구 저장 실패: {str(e)}")
 
@@ -103,10 +151,7 @@ async def create_bookmark(bookmark: BookmarkCreate, db: AsyncSession = Depends(g
     
     # 2. 북마크 생성 (quote_data 제외 필수: Bookmark 모델에 없는 필드임)
     try:
-        new_bookmark = Bookmark(user_id=bookmark.user_id, quote_id=bookmark.quote_id)
-        db.add(new_bookmark)
-        await db.commit()
-        return new_bookmark
+        return await bookmark_service.add_bookmark(db, user_id=bookmark.user_id, quote_id=bookmark.quote_id)
     except Exception as e:
         await db.rollback()
         print(f"Error creating bookmark: {e}")
@@ -122,14 +167,11 @@ async def toggle_bookmark(bookmark_in: BookmarkCreate, db: AsyncSession = Depend
     # 2. 토글 로직
     bookmark = await bookmark_service.repository.get(db, id=(bookmark_in.user_id, bookmark_in.quote_id))
     if bookmark:
-        await db.delete(bookmark)
-        await db.commit()
+        await bookmark_service.remove_bookmark(db, bookmark=bookmark)
         return {"bookmarked": False}
     else:
         try:
-            new_bookmark = Bookmark(user_id=bookmark_in.user_id, quote_id=bookmark_in.quote_id)
-            db.add(new_bookmark)
-            await db.commit()
+            await bookmark_service.add_bookmark(db, user_id=bookmark_in.user_id, quote_id=bookmark_in.quote_id)
             return {"bookmarked": True}
         except Exception as e:
             await db.rollback()
@@ -152,5 +194,5 @@ async def delete_bookmark(user_id: int, quote_id: int, db: AsyncSession = Depend
     bookmark = await bookmark_service.repository.get(db, id=(user_id, quote_id)) # 복합키
     if not bookmark:
         raise HTTPException(status_code=400, detail="북마크를 찾을 수 없음")
-    await bookmark_service.repository.remove(db, id=(user_id, quote_id))
+    await bookmark_service.remove_bookmark(db, bookmark=bookmark)
     return {"message": "북마크 삭제 됨"}
\ No newline at end of file
@@ -1,44 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from app.schemas.pagination import PaginatedResponse
+from app.schemas.pagination import CursorPage, PaginatedResponse
 import math
 
 from app.database import get_async_db
 from app.schemas.quote import QuoteCreate, QuoteRead, QuoteUpdate, QuoteBase
-from app.schemas.tag import TagCreate
 from app.schemas.popular import PopularQuoteResponse
+from app.schemas.trending import TrendingQuoteRead, TrendingTagRead
 from app.services import quote_service, user_service, source_service, tag_service
+from app.services.search_cache import search_cache
+from app.services.search_index import search_index
+from app.services.suggest import suggest_service
+from app.services.tag_registry import tag_registry
+from app.services.trending import trending_service
 from app.models import Quote
 from app.models.quote_tag import quote_tags
+from app.core.ai import get_ai_service, AI_IMPORT_ERROR
 
 router = APIRouter(prefix="/quote", tags=["Quote"])
 
 
-import sys
-import os
-from app.core.config import settings
-# Add project root to sys.path for llm import
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../llm")))
-
-try:
-    from ai_service import AIService
-except ImportError:
-    AIService = None
-
-# Initialize AIService
-ai_service = AIService(
-    project_id=settings.google_project_id, 
-    location="us-central1",
-    aladin_api_key=settings.aladin_api_key
-) if AIService else None
-
-
 @router.get("/popular/today/{source_type}", response_model=PopularQuoteResponse)
 async def get_todays_popular_quote(
-    source_type: str, db: AsyncSession = Depends(get_async_db)
+    source_type: str, db: AsyncSession = Depends(get_async_db), ai_service=Depends(get_ai_service)
 ):
     print(f"DEBUG: get_todays_popular_quote called for {source_type}")
     # Always use 'book' regardless of input
@@ -97,6 +84,21 @@ async def get_latest_quotes(
     return await quote_service.get_latest_by_source_type(db, source_type=source_type)
 
 
+# 트렌딩 문장 (북마크 이벤트로 갱신되는 감쇠 점수, 메모리에서 바로 상위 N개)
+@router.get("/trending", response_model=list[TrendingQuoteRead])
+async def get_trending_quotes(
+    limit: int = Query(10, ge=1, le=100),
+    source_type: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await quote_service.get_trending(db, limit=limit, source_type=source_type)
+
+
+@router.get("/trending/tags", response_model=list[TrendingTagRead])
+async def get_trending_tags(limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_async_db)):
+    return await tag_service.get_trending(db, limit=limit)
+
+
 @router.post("/", response_model=QuoteRead)
 async def create_quote(quote_in: QuoteCreate, db: AsyncSession = Depends(get_async_db)):
     user = await user_service.repository.get(db, id=quote_in.user_id)
@@ -125,23 +127,8 @@ async def create_quote(quote_in: QuoteCreate, db: AsyncSession = Depends(get_asy
         quote_id = created_quote.id
 
         if tag_names:
-            tag_ids_to_associate = []
-            for name in tag_names:
-                tag = await tag_service.repository.get_by_name(db, name=name)
-                if not tag:
-                    # This also creates, commits, and refreshes.
-                    tag = await tag_service.repository.create(
-                        db, obj_in=TagCreate(name=name)
-                    )
-                tag_ids_to_associate.append(tag.id)
-
-            if tag_ids_to_associate:
-                associations = [
-                    {"quote_id": quote_id, "tag_id": tag_id}
-                    for tag_id in tag_ids_to_associate
-                ]
-                await db.execute(quote_tags.insert().values(associations))
-                await db.commit()
+            await tag_service.attach_to_quote(db, quote_id=quote_id, names=tag_names)
+        await db.commit()
 
         # Re-fetch the quote with the tags preloaded to return the correct data.
         result = await db.execute(
@@ -150,6 +137,10 @@ async def create_quote(quote_in: QuoteCreate, db: AsyncSession = Depends(get_asy
             .options(selectinload(Quote.tags), selectinload(Quote.source))
         )
         final_quote = result.scalar_one()
+        await search_index.refresh_quote(db, quote_id)
+        suggest_service.index_new_tags(final_quote.tags)
+        tag_registry.put_many(final_quote.tags)
+        await search_cache.bump("quote", "tag")
         return final_quote
 
     except IntegrityError as e:
@@ -195,6 +186,23 @@ async def get_quotes_by_user(
         total_pages=total_pages
     )
 
+# 유저가 업로드한 문장 조회 (커서 방식: 깊은 페이지도 일정한 비용, 총 개수는 with_total=true 일 때만)
+@router.get("/user/{user_id}/cursor", response_model=CursorPage[QuoteRead])
+async def get_quotes_by_user_cursor(
+    user_id: int,
+    cursor: str | None = None,
+    size: int = Query(10, ge=1, le=100),
+    with_total: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        items, next_cursor, total = await quote_service.get_by_user_id_cursor(
+            db, user_id=user_id, cursor=cursor, size=size, with_total=with_total
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return CursorPage(items=items, size=size, next_cursor=next_cursor, has_more=next_cursor is not None, total=total)
+
 
 @router.put("/{quote_id}", response_model=QuoteRead)
 async def update_quote(
@@ -219,28 +227,22 @@ async def update_quote(
         await db.execute(quote_tags.delete().where(quote_tags.c.quote_id == quote_id))
 
         if tag_names: # If new tags are provided, create new associations
-            tag_ids_to_associate = []
-            for name in tag_names:
-                tag = await tag_service.repository.get_by_name(db, name=name)
-                if not tag:
-                    tag = await tag_service.repository.create(db, obj_in=TagCreate(name=name))
-                tag_ids_to_associate.append(tag.id)
-
-            if tag_ids_to_associate:
-                associations = [
-                    {"quote_id": quote_id, "tag_id": tag_id}
-                    for tag_id in tag_ids_to_associate
-                ]
-                await db.execute(quote_tags.insert().values(associations))
+            await tag_service.attach_to_quote(db, quote_id=quote_id, names=tag_names)
         await db.commit() # Commit after tag operations
 
     # Re-fetch the quote with the updated tags preloaded to return the correct data.
+    # (요청 앞부분에서 읽은 quote의 예전 tags가 identity map에 남아 있으므로 populate_existing)
     result = await db.execute(
         select(Quote)
         .where(Quote.id == quote_id)
         .options(selectinload(Quote.tags), selectinload(Quote.source))
+        .execution_options(populate_existing=True)
     )
     final_quote = result.scalar_one()
+    await search_index.refresh_quote(db, quote_id)
+    suggest_service.index_new_tags(final_quote.tags)
+    tag_registry.put_many(final_quote.tags)
+    await search_cache.bump("quote", "tag")
     return final_quote
 
 
@@ -249,5 +251,7 @@ async def delete_quote(quote_id: int, db: AsyncSession = Depends(get_async_db)):
     quote = await quote_service.repository.get(db, id=quote_id)
     if not quote:
         raise HTTPException(status_code=400, detail="문장을 찾을 수 없습니다.")
-    await quote_service.repository.remove(db, id=quote_id)
+    await quote_service.delete(db, quote_id=quote_id)
+    search_index.remove_quote(quote_id)
+    await search_cache.bump("quote")
     return {"message": "문장 삭제 됨"}
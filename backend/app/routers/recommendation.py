@@ -5,25 +5,11 @@ import random
 
 from app.database import get_async_db
 from app.schemas import QuoteRead, UserResponse
+from app.schemas.recommendation import RecommendationItem
 from app.services import bookmark_service, quote_service
 from app.routers.auth import get_current_user
-from app.core.config import settings
-import sys
-import os
-
-# Add llm folder to sys.path to import AIService
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../llm")))
-
-try:
-    from ai_service import AIService
-except ImportError as e:
-    # Fallback or error handling if path is wrong
-    with open("import_error.log", "a", encoding="utf-8") as f:
-        import traceback
-        f.write(f"ImportError in recommendation.py: {e}\n")
-        f.write(traceback.format_exc())
-    print("Could not import AIService from llm folder")
-    AIService = None
+from app.core.ai import get_ai_service, get_ai_recommendation_service
+from app.services.ai_recommendation_service import AIRecommendationService
 
 from fastapi.security import OAuth2PasswordBearer
 from app.core.auth import verify_token
@@ -47,28 +33,13 @@ async def get_current_user_optional(
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
-# Initialize AIService globally or lazily
-# We pass settings here
-# Initialize AIService globally or lazily
-# We pass settings here
-ai_service = AIService(
-    project_id=settings.google_project_id, 
-    location="us-central1", # Force us-central1
-    aladin_api_key=settings.aladin_api_key
-) if AIService else None
-
-
-from app.services.ai_recommendation_service import AIRecommendationService
-
-# Initialize Service
-ai_rec_service = AIRecommendationService(ai_service)
-
 @router.get("/", response_model=List[QuoteRead])
 async def get_recommendations_by_source(
     db: AsyncSession = Depends(get_async_db),
     source_type: str = Query("book", enum=["book"]),
     limit: int = 3,
     current_user: UserResponse = Depends(get_current_user_optional),
+    ai_rec_service: AIRecommendationService = Depends(get_ai_recommendation_service),
 ):
     """Get recommended quotes from AI/DB with variety."""
     user_id = current_user.id if current_user else None
@@ -78,10 +49,19 @@ async def get_recommendations_by_source(
 async def get_related_recommendations(
     current_quote_content: str = Body(..., embed=True),
     limit: int = 3,
+    ai_rec_service: AIRecommendationService = Depends(get_ai_recommendation_service),
 ):
     """Chain Recommendation for Detail page."""
     return await ai_rec_service.get_related_chain(current_quote_content, limit)
 
+# 북마크 많은 문장 (quotes.bookmark_count 인덱스, bookmarks 집계 없음)
+@router.get("/popular", response_model=List[RecommendationItem])
+async def get_popular_recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await quote_service.get_most_bookmarked_items(db, limit=limit)
+
 @router.get("/user-based", response_model=List[QuoteRead])
 async def get_user_based_recommendations(
     db: AsyncSession = Depends(get_async_db),
@@ -114,6 +94,8 @@ async def get_ai_recommendations(
     refresh: bool = Query(False),
     db: AsyncSession = Depends(get_async_db),
     current_user: UserResponse = Depends(get_current_user),
+    ai_service=Depends(get_ai_service),
+    ai_rec_service: AIRecommendationService = Depends(get_ai_recommendation_service),
 ):
     """Get AI book recommendations."""
     if not ai_service: return []
@@ -2,11 +2,41 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
-from app.schemas import SearchResult
+from app.schemas import SearchResult, SuggestItem
 from app.services.search import search_service
+from app.services.search_cache import search_cache
+from app.services.search_index import search_index
+from app.services.suggest import suggest_service
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 @router.get("/", response_model=SearchResult)
-async def search(q: str = Query(..., min_length=1), source_type: str | None = Query(None), db: AsyncSession = Depends(get_async_db)):
-    return await search_service.search(db, query=q, source_type=source_type)
+async def search(
+    q: str = Query(..., min_length=1),
+    source_type: str | None = Query(None),
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await search_service.search(db, query=q, source_type=source_type, page=page, size=size)
+
+# 검색창 자동완성: 초성("ㅇㄹㅇㅈ")이나 조합 중인 음절("어린 와")로 출처 제목/작가, 태그 추천
+@router.get("/suggest", response_model=list[SuggestItem])
+async def suggest(
+    q: str = Query(..., min_length=1),
+    kind: str | None = Query(None, enum=["source", "tag"]),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await suggest_service.ensure_built(db)
+    return suggest_service.suggest(q, kind=kind, limit=limit)
+
+# 인메모리 검색 인덱스 상태 (문서/term 수, 메모리, 빌드 시간)
+@router.get("/index/stats")
+async def search_index_stats():
+    return search_index.stats()
+
+# 검색 결과 캐시 적중률 (hits/misses는 워커별 카운터)
+@router.get("/cache/stats")
+async def search_cache_stats():
+    return search_cache.stats()
@@ -5,6 +5,9 @@ from sqlalchemy.exc import IntegrityError
 from app.database import get_async_db
 from app.schemas import SourceCreate, SourceRead, SourceUpdate, PublisherCreate
 from app.services import source_service, publisher_service
+from app.services.search_cache import search_cache
+from app.services.search_index import search_index
+from app.services.suggest import suggest_service
 
 router = APIRouter(prefix="/source", tags=["Source"])
 
@@ -15,8 +18,12 @@ async def create_source(source: SourceCreate, db: AsyncSession = Depends(get_asy
         created_source = await source_service.repository.create(db, obj_in=source)
         source_id = created_source.id  # Get ID before commit
         await db.commit()
+        await search_index.refresh_source(db, source_id)
         # After commit, created_source is expired. Fetch fresh data.
-        return await source_service.get_with_details(db, source_id=source_id)
+        source_read = await source_service.get_with_details(db, source_id=source_id)
+        suggest_service.index_source(source_read.id, source_read.title, source_read.creator, source_read.source_type)
+        await search_cache.bump("source")
+        return source_read
     except IntegrityError as e:
         await db.rollback()
         raise HTTPException(status_code=400, detail=f"Database integrity issue: {e}")
@@ -54,6 +61,9 @@ async def update_source(
             source_in.publisher_id = new_publisher.id
 
     updated_source = await source_service.update(db, db_obj=source, obj_in=source_in)
+    await search_index.refresh_source(db, source_id)
+    suggest_service.index_source(updated_source.id, updated_source.title, updated_source.creator, updated_source.source_type)
+    await search_cache.bump("source")
     return updated_source
 
 
@@ -63,4 +73,7 @@ async def delete_source(source_id: int, db: AsyncSession = Depends(get_async_db)
     if not source:
         raise HTTPException(status_code=400, detail="소스를 찾을 수 없습니다.")
     await source_service.repository.remove(db, id=source_id)
+    search_index.remove_source(source_id)
+    suggest_service.remove("source", source_id)
+    await search_cache.bump("source", "quote")
     return {"message": "소스 삭제 완료"}
\ No newline at end of file
@@ -1,26 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_db
 from app.schemas import TagCreate, TagRead, TagUpdate
 from app.services import tag_service
+from app.services.search_cache import search_cache
+from app.services.search_index import search_index
+from app.services.suggest import suggest_service
+from app.services.tag_registry import tag_registry
 
 router = APIRouter(prefix="/tag", tags=["Tag"])
 
 # 새 태그 생성
 @router.post("/", response_model=TagRead)
 async def create(tag: TagCreate, db: AsyncSession = Depends(get_async_db)):
-    return await tag_service.repository.create(db, obj_in=tag)
+    created_tag = await tag_service.repository.create(db, obj_in=tag)
+    version = await tag_service.bump_version(db)
+    await db.commit()
+    await db.refresh(created_tag)
+    tag_registry.put(created_tag.id, created_tag.name, version=version)
+    search_index.refresh_tag(created_tag.id, created_tag.name)
+    suggest_service.index_tag(created_tag.id, created_tag.name)
+    await search_cache.bump("tag")
+    return created_tag
 
-# 태그 전체 조회
+# 태그 전체 조회 (태그 레지스트리, prefix가 있으면 접두어 검색)
 @router.get("/", response_model=list[TagRead])
-async def list(db: AsyncSession = Depends(get_async_db)):
-    return await tag_service.repository.get_all(db)
+async def list(
+    prefix: str | None = None,
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await tag_registry.ensure_loaded(db)
+    if prefix:
+        return tag_registry.prefix(prefix, limit=limit)
+    return tag_registry.all()
 
 # 특정 태그 조회
 @router.get("/{tag_id}", response_model=TagRead)
 async def get(tag_id: int, db: AsyncSession = Depends(get_async_db)):
-    tag = await tag_service.repository.get(db, id=tag_id)
+    await tag_registry.ensure_loaded(db)
+    tag = tag_registry.get(tag_id)
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
     return tag
@@ -31,7 +51,12 @@ async def update(tag_id: int, tag_in: TagUpdate, db: AsyncSession = Depends(get_
     tag = await tag_service.repository.get(db, id=tag_id)
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
+    version = await tag_service.bump_version(db)  # update가 커밋할 때 같이 커밋됨
     tag = await tag_service.repository.update(db, db_obj=tag, obj_in=tag_in)
+    tag_registry.put(tag.id, tag.name, version=version)
+    search_index.refresh_tag(tag.id, tag.name)
+    suggest_service.index_tag(tag.id, tag.name)
+    await search_cache.bump("tag")
     return tag
 
 # 태그 삭제
@@ -40,5 +65,10 @@ async def delete_tag(tag_id: int, db: AsyncSession = Depends(get_async_db)):
     tag = await tag_service.repository.get(db, id=tag_id)
     if not tag:
         raise HTTPException(status_code=400, detail="태그를 찾을 수 없습니다.")
+    version = await tag_service.bump_version(db)  # remove가 커밋할 때 같이 커밋됨
     await tag_service.repository.remove(db, id=tag_id)
-    return {"message": "태그 삭제 됨"}
\ No newline at end of file
+    tag_registry.remove(tag_id, version=version)
+    search_index.remove_tag(tag_id)
+    suggest_service.remove("tag", tag_id)
+    await search_cache.bump("tag")
+    return {"message": "태그 삭제 됨"}
@@ -10,4 +10,4 @@ from .producer import ProducerRead, ProducerCreate, ProducerUpdate
 from .source import SourceRead, SourceCreate, SourceUpdate
 from .movie import MovieCreate, MovieRead, MovieUpdate
 from .drama import DramaCreate, DramaRead, DramaUpdate
-from .search import SearchResult
+from .search import SearchResult, SuggestItem
@@ -1,5 +1,8 @@
+import base64
+import json
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional, Tuple
 
 T = TypeVar("T")
 
@@ -9,3 +12,28 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     size: int
     total_pages: int
+
+
+# 커서 페이지네이션 (created_at, id 기준 keyset). 깊은 페이지도 OFFSET 없이 인덱스 범위만 읽음
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor로 전달. 마지막 페이지면 None
+    has_more: bool
+    total: Optional[int] = None  # with_total=true 일 때만 COUNT(*) 실행
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """(created_at, id) 위치를 불투명한 문자열로 인코딩."""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """encode_cursor의 역. 잘못된 커서면 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
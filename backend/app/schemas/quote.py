@@ -50,3 +50,4 @@ class QuoteInDB(QuoteBase):
 class QuoteRead(QuoteInDB):
     tags: List[TagRead] = []
     source: Optional[SourceRead] = None
+    bookmark_count: int = 0
@@ -12,6 +12,20 @@ class RecommendationItem(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @classmethod
+    def from_quote(cls, quote) -> "RecommendationItem":
+        """Quote ORM 객체(source 로드됨)에서 생성. bookmark_count는 quotes 컬럼 값을 그대로 사용 (추가 쿼리 없음)."""
+        title = quote.source.title if quote.source else None
+        return cls(
+            id=quote.id,
+            content=quote.content,
+            page=quote.page,
+            source_id=quote.source_id,
+            source_title=title,
+            book_title=title if quote.source and quote.source.source_type == "book" else None,
+            bookmark_count=quote.bookmark_count,
+        )
+
 class BookRecommendation(BaseModel):
     title: str
     author: str
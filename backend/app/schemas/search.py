@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Union
+from typing import List, Optional, Union
 from .quote import QuoteRead
 from .source import SourceRead
 from .tag import TagRead
@@ -8,3 +8,14 @@ class SearchResult(BaseModel):
     quotes: List[QuoteRead]
     sources: List[SourceRead]
     tags: List[TagRead]
+    partial: bool = False  # 일부 하위 검색이 시간 제한을 넘겨 빠진 경우 True
+
+
+class SuggestItem(BaseModel):
+    kind: str  # "source" | "tag"
+    id: int
+    text: str
+    source_type: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from app.schemas.quote import QuoteRead
+
+
+# 트렌딩 문장: 문장 + 현재 시각 기준 감쇠 점수
+class TrendingQuoteRead(QuoteRead):
+    score: float
+
+# 트렌딩 태그
+class TrendingTagRead(BaseModel):
+    id: int
+    name: str
+    score: float
@@ -43,15 +43,16 @@ class AIRecommendationService:
 
     async def get_quotes_recommendations(self, db: AsyncSession, source_type: str, limit: int, user_id: Optional[int] = None) -> List[QuoteRead]:
         """Fetch and transform AI quote recommendations."""
-        if not self.ai_service:
-            return []
+        if not self.ai_service or not self.ai_service.is_available():
+            # Vertex is failing fast (circuit open): don't wait on it, serve DB quotes instead
+            return await self._db_fallback(db, source_type, limit)
 
         user_context = await self.get_user_context(db, user_id) if user_id else ""
         
         # Get pool from AI
         ai_quotes_pool = await self.ai_service.get_recommendations(source_type, limit=15, user_context=user_context)
         if not ai_quotes_pool:
-            return []
+            return await self._db_fallback(db, source_type, limit)
 
         # Variety selection
         selected = random.sample(ai_quotes_pool, min(len(ai_quotes_pool), limit))
@@ -62,9 +63,18 @@ class AIRecommendationService:
         
         return recommendations
 
+    async def _db_fallback(self, db: AsyncSession, source_type: str, limit: int) -> List[QuoteRead]:
+        """Random DB quotes used when the AI pool is unavailable."""
+        try:
+            quotes = await quote_service.get_random_by_source_type(db, source_type=source_type, limit=limit)
+            return [QuoteRead.model_validate(q) for q in quotes]
+        except Exception as e:
+            logger.error(f"DB fallback for recommendations failed: {e}")
+            return []
+
     async def get_related_chain(self, current_content: str, limit: int) -> List[QuoteRead]:
         """Fetch chain recommendations."""
-        if not self.ai_service:
+        if not self.ai_service or not self.ai_service.is_available():
             return []
         
         related_raw = await self.ai_service.get_related_quotes(current_content, limit=limit)
@@ -1,6 +1,12 @@
-from app.repositories import bookmark_repository
+from datetime import datetime
+
+from app.repositories import bookmark_repository, quote_daily_popularity_repository, quote_repository
 from app.services.base import BaseService
 from app.repositories.bookmark import BookmarkRepository
+from app.models import Bookmark
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.services.search_cache import search_cache
+from app.services.trending import trending_service
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -11,5 +17,47 @@ class BookmarkService(BaseService[BookmarkRepository]):
         total = await self.repository.count_by_user_id(db, user_id=user_id)
         return items, total
 
+    async def get_by_user_id_cursor(
+        self, db: AsyncSession, user_id: int, cursor: str | None = None, size: int = 10, with_total: bool = False
+    ):
+        """커서 기반 페이지. (items, next_cursor, total) 반환. 잘못된 커서는 ValueError."""
+        after = decode_cursor(cursor) if cursor else None
+        # 한 개 더 읽어서 다음 페이지 존재 여부 판단
+        rows = await self.repository.get_by_user_id(db, user_id=user_id, limit=size + 1, after=after)
+        items = rows[:size]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].quote_id) if len(rows) > size else None
+        total = await self.repository.count_by_user_id(db, user_id=user_id) if with_total else None
+        return items, next_cursor, total
+
+    async def add_bookmark(self, db: AsyncSession, *, user_id: int, quote_id: int) -> Bookmark:
+        """북마크를 추가하고 문장의 bookmark_count, 일별 인기 집계, 트렌딩 점수를 함께 갱신합니다."""
+        bookmark = Bookmark(user_id=user_id, quote_id=quote_id)
+        db.add(bookmark)
+        await db.flush()
+        # created_at은 DB 시각(server_default)이라 집계 날짜도 그 값에서 구함 (재구축/삭제 차감과 같은 기준)
+        await db.refresh(bookmark, ["created_at"])
+        await quote_repository.adjust_bookmark_count(db, quote_id=quote_id, delta=1)
+        await quote_daily_popularity_repository.increment(
+            db, quote_id=quote_id, day=bookmark.created_at.date(), delta=1
+        )
+        source_type, tag_ids = await quote_repository.get_trending_keys(db, quote_id=quote_id)
+        await db.commit()
+        await db.refresh(bookmark)
+        await search_cache.bump("quote")  # 캐시된 검색 결과의 bookmark_count 갱신
+        trending_service.record(quote_id, source_type, tag_ids, delta=1)
+        return bookmark
+
+    async def remove_bookmark(self, db: AsyncSession, *, bookmark: Bookmark) -> None:
+        """북마크를 삭제하고, 문장의 bookmark_count와 북마크가 생성된 날짜의 인기 집계를 차감합니다."""
+        quote_id = bookmark.quote_id
+        day = (bookmark.created_at or datetime.utcnow()).date()
+        await db.delete(bookmark)
+        await quote_repository.adjust_bookmark_count(db, quote_id=quote_id, delta=-1)
+        await quote_daily_popularity_repository.increment(db, quote_id=quote_id, day=day, delta=-1)
+        source_type, tag_ids = await quote_repository.get_trending_keys(db, quote_id=quote_id)
+        await db.commit()
+        await search_cache.bump("quote")
+        trending_service.record(quote_id, source_type, tag_ids, delta=-1)
+
 
 bookmark_service = BookmarkService(bookmark_repository)
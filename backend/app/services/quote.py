@@ -1,21 +1,67 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories import quote_repository
+from app.repositories import quote_repository, trending_score_repository
 from app.services.base import BaseService
 from app.repositories.quote import QuoteRepository
+from app.schemas.pagination import decode_cursor, encode_cursor
 from app.schemas.popular import PopularQuoteResponse
+from app.schemas.quote import QuoteRead
+from app.schemas.recommendation import RecommendationItem
+from app.schemas.trending import TrendingQuoteRead
+from app.services.quote_sampler import quote_sampler
+from app.services.trending import trending_service
 
 
 class QuoteService(BaseService[QuoteRepository]):
     async def get_most_bookmarked(self, db: AsyncSession, limit: int = 10):
         return await self.repository.get_most_bookmarked(db, limit=limit)
 
+    async def get_most_bookmarked_items(self, db: AsyncSession, limit: int = 10) -> list[RecommendationItem]:
+        quotes = await self.repository.get_most_bookmarked(db, limit=limit)
+        return [RecommendationItem.from_quote(quote) for quote in quotes]
+
+    async def get_trending(self, db: AsyncSession, limit: int = 10, source_type: str | None = None) -> list[TrendingQuoteRead]:
+        """메모리의 트렌딩 점수 상위 문장. bookmarks는 읽지 않고 quotes를 id로만 조회.
+
+        다른 워커에서 지워진 문장이 메모리에 남아 있으면 순위에서 빼고 다시 채움.
+        """
+        while True:
+            scores = dict(trending_service.top_quotes(limit, source_type=source_type))
+            quotes = await self.repository.get_many(db, list(scores))
+            missing = scores.keys() - {quote.id for quote in quotes}
+            if not missing:
+                break
+            for quote_id in missing:
+                trending_service.remove_quote(quote_id)
+        return [
+            TrendingQuoteRead(**QuoteRead.model_validate(quote).model_dump(), score=scores[quote.id])
+            for quote in quotes
+        ]
+
+    async def delete(self, db: AsyncSession, *, quote_id: int) -> None:
+        """문장 삭제. 트렌딩 스냅샷 행도 같은 트랜잭션에서 지움 (repository.remove가 커밋)."""
+        await trending_score_repository.delete_quote(db, quote_id=quote_id)
+        await self.repository.remove(db, id=quote_id)
+        trending_service.remove_quote(quote_id)
+
     async def get_by_user_id_paginated(self, db: AsyncSession, user_id: int, page: int = 1, size: int = 10):
         skip = (page - 1) * size
         items = await self.repository.get_by_user_id(db, user_id=user_id, skip=skip, limit=size)
         total = await self.repository.count_by_user_id(db, user_id=user_id)
         return items, total
 
+    async def get_by_user_id_cursor(
+        self, db: AsyncSession, user_id: int, cursor: str | None = None, size: int = 10, with_total: bool = False
+    ):
+        """커서 기반 페이지. (items, next_cursor, total) 반환. 잘못된 커서는 ValueError."""
+        after = decode_cursor(cursor) if cursor else None
+        # 한 개 더 읽어서 다음 페이지 존재 여부 판단
+        rows = await self.repository.get_by_user_id(db, user_id=user_id, limit=size + 1, after=after)
+        items = rows[:size]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > size else None
+        total = await self.repository.count_by_user_id(db, user_id=user_id) if with_total else None
+        return items, next_cursor, total
+
     async def get_latest_by_source_type(
         self, db: AsyncSession, source_type: str, limit: int = 10
     ):
@@ -26,9 +72,7 @@ class QuoteService(BaseService[QuoteRepository]):
     async def get_random_by_source_type(
         self, db: AsyncSession, source_type: str, limit: int = 3
     ):
-        return await self.repository.get_random_by_source_type(
-            db, source_type=source_type, limit=limit
-        )
+        return await quote_sampler.sample(db, source_type=source_type, k=limit)
 
     async def get_todays_most_popular_by_source_type(
         self, db: AsyncSession, source_type: str
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import random
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Quote
+from app.repositories import quote_repository
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteSampler:
+    """source_type별 랜덤 문장 샘플러.
+
+    ORDER BY RANDOM()은 매번 조인 결과 전체를 정렬하므로, source_type별 문장 id를 array('I')로 메모리에 들고
+    (100만 건 ≈ 4MB) 겹치지 않는 k개 위치를 뽑은 뒤 id로만 조회합니다 (O(k)).
+    첫 요청 때 전체를 읽고, 이후 refresh_seconds마다 마지막 id 이후의 새 문장만 PK 범위로 추가합니다.
+    삭제된 문장은 get_many에서 빠질 때 배열에서도 지우고, 출처 변경 등은 full_reload_every번째 갱신 때 전체를 다시 읽어 반영.
+    갱신은 락으로 하나씩만 실행 (동시 요청이 같은 새 id를 두 번 붙이지 않도록).
+    """
+
+    def __init__(self, refresh_seconds: float, full_reload_every: int = 12, rng: Optional[random.Random] = None):
+        self.refresh_seconds = refresh_seconds
+        self.full_reload_every = full_reload_every
+        self.rng = rng or random.Random()
+        self._ids: Dict[str, array] = {}
+        self._max_id = 0
+        self._refreshes = 0
+        self.loaded_at: Optional[float] = None
+        self.load_seconds = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.refresh_seconds
+
+    async def refresh(self, db: AsyncSession, full: bool = False) -> None:
+        async with self._lock:
+            await self._refresh(db, full)
+
+    async def refresh_if_stale(self, db: AsyncSession) -> None:
+        if not self.stale:
+            return
+        async with self._lock:
+            if self.stale:  # 락을 기다리는 동안 다른 요청이 이미 갱신했을 수 있음
+                await self._refresh(db)
+
+    async def _refresh(self, db: AsyncSession, full: bool = False) -> None:
+        started = time.perf_counter()
+        full = full or not self._ids or self._refreshes % self.full_reload_every == 0
+        ids: Dict[str, array] = {} if full else self._ids
+        after_id = 0 if full else self._max_id
+        max_id = after_id
+        for quote_id, source_type in await quote_repository.get_ids_with_source_type(db, after_id=after_id):
+            ids.setdefault(source_type, array("I")).append(quote_id)
+            max_id = max(max_id, quote_id)
+        self._ids, self._max_id = ids, max_id
+        self._refreshes += 1
+        self.loaded_at = time.monotonic()
+        self.load_seconds = time.perf_counter() - started
+        if full:
+            logger.info(f"Quote sampler loaded in {self.load_seconds * 1000:.1f} ms: {self.stats()['source_types']}")
+
+    def invalidate(self) -> None:
+        """다음 요청 때 전체를 다시 읽음."""
+        self._ids, self._max_id, self.loaded_at = {}, 0, None
+
+    def sample_ids(self, source_type: str, k: int) -> List[int]:
+        ids = self._ids.get(source_type)
+        if not ids:
+            return []
+        # 배열에 같은 id가 섞여 있어도 결과는 서로 다른 id만
+        return list(dict.fromkeys(ids[i] for i in self.rng.sample(range(len(ids)), min(k, len(ids)))))
+
+    def _discard(self, source_type: str, quote_ids) -> None:
+        ids = self._ids.get(source_type)
+        for quote_id in quote_ids:
+            try:
+                ids.remove(quote_id)
+            except ValueError:
+                pass
+
+    async def sample(self, db: AsyncSession, *, source_type: str, k: int = 3) -> List[Quote]:
+        """source_type 문장 중 서로 다른 k개 (없으면 있는 만큼)."""
+        await self.refresh_if_stale(db)
+        ids = self.sample_ids(source_type, k)
+        quotes = await quote_repository.get_many(db, ids)
+        if len(quotes) < len(ids):
+            # 삭제된 문장이 배열에 남아 있었음: 배열에서 빼고 모자란 만큼 한 번 더 뽑음
+            self._discard(source_type, set(ids) - {quote.id for quote in quotes})
+            more = [i for i in self.sample_ids(source_type, k) if i not in set(ids)][:k - len(quotes)]
+            quotes += await quote_repository.get_many(db, more)
+        return quotes
+
+    def stats(self) -> dict:
+        return {
+            "loaded_at": self.loaded_at,
+            "load_ms": round(self.load_seconds * 1000, 1),
+            "source_types": {source_type: len(ids) for source_type, ids in self._ids.items()},
+        }
+
+
+quote_sampler = QuoteSampler(settings.quote_sampler_refresh_seconds)
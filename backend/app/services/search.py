@@ -1,37 +1,127 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
+import time
 
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
 from app.repositories import quote_repository, source_repository, tag_repository
 from app.schemas import SearchResult
 from app.schemas.quote import QuoteRead as QuoteSchema
 from app.schemas.source import SourceRead as SourceWithDetails
 from app.services.source import source_service # Import source_service
+from app.services.search_cache import search_cache
+from app.services.search_index import search_index
+from app.services.tag_registry import tag_registry
+
+logger = logging.getLogger(__name__)
+
 
 class SearchService:
-    async def search(self, db: AsyncSession, query: str, source_type: str | None = None) -> SearchResult:
-        quotes = await quote_repository.search(db, query=query, source_type=source_type)
-        raw_sources = await source_repository.search(db, query=query, source_type=source_type)
-        tags = await tag_repository.search(db, query=query)
-
-        all_source_ids = set()
-        for source in raw_sources:
-            all_source_ids.add(source.id)
-        for quote in quotes:
-            if quote.source_id:
-                all_source_ids.add(quote.source_id)
-
-        unique_sources_read = []
-        processed_source_ids = set()
-        for source_id in all_source_ids:
-            if source_id not in processed_source_ids:
-                source_with_details = await source_service.get_with_details(db, source_id=source_id)
-                if source_with_details:
-                    unique_sources_read.append(source_with_details)
-                    processed_source_ids.add(source_id)
-        
+    async def search(self, db: AsyncSession, query: str, source_type: str | None = None, page: int = 1, size: int = 10) -> SearchResult:
+        if not search_cache.enabled:
+            return await self._search(db, query, source_type, page, size)
+
+        key = search_cache.make_key(query, source_type, page, size)
+        cached = await search_cache.get(key)
+        if cached is not None:
+            return SearchResult.model_validate_json(cached)
+        # 검색 전에 버전을 읽어 둠: 검색 도중 쓰기가 들어오면 이 항목은 다음 조회 때 무효
+        versions = await search_cache.versions()
+        result = await self._search(db, query, source_type, page, size)
+        if not result.partial:
+            await search_cache.set(key, result.model_dump_json(), versions)
+        return result
+
+    async def _search(self, db: AsyncSession, query: str, source_type: str | None, page: int, size: int) -> SearchResult:
+        offset = (page - 1) * size
+        if search_index.ready:
+            # 인메모리 역색인(BM25)으로 id를 찾고, 해당 페이지의 행만 IN 쿼리로 가져옴
+            quote_ids = search_index.search_quotes(query, source_type, limit=size, offset=offset)
+            source_ids = search_index.search_sources(query, source_type, limit=size, offset=offset)
+            tag_ids = search_index.search_tags(query, limit=size, offset=offset)
+            subqueries = {
+                "quotes": lambda session: quote_repository.get_many(session, quote_ids),
+                "sources": lambda session: source_repository.get_many(session, source_ids),
+                "tags": lambda session: tag_repository.get_many(session, tag_ids),
+            }
+        else:
+            subqueries = {
+                "quotes": lambda session: quote_repository.search(session, query=query, source_type=source_type, limit=offset + size),
+                "sources": lambda session: source_repository.search(session, query=query, source_type=source_type, limit=offset + size),
+                "tags": lambda session: tag_repository.search(session, query=query, limit=offset + size),
+            }
+        if tag_registry.ready:
+            # 태그는 레지스트리에서 바로 (DB 왕복 없음)
+            del subqueries["tags"]
+        results, partial = await self._run_concurrently(db, subqueries, timeout=settings.search_timeout_seconds)
+        if tag_registry.ready:
+            results["tags"] = (
+                tag_registry.get_many(tag_ids) if search_index.ready
+                else tag_registry.search(query, limit=offset + size)
+            )
+        if not search_index.ready:
+            results = {name: rows[offset:] for name, rows in results.items()}
+        quotes, raw_sources, tags = results["quotes"], results["sources"], results["tags"]
+
+        # 검색된 출처 + 검색된 문장의 출처를 순서대로 모아 상세까지 한 번에 로드
+        all_source_ids = list(dict.fromkeys(
+            [source.id for source in raw_sources] + [quote.source_id for quote in quotes if quote.source_id]
+        ))
+        unique_sources_read = await source_service.get_many_with_details(db, all_source_ids)
+
         quotes_read = []
         for quote in quotes:
             quotes_read.append(QuoteSchema.from_orm(quote))
 
-        return SearchResult(quotes=quotes_read, sources=unique_sources_read, tags=tags)
+        return SearchResult(quotes=quotes_read, sources=unique_sources_read, tags=tags, partial=partial)
+
+    async def _run_concurrently(self, db: AsyncSession, subqueries: dict, timeout: float) -> tuple[dict, bool]:
+        """서로 독립인 하위 쿼리를 각자의 세션(풀의 다른 커넥션)에서 동시에 실행.
+
+        timeout 안에 끝나지 않은 쿼리는 취소하고, 예외가 난 쿼리와 함께 빈 결과로 두며 partial=True를 돌려줌.
+        세션이 엔진이 아닌 커넥션에 묶여 있으면(테스트 픽스처, 바깥 트랜잭션) 커넥션을 나눠 쓸 수 없으므로 순서대로 실행.
+        """
+        if db.bind is None or isinstance(db.bind, AsyncConnection):
+            return await self._run_sequentially(db, subqueries, timeout)
+
+        async def run_in_own_session(run):
+            async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+                return await run(session)
+
+        tasks = {name: asyncio.create_task(run_in_own_session(run)) for name, run in subqueries.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=timeout if timeout > 0 else None)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results, partial = {}, False
+        for name, task in tasks.items():
+            if task not in done:
+                logger.warning(f"Search sub-query '{name}' exceeded {timeout}s; returning partial results")
+            elif task.exception() is not None:
+                logger.warning(f"Search sub-query '{name}' failed: {task.exception()}; returning partial results")
+            else:
+                results[name] = task.result()
+                continue
+            results[name], partial = [], True
+        return results, partial
+
+    async def _run_sequentially(self, db: AsyncSession, subqueries: dict, timeout: float) -> tuple[dict, bool]:
+        """같은 세션에서 하나씩 실행. 실행 중인 쿼리는 취소하지 않고, 기한이 지나면 남은 쿼리를 건너뜀."""
+        deadline = time.monotonic() + timeout if timeout > 0 else None
+        results, partial = {}, False
+        for name, run in subqueries.items():
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"Search sub-query '{name}' skipped after {timeout}s; returning partial results")
+            else:
+                try:
+                    results[name] = await run(db)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Search sub-query '{name}' failed: {e}; returning partial results")
+            results[name], partial = [], True
+        return results, partial
 
 search_service = SearchService()
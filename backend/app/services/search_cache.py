@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.hangul import normalize
+
+logger = logging.getLogger(__name__)
+
+# 검색 결과가 의존하는 엔티티 종류. 쓰기 경로에서 bump()로 버전을 올리면 해당 종류에 의존하는 캐시 항목이 무효화됨
+ENTITY_TYPES = ("quote", "source", "tag")
+
+
+class MemorySearchCacheBackend:
+    """프로세스 내 LRU+TTL 저장소. SearchCache가 to_thread 워커에서 부르므로 락으로 보호.
+
+    단일 워커 전용: 엔티티 버전도 프로세스 메모리에 있어서 다른 워커의 bump()가 보이지 않음.
+    여러 워커로 띄우면 다른 워커에서 바뀐 결과를 TTL이 끝날 때까지 돌려줄 수 있으므로 sqlite 백엔드를 쓸 것.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, dict, float]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Tuple[str, dict, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: str, versions: dict, expires_at: float) -> int:
+        with self._lock:
+            self._entries[key] = (value, versions, expires_at)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def versions(self) -> Dict[str, int]:
+        with self._lock:
+            return {entity: self._versions.get(entity, 0) for entity in ENTITY_TYPES}
+
+    def bump(self, entity: str) -> None:
+        with self._lock:
+            self._versions[entity] = self._versions.get(entity, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SqliteSearchCacheBackend:
+    """로컬 SQLite 파일(WAL) 저장소. 같은 머신의 여러 uvicorn 워커가 캐시와 엔티티 버전을 공유."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    versions TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_search_cache_last_used ON search_cache (last_used)")
+            conn.execute("CREATE TABLE IF NOT EXISTS entity_versions (entity TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, dict, float]]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, versions, expires_at FROM search_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE search_cache SET last_used = ? WHERE cache_key = ?", (time.time(), key))
+            conn.commit()
+        return row[0], json.loads(row[1]), row[2]
+
+    def set(self, key: str, value: str, versions: dict, expires_at: float) -> int:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (cache_key, value, versions, expires_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, value, json.dumps(versions), expires_at, time.time()),
+            )
+            evicted = conn.execute(
+                """
+                DELETE FROM search_cache WHERE cache_key IN (
+                    SELECT cache_key FROM search_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+            conn.commit()
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM search_cache WHERE cache_key = ?", (key,))
+            conn.commit()
+
+    def versions(self) -> Dict[str, int]:
+        with self._lock:
+            rows = dict(self._connect().execute("SELECT entity, version FROM entity_versions").fetchall())
+        return {entity: rows.get(entity, 0) for entity in ENTITY_TYPES}
+
+    def bump(self, entity: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO entity_versions (entity, version) VALUES (?, 1) "
+                "ON CONFLICT(entity) DO UPDATE SET version = version + 1",
+                (entity,),
+            )
+            conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM search_cache")
+            conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+
+class SearchCache:
+    """SearchService.search 앞단 캐시. 키는 정규화한 검색어 + source_type + 페이지.
+
+    항목마다 저장 시점의 엔티티 버전(quote/source/tag)을 같이 저장하고, 읽을 때 현재 버전과 다르면 버림.
+    backend가 None이면(SEARCH_CACHE_BACKEND=off) 비활성: bump()는 아무것도 하지 않음.
+    """
+
+    def __init__(self, backend, ttl: float, depends_on: Tuple[str, ...] = ENTITY_TYPES):
+        self.backend = backend
+        self.enabled = backend is not None
+        self.ttl = ttl
+        self.depends_on = depends_on
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str, source_type: str | None, page: int, size: int) -> str:
+        return "\x1f".join([normalize(query), source_type or "", str(page), str(size)])
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            entry, current = await asyncio.to_thread(lambda: (self.backend.get(key), self.backend.versions()))
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache read failed: {e}")
+            return None
+        if entry is None:
+            self.misses += 1
+            return None
+        value, versions, expires_at = entry
+        if expires_at <= time.time():
+            self.expired += 1
+        elif any(versions.get(entity) != current[entity] for entity in self.depends_on):
+            self.invalidated += 1
+        else:
+            self.hits += 1
+            return value
+        self.misses += 1
+        await asyncio.to_thread(self.backend.delete, key)
+        return None
+
+    async def versions(self) -> Dict[str, int]:
+        return await asyncio.to_thread(self.backend.versions)
+
+    async def set(self, key: str, value: str, versions: Dict[str, int]) -> None:
+        # versions는 검색을 시작하기 전에 읽은 값이어야 함 (검색 중 들어온 쓰기를 놓치지 않도록)
+        try:
+            self.evictions += await asyncio.to_thread(self.backend.set, key, value, versions, time.time() + self.ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache write failed: {e}")
+
+    async def bump(self, *entities: str) -> None:
+        """쓰기 경로에서 커밋 후 호출. 읽기처럼 백엔드 I/O(SQLite는 락 대기 포함)는 스레드에서 실행."""
+        if not self.enabled:
+            return
+
+        def bump_all():
+            for entity in entities:
+                self.backend.bump(entity)
+
+        try:
+            await asyncio.to_thread(bump_all)
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache version bump failed: {e}")
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidated": self.invalidated,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": self.backend.size(),
+        }
+
+
+def build_search_cache() -> SearchCache:
+    if settings.search_cache_backend == "sqlite":
+        backend = SqliteSearchCacheBackend(settings.search_cache_path, settings.search_cache_max_entries)
+    elif settings.search_cache_backend == "memory":
+        backend = MemorySearchCacheBackend(settings.search_cache_max_entries)
+    else:
+        backend = None
+    return SearchCache(backend, ttl=settings.search_cache_ttl_seconds)
+
+
+search_cache = build_search_cache()
@@ -0,0 +1,360 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import sys
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Book, Drama, Movie, Producer, Quote, Source, Tag
+from app.models.quote_tag import quote_tags
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+# source_type -> 1바이트 코드 (문서별 필터 속성). 0은 "없음"
+SOURCE_TYPE_CODES = {name: code for code, name in enumerate(["", "book", "movie", "drama", "tv", "speech", "other"])}
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(unicodedata.normalize("NFKC", text or "").lower())
+
+
+def tokenize(text: str) -> List[str]:
+    """문서 토큰: 단어별 글자 unigram + bigram. 한국어는 띄어쓰기/조사와 무관하게 부분 일치가 되도록 n-gram으로 색인."""
+    terms = []
+    for word in _words(text):
+        terms.extend(word)
+        terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    """검색어 토큰: 한 글자 단어는 unigram, 나머지는 bigram. 모든 토큰을 포함한 문서만 후보 (AND)."""
+    terms = []
+    for word in _words(query):
+        grams = [word] if len(word) == 1 else [word[i:i + 2] for i in range(len(word) - 1)]
+        terms.extend(g for g in grams if g not in terms)
+    return terms
+
+
+class InvertedIndex:
+    """n-gram 역색인 + BM25 랭킹.
+
+    문서마다 내부 문서 번호(docno)를 단조 증가로 부여하고, 포스팅은 term별 array('I') docno / array('H') tf로 저장.
+    수정은 기존 docno를 삭제 표시(tombstone)하고 새 docno로 다시 추가하므로 포스팅은 항상 정렬 상태를 유지.
+    삭제 표시가 많아지면 compact()로 포스팅을 다시 씀.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_ids = array("I")    # docno -> entity id
+        self._doc_lens = array("I")   # docno -> 토큰 수
+        self._doc_attrs = array("B")  # docno -> 필터 속성 (source_type 코드)
+        self._docno_by_id: Dict[int, int] = {}
+        self._deleted = set()
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._docno_by_id)
+
+    def add(self, entity_id: int, text: str, attr: int = 0) -> None:
+        self.remove(entity_id)
+        terms = tokenize(text)
+        docno = len(self._doc_ids)
+        self._doc_ids.append(entity_id)
+        self._doc_lens.append(len(terms))
+        self._doc_attrs.append(attr)
+        self._docno_by_id[entity_id] = docno
+        self._total_len += len(terms)
+
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array("I"), array("H"))
+            posting[0].append(docno)
+            posting[1].append(min(tf, 0xFFFF))
+
+    def remove(self, entity_id: int) -> None:
+        docno = self._docno_by_id.pop(entity_id, None)
+        if docno is None:
+            return
+        self._deleted.add(docno)
+        self._total_len -= self._doc_lens[docno]
+        if len(self._deleted) > 1024 and len(self._deleted) * 4 > len(self._doc_ids):
+            self.compact()
+
+    def compact(self) -> None:
+        """삭제 표시된 문서를 포스팅에서 제거하고 docno를 다시 매김."""
+        remap = array("i", [-1]) * len(self._doc_ids)
+        doc_ids, doc_lens, doc_attrs = array("I"), array("I"), array("B")
+        for docno in range(len(self._doc_ids)):
+            if docno in self._deleted:
+                continue
+            remap[docno] = len(doc_ids)
+            doc_ids.append(self._doc_ids[docno])
+            doc_lens.append(self._doc_lens[docno])
+            doc_attrs.append(self._doc_attrs[docno])
+
+        postings = {}
+        for term, (docnos, tfs) in self._postings.items():
+            new_docnos, new_tfs = array("I"), array("H")
+            for docno, tf in zip(docnos, tfs):
+                if remap[docno] >= 0:
+                    new_docnos.append(remap[docno])
+                    new_tfs.append(tf)
+            if new_docnos:
+                postings[term] = (new_docnos, new_tfs)
+
+        self._postings = postings
+        self._doc_ids, self._doc_lens, self._doc_attrs = doc_ids, doc_lens, doc_attrs
+        self._docno_by_id = {entity_id: docno for docno, entity_id in enumerate(doc_ids)}
+        self._deleted = set()
+
+    def search(self, query: str, *, attr: Optional[int] = None, limit: int = 10, offset: int = 0) -> List[int]:
+        """BM25 점수 내림차순 entity id 목록 (동점이면 최신 id 우선)."""
+        terms = query_terms(query)
+        if not terms or not self._docno_by_id:
+            return []
+        postings = [self._postings.get(term) for term in terms]
+        if any(p is None for p in postings):
+            return []
+        postings.sort(key=lambda p: len(p[0]))
+
+        n_docs = len(self._docno_by_id)
+        avg_len = self._total_len / n_docs if n_docs else 0.0
+        idfs = [math.log(1 + (n_docs - len(p[0]) + 0.5) / (len(p[0]) + 0.5)) for p in postings]
+
+        k1, b = self.K1, self.B
+        deleted, doc_attrs, doc_lens, doc_ids = self._deleted, self._doc_attrs, self._doc_lens, self._doc_ids
+        first_idf, rest = idfs[0], list(zip(idfs[1:], postings[1:]))
+        scored = []
+        shortest_docnos, shortest_tfs = postings[0]
+        for i, docno in enumerate(shortest_docnos):
+            if docno in deleted or (attr is not None and doc_attrs[docno] != attr):
+                continue
+            norm = k1 * (1 - b + b * doc_lens[docno] / avg_len) if avg_len else k1
+            tf = shortest_tfs[i]
+            score = first_idf * tf * (k1 + 1) / (tf + norm)
+            for idf, (docnos, term_tfs) in rest:
+                j = bisect_left(docnos, docno)
+                if j == len(docnos) or docnos[j] != docno:
+                    break
+                tf = term_tfs[j]
+                score += idf * tf * (k1 + 1) / (tf + norm)
+            else:
+                scored.append((-score, -doc_ids[docno]))
+
+        return [-entity_id for _, entity_id in heapq.nsmallest(offset + limit, scored)[offset:]]
+
+    def memory_bytes(self) -> int:
+        """포스팅/문서 배열과 dict의 대략적인 메모리 사용량 (bytes)."""
+        total = sys.getsizeof(self._postings) + sys.getsizeof(self._docno_by_id) + sys.getsizeof(self._deleted)
+        for term, (docnos, tfs) in self._postings.items():
+            total += sys.getsizeof(term) + sys.getsizeof(docnos) + sys.getsizeof(tfs) + 56  # tuple
+        for arr in (self._doc_ids, self._doc_lens, self._doc_attrs):
+            total += sys.getsizeof(arr)
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docno_by_id),
+            "deleted": len(self._deleted),
+            "terms": len(self._postings),
+            "postings": sum(len(docnos) for docnos, _ in self._postings.values()),
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+class SearchIndex:
+    """문장/출처/태그 검색용 인메모리 역색인 묶음 (SEARCH_BACKEND=memory).
+
+    시작 시 DB에서 한 번 빌드하고, 라우터의 생성/수정/삭제 경로에서 refresh_*/remove_*로 갱신합니다.
+    프로세스(워커)마다 따로 존재하므로 다른 워커의 쓰기는 주기적 재빌드(SEARCH_INDEX_REFRESH_SECONDS)로 반영됩니다.
+    빌드 중(DB를 읽은 뒤 새 인덱스로 교체하기 전)에 들어온 refresh_*/remove_*는 기록해 두었다가 교체 직전에 새 인덱스에도 적용.
+    """
+
+    def __init__(self):
+        self.quotes = InvertedIndex()
+        self.sources = InvertedIndex()
+        self.tags = InvertedIndex()
+        self.ready = False
+        self.build_seconds = 0.0
+        self.built_at: Optional[float] = None
+        self._build_lock = asyncio.Lock()
+        self._journal: Optional[List[Tuple[str, int, Optional[str], int]]] = None  # (인덱스 이름, id, 텍스트(None이면 삭제), 속성)
+
+    # ----- loading -----
+    @staticmethod
+    def _quote_rows_statement():
+        return (
+            select(Quote.id, Quote.content, Source.source_type, Tag.name)
+            .outerjoin(Source, Source.id == Quote.source_id)
+            .outerjoin(quote_tags, quote_tags.c.quote_id == Quote.id)
+            .outerjoin(Tag, Tag.id == quote_tags.c.tag_id)
+        )
+
+    @staticmethod
+    def _source_rows_statement():
+        return (
+            select(Source.id, Source.title, Source.creator, Source.source_type, Book.author, Movie.director, Producer.name)
+            .outerjoin(Book, (Source.source_type == "book") & (Source.details_id == Book.id))
+            .outerjoin(Movie, (Source.source_type == "movie") & (Source.details_id == Movie.id))
+            .outerjoin(Drama, Source.source_type.in_(["drama", "tv"]) & (Source.details_id == Drama.id))
+            .outerjoin(Producer, Drama.producer_id == Producer.id)
+        )
+
+    @staticmethod
+    def _group_quote_rows(rows: Iterable) -> Dict[int, Tuple[str, str, List[str]]]:
+        quotes: Dict[int, Tuple[str, str, List[str]]] = {}
+        for quote_id, content, source_type, tag_name in rows:
+            entry = quotes.setdefault(quote_id, (content, source_type or "", []))
+            if tag_name:
+                entry[2].append(tag_name)
+        return quotes
+
+    @staticmethod
+    def _quote_document(content: str, source_type: str, tag_names: List[str]) -> Tuple[str, int]:
+        return " ".join([content or "", *tag_names]), SOURCE_TYPE_CODES.get(source_type, 0)
+
+    @staticmethod
+    def _source_document(row) -> Tuple[int, str, int]:
+        source_id, title, creator, source_type, author, director, producer = row
+        text = " ".join(value for value in (title, creator, author, director, producer) if value)
+        return source_id, text, SOURCE_TYPE_CODES.get(source_type, 0)
+
+    async def build(self, db: AsyncSession) -> None:
+        async with self._build_lock:
+            self._journal = []
+            try:
+                await self._build(db)
+            finally:
+                self._journal = None
+
+    async def _build(self, db: AsyncSession) -> None:
+        started = time.perf_counter()
+        quote_rows = (await db.execute(self._quote_rows_statement())).all()
+        source_rows = (await db.execute(self._source_rows_statement())).all()
+        tag_rows = (await db.execute(select(Tag.id, Tag.name))).all()
+
+        def build_indexes():
+            quotes, sources, tags = InvertedIndex(), InvertedIndex(), InvertedIndex()
+            for quote_id, (content, source_type, tag_names) in self._group_quote_rows(quote_rows).items():
+                quotes.add(quote_id, *self._quote_document(content, source_type, tag_names))
+            for row in source_rows:
+                sources.add(*self._source_document(row))
+            for tag_id, name in tag_rows:
+                tags.add(tag_id, name)
+            return quotes, sources, tags
+
+        # CPU 작업은 스레드에서 새 인덱스로 빌드한 뒤 한 번에 교체
+        quotes, sources, tags = await asyncio.to_thread(build_indexes)
+        # 그 사이 들어온 변경을 새 인덱스에 다시 적용 (여기서 교체까지는 await가 없어서 다른 변경이 끼어들지 못함)
+        indexes = {"quotes": quotes, "sources": sources, "tags": tags}
+        for name, entity_id, text, attr in self._journal:
+            self._write(indexes[name], entity_id, text, attr)
+        self.quotes, self.sources, self.tags = quotes, sources, tags
+        self.ready = True
+        self.build_seconds = time.perf_counter() - started
+        self.built_at = time.time()
+        logger.info(f"Search index built in {self.build_seconds * 1000:.1f} ms: {self.stats()}")
+
+    async def rebuild_periodically(self, session_factory, interval: float) -> None:
+        """다른 워커에서 생긴 변경을 반영하기 위해 interval초마다 재빌드 (lifespan에서 태스크로 실행)."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as db:
+                    await self.build(db)
+            except Exception as e:
+                logger.warning(f"Search index rebuild failed: {e}")
+
+    # ----- incremental updates (라우터 쓰기 경로에서 커밋 후 호출) -----
+    @property
+    def _tracking(self) -> bool:
+        return self.ready or self._journal is not None
+
+    @staticmethod
+    def _write(index: InvertedIndex, entity_id: int, text: Optional[str], attr: int) -> None:
+        if text is None:
+            index.remove(entity_id)
+        else:
+            index.add(entity_id, text, attr)
+
+    def _apply(self, name: str, entity_id: int, text: Optional[str] = None, attr: int = 0) -> None:
+        """현재 인덱스에 반영하고, 빌드 중이면 교체 직전 재적용을 위해 기록."""
+        if self._journal is not None:
+            self._journal.append((name, entity_id, text, attr))
+        if self.ready:
+            self._write(getattr(self, name), entity_id, text, attr)
+
+    async def refresh_quote(self, db: AsyncSession, quote_id: int) -> None:
+        if not self._tracking:
+            return
+        rows = (await db.execute(self._quote_rows_statement().filter(Quote.id == quote_id))).all()
+        grouped = self._group_quote_rows(rows)
+        if quote_id in grouped:
+            self._apply("quotes", quote_id, *self._quote_document(*grouped[quote_id]))
+        else:
+            self._apply("quotes", quote_id)
+
+    def remove_quote(self, quote_id: int) -> None:
+        self._apply("quotes", quote_id)
+
+    async def refresh_source(self, db: AsyncSession, source_id: int) -> None:
+        if not self._tracking:
+            return
+        row = (await db.execute(self._source_rows_statement().filter(Source.id == source_id))).first()
+        if row is None:
+            self._apply("sources", source_id)
+        else:
+            self._apply("sources", *self._source_document(row))
+
+    def remove_source(self, source_id: int) -> None:
+        self._apply("sources", source_id)
+
+    def refresh_tag(self, tag_id: int, name: str) -> None:
+        # 태그 이름이 바뀌어도 이미 색인된 문장의 태그 텍스트는 다음 재빌드 때 반영됨
+        self._apply("tags", tag_id, name)
+
+    def remove_tag(self, tag_id: int) -> None:
+        self._apply("tags", tag_id)
+
+    # ----- queries -----
+    def search_quotes(self, query: str, source_type: str | None = None, limit: int = 10, offset: int = 0) -> List[int]:
+        attr = SOURCE_TYPE_CODES.get(source_type, -1) if source_type else None
+        return self.quotes.search(query, attr=attr, limit=limit, offset=offset)
+
+    def search_sources(self, query: str, source_type: str | None = None, limit: int = 10, offset: int = 0) -> List[int]:
+        attr = SOURCE_TYPE_CODES.get(source_type, -1) if source_type else None
+        return self.sources.search(query, attr=attr, limit=limit, offset=offset)
+
+    def search_tags(self, query: str, limit: int = 10, offset: int = 0) -> List[int]:
+        return self.tags.search(query, limit=limit, offset=offset)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "build_ms": round(self.build_seconds * 1000, 1),
+            "built_at": self.built_at,
+            "quotes": self.quotes.stats(),
+            "sources": self.sources.stats(),
+            "tags": self.tags.stats(),
+        }
+
+
+search_index = SearchIndex()
@@ -6,34 +6,31 @@ from app.schemas import SourceRead, BookRead, MovieRead, DramaRead
 
 class SourceService(BaseService):
     async def get_with_details(self, db: AsyncSession, source_id: int) -> SourceRead | None:
-        source = await self.repository.get(db, id=source_id)
-        if not source:
-            return None
-        await db.refresh(source) # Ensure all attributes are loaded
-
-        details = None
-        if source.source_type == 'book' and source.details_id:
-            book_obj = await book_repository.get(db, id=source.details_id)
-            if book_obj: details = BookRead.model_validate(book_obj)
-        elif source.source_type == 'movie' and source.details_id:
-            movie_obj = await movie_repo.get(db, id=source.details_id)
-            if movie_obj: details = MovieRead.model_validate(movie_obj)
-        elif source.source_type == 'tv' and source.details_id:
-            drama_obj = await drama_repo.get(db, id=source.details_id)
-            if drama_obj: details = DramaRead.model_validate(drama_obj)
-        
-        source_read = SourceRead.model_validate(source)
-        source_read.details = details
-        return source_read
+        sources = await self.get_many_with_details(db, [source_id])
+        return sources[0] if sources else None
+
+    async def get_many_with_details(self, db: AsyncSession, source_ids: list[int]) -> list[SourceRead]:
+        """출처를 IN 쿼리 한 번으로, 상세(book/movie/tv)는 종류별 IN 쿼리 한 번씩으로 조회. 결과는 source_ids 순서."""
+        sources = await self.repository.get_many(db, source_ids)
+        return await self._with_details(db, sources)
+
+    async def _with_details(self, db: AsyncSession, sources) -> list[SourceRead]:
+        detail_repos = {"book": (book_repository, BookRead), "movie": (movie_repo, MovieRead), "tv": (drama_repo, DramaRead)}
+        details_by_type = {}
+        for source_type, (repository, schema) in detail_repos.items():
+            ids = list({s.details_id for s in sources if s.source_type == source_type and s.details_id})
+            details_by_type[source_type] = {obj.id: schema.model_validate(obj) for obj in await repository.get_many(db, ids)}
+
+        sources_read = []
+        for source in sources:
+            source_read = SourceRead.model_validate(source)
+            source_read.details = details_by_type.get(source.source_type, {}).get(source.details_id)
+            sources_read.append(source_read)
+        return sources_read
 
     async def get_all_with_details(self, db: AsyncSession) -> list[SourceRead]:
         sources = await self.repository.get_all(db)
-        sources_with_details = []
-        for source in sources:
-            source_with_details = await self.get_with_details(db, source.id)
-            if source_with_details:
-                sources_with_details.append(source_with_details)
-        return sources_with_details
+        return await self._with_details(db, sources)
 
     async def update(self, db: AsyncSession, *, db_obj, obj_in) -> SourceRead:
         updated_obj = await self.repository.update(db, db_obj=db_obj, obj_in=obj_in)
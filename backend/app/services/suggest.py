@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.hangul import choseong, decompose, is_choseong_only, normalize
+from app.models import Quote, Source, Tag
+from app.models.quote_tag import quote_tags
+
+logger = logging.getLogger(__name__)
+
+EntryKey = Tuple[str, int]  # ("source" | "tag", id)
+KINDS = ("source", "tag")
+
+
+@dataclass
+class Suggestion:
+    kind: str
+    id: int
+    text: str
+    source_type: Optional[str] = None
+    weight: int = 0  # 연결된 문장 수 (랭킹용)
+
+
+class _Node:
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.entries: set = set()
+        self.top: Optional[List[EntryKey]] = None  # 서브트리 상위 K개 캐시 (변경 시 경로상 노드에서 무효화)
+
+
+class PrefixTrie:
+    """문자 단위 트라이. 노드마다 서브트리 상위 K개 결과를 캐시해서 짧은 접두어도 빠르게 응답."""
+
+    def __init__(self, top_k: int = 20):
+        self.root = _Node()
+        self.top_k = top_k
+
+    def insert(self, key: str, entry: EntryKey) -> None:
+        node = self.root
+        node.top = None
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            node.top = None
+        node.entries.add(entry)
+
+    def delete(self, key: str, entry: EntryKey) -> None:
+        path = [self.root]
+        for char in key:
+            child = path[-1].children.get(char)
+            if child is None:
+                return
+            path.append(child)
+        path[-1].entries.discard(entry)
+        for node in path:
+            node.top = None
+        # 비어 버린 가지 정리
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.entries or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+
+    def top(self, prefix: str, rank) -> List[EntryKey]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if node.top is None:
+            entries = set(node.entries)
+            stack = list(node.children.values())
+            while stack:
+                child = stack.pop()
+                entries.update(child.entries)
+                stack.extend(child.children.values())
+            node.top = sorted(entries, key=rank)[: self.top_k]
+        return node.top
+
+
+class SuggestService:
+    """출처 제목/작가와 태그 자동완성 (/search/suggest).
+
+    각 항목을 단어 시작 위치마다 두 종류 키로 트라이에 넣음:
+    - 자모 키: "어린 왕자" -> "ㅇㅓㄹㅣㄴㅇㅗㅏㅇㅈㅏ" ("어린 와", "왕" 같은 조합 중인 입력도 접두어로 일치)
+    - 초성 키: "ㅇㄹㅇㅈ" ("ㅇㅈ"처럼 초성만 입력한 경우)
+    공백은 키와 검색어 모두에서 제거. 첫 요청 시 DB에서 빌드하고, 출처/태그 쓰기 경로에서 증분 갱신.
+    트라이는 종류별로 따로 둠: 노드의 상위 K개 캐시가 종류마다 따로 잡혀서 kind 필터가 잘린 결과에 걸리지 않음.
+    워커마다 따로 존재하므로 다른 워커의 쓰기와 문장 수(weight) 변화는 주기적 재빌드(SUGGEST_REFRESH_SECONDS)로 반영.
+    빌드 중(DB를 읽는 동안) 들어온 증분 갱신은 기록해 두었다가 새 트라이에 다시 적용.
+    """
+
+    def __init__(self):
+        self._reset_tries()
+        self.items: Dict[EntryKey, Suggestion] = {}
+        self._keys: Dict[EntryKey, List[Tuple[PrefixTrie, str]]] = {}
+        self.ready = False
+        self.build_seconds = 0.0
+        self._build_lock = asyncio.Lock()
+        self._journal: Optional[List[Tuple[Callable, tuple]]] = None  # (갱신 메서드, 인자)
+
+    def _reset_tries(self) -> None:
+        self.jamo: Dict[str, PrefixTrie] = {kind: PrefixTrie() for kind in KINDS}
+        self.choseong: Dict[str, PrefixTrie] = {kind: PrefixTrie() for kind in KINDS}
+
+    @staticmethod
+    def _word_suffixes(text: str) -> List[str]:
+        words = normalize(text).split()
+        return ["".join(words[i:]) for i in range(len(words))]
+
+    def _rank(self, entry: EntryKey):
+        item = self.items[entry]
+        return (-item.weight, len(item.text), item.text)
+
+    def _index(self, item: Suggestion, texts: List[str]) -> None:
+        entry = (item.kind, item.id)
+        self._remove(item.kind, item.id)
+        self.items[entry] = item
+        keys = set()
+        for text in texts:
+            for suffix in self._word_suffixes(text):
+                keys.add((self.jamo[item.kind], decompose(suffix)))
+                keys.add((self.choseong[item.kind], choseong(suffix)))
+        for trie, key in keys:
+            trie.insert(key, entry)
+        self._keys[entry] = list(keys)
+
+    def _record(self, method: Callable, *args) -> None:
+        if self._journal is not None:
+            self._journal.append((method, args))
+
+    def remove(self, kind: str, id: int) -> None:
+        self._record(self.remove, kind, id)
+        self._remove(kind, id)
+
+    def _remove(self, kind: str, id: int) -> None:
+        entry = (kind, id)
+        for trie, key in self._keys.pop(entry, []):
+            trie.delete(key, entry)
+        self.items.pop(entry, None)
+
+    def index_source(self, id: int, title: str, creator: str, source_type: str | None = None, weight: int | None = None) -> None:
+        self._record(self.index_source, id, title, creator, source_type, weight)
+        previous = self.items.get(("source", id))
+        if weight is None:
+            weight = previous.weight if previous else 0
+        self._index(Suggestion("source", id, title, source_type, weight), [title, creator])
+
+    def index_tag(self, id: int, name: str, weight: int | None = None) -> None:
+        self._record(self.index_tag, id, name, weight)
+        previous = self.items.get(("tag", id))
+        if weight is None:
+            weight = previous.weight if previous else 0
+        self._index(Suggestion("tag", id, name, None, weight), [name])
+
+    def index_new_tags(self, tags) -> None:
+        """문장 생성/수정 중에 새로 만들어진 태그를 추가 (이미 있는 태그는 그대로)."""
+        if not self.ready and self._journal is None:
+            return
+        for tag in tags:
+            if ("tag", tag.id) not in self.items:
+                self.index_tag(tag.id, tag.name)
+
+    async def ensure_built(self, db: AsyncSession) -> None:
+        """첫 요청에서 빌드. 동시에 들어온 첫 요청들은 락에서 기다렸다가 빌드 결과를 같이 씀."""
+        if self.ready:
+            return
+        async with self._build_lock:
+            if not self.ready:
+                await self._build(db)
+
+    async def build(self, db: AsyncSession) -> None:
+        async with self._build_lock:
+            await self._build(db)
+
+    async def _build(self, db: AsyncSession) -> None:
+        started = time.perf_counter()
+        self._journal = []
+        try:
+            sources, tags = await self._load_rows(db)
+        finally:
+            journal, self._journal = self._journal, None
+        # 여기서 교체까지는 await가 없어서 다른 갱신이 끼어들지 못함
+        self._reset_tries()
+        self.items, self._keys = {}, {}
+        for id, title, creator, source_type, quote_count in sources:
+            self.index_source(id, title, creator, source_type, quote_count or 0)
+        for id, name, quote_count in tags:
+            self.index_tag(id, name, quote_count or 0)
+        for method, args in journal:
+            method(*args)
+        self.ready = True
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"Suggest trie built in {self.build_seconds * 1000:.1f} ms ({len(self.items)} items)")
+
+    async def rebuild_periodically(self, session_factory, interval: float) -> None:
+        """interval초마다 재빌드해서 다른 워커의 쓰기와 문장 수 변화를 반영 (lifespan에서 태스크로 실행).
+
+        아직 한 번도 빌드되지 않았으면 (자동완성 요청이 없었으면) 건너뜀.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if not self.ready:
+                continue
+            try:
+                async with session_factory() as db:
+                    await self.build(db)
+            except Exception as e:
+                logger.warning(f"Suggest trie rebuild failed: {e}")
+
+    @staticmethod
+    async def _load_rows(db: AsyncSession):
+        source_counts = (
+            select(Quote.source_id, func.count().label("quote_count"))
+            .group_by(Quote.source_id)
+            .subquery()
+        )
+        sources = await db.execute(
+            select(Source.id, Source.title, Source.creator, Source.source_type, source_counts.c.quote_count)
+            .outerjoin(source_counts, source_counts.c.source_id == Source.id)
+        )
+        tag_counts = (
+            select(quote_tags.c.tag_id, func.count().label("quote_count"))
+            .group_by(quote_tags.c.tag_id)
+            .subquery()
+        )
+        tags = await db.execute(
+            select(Tag.id, Tag.name, tag_counts.c.quote_count).outerjoin(tag_counts, tag_counts.c.tag_id == Tag.id)
+        )
+        return sources.all(), tags.all()
+
+    def suggest(self, query: str, kind: str | None = None, limit: int = 10) -> List[Suggestion]:
+        compact = "".join(normalize(query).split())
+        if not compact:
+            return []
+        if is_choseong_only(compact):
+            tries, key = self.choseong, compact
+        else:
+            tries, key = self.jamo, decompose(compact)
+        # 종류별 상위 K개를 모은 뒤 다시 순위를 매김 (limit은 K 이하)
+        entries = []
+        for trie_kind in KINDS if kind is None else (kind,):
+            entries.extend(tries[trie_kind].top(key, self._rank))
+        if kind is None:
+            entries.sort(key=self._rank)
+        return [self.items[entry] for entry in entries[:limit]]
+
+
+suggest_service = SuggestService()
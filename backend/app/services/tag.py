@@ -1,10 +1,43 @@
-from app.repositories import tag_repository
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.quote_tag import quote_tags
+from app.repositories import registry_version_repository, tag_repository
 from app.services.base import BaseService
-from app.repositories.tag import TagRepository
+from app.repositories.tag import TagRepository, unique_tag_names
+from app.schemas.trending import TrendingTagRead
+from app.services.tag_registry import VERSION_NAME as TAG_VERSION, tag_registry
+from app.services.trending import trending_service
 
 
 class TagService(BaseService[TagRepository]):
-    pass
+    async def attach_to_quote(self, db: AsyncSession, *, quote_id: int, names: list[str]) -> list[int]:
+        """태그 이름들을 찾거나 만들고 문장에 연결 (quote_tags 다중 행 INSERT). 연결한 태그 id 반환. Does not commit.
+
+        이름 해석은 태그 레지스트리에서 하고, 레지스트리에 없는 이름만 DB에서 한 번에 찾거나 만듦 (이때 태그 버전도 올림).
+        대소문자만 다른 이름은 같은 태그로 봄 (tag_name_key).
+        """
+        names = unique_tag_names(names)
+        await tag_registry.ensure_loaded(db)
+        ids = tag_registry.resolve(names)
+        unknown = [name for name in names if name not in ids]
+        if unknown:
+            tags = await self.repository.get_or_create_many(db, unknown)
+            ids.update((name, tag.id) for name, tag in zip(unknown, tags))
+            await registry_version_repository.bump(db, name=TAG_VERSION)
+        tag_ids = [ids[name] for name in names]
+        if tag_ids:
+            await db.execute(quote_tags.insert().values([{"quote_id": quote_id, "tag_id": tag_id} for tag_id in tag_ids]))
+        return tag_ids
+
+    async def bump_version(self, db: AsyncSession) -> int:
+        """태그를 바꾸는 트랜잭션 안에서 호출 (커밋 전). 새 버전은 커밋 후 tag_registry.put/remove에 넘김."""
+        return await registry_version_repository.bump(db, name=TAG_VERSION)
+
+    async def get_trending(self, db: AsyncSession, limit: int = 10) -> list[TrendingTagRead]:
+        scores = dict(trending_service.top_tags(limit))
+        await tag_registry.ensure_loaded(db)
+        tags = tag_registry.get_many(list(scores))
+        return [TrendingTagRead(id=tag.id, name=tag.name, score=scores[tag.id]) for tag in tags]
 
 
 tag_service = TagService(tag_repository)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories import registry_version_repository, tag_repository
+from app.repositories.tag import tag_name_key
+from app.services.suggest import PrefixTrie
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = "tags"
+
+
+@dataclass(frozen=True)
+class TagEntry:
+    id: int
+    name: str
+
+
+class TagRegistry:
+    """프로세스 전역 태그 레지스트리 (태그는 거의 바뀌지 않는 고정 목록).
+
+    name -> id, id -> name dict와 목록 응답용 id순 배열, 접두어 검색용 트라이를 메모리에 두고
+    GET /tag/, 태그 조회, 문장 저장 시 태그 이름 해석, 검색의 태그 부분을 DB 없이 처리합니다.
+    태그를 바꾸는 트랜잭션은 registry_versions의 "tags" 버전을 함께 올리고, 커밋 후 이 워커의 레지스트리에 바로 반영(write-through).
+    다른 워커의 변경은 sync_periodically가 버전을 비교해서 다르면 다시 로드합니다.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._by_id: Dict[int, str] = {}
+        self._by_name: Dict[str, int] = {}
+        self._listing: Optional[Tuple[TagEntry, ...]] = None  # id순, 변경 시 다시 만듦
+        self._trie = PrefixTrie()
+        self.version = 0
+        self.ready = False
+        self.loaded_at: Optional[float] = None
+
+    # ----- loading -----
+    async def load(self, db: AsyncSession) -> None:
+        version = await registry_version_repository.get_version(db, name=VERSION_NAME)
+        rows = await tag_repository.get_id_names(db)
+        self.reset()
+        for tag_id, name in rows:
+            self._put(tag_id, name)
+        self.version = version
+        self.ready = True
+        self.loaded_at = time.time()
+        logger.info(f"Tag registry loaded: {len(self._by_id)} tags (version {version})")
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.ready:
+            await self.load(db)
+
+    async def sync(self, db: AsyncSession) -> bool:
+        """DB 버전이 다르면 다시 로드. 로드했으면 True."""
+        if self.ready and await registry_version_repository.get_version(db, name=VERSION_NAME) == self.version:
+            return False
+        await self.load(db)
+        return True
+
+    async def sync_periodically(self, session_factory, interval: float) -> None:
+        """interval초마다 버전 확인 (lifespan에서 태스크로 실행)."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as db:
+                    await self.sync(db)
+            except Exception as e:
+                logger.warning(f"Tag registry sync failed: {e}")
+
+    # ----- write-through (커밋 후 호출) -----
+    def _put(self, tag_id: int, name: str) -> None:
+        self._remove(tag_id)
+        self._by_id[tag_id] = name
+        self._by_name[tag_name_key(name)] = tag_id
+        self._trie.insert(name.lower(), ("tag", tag_id))
+        self._listing = None
+
+    def _remove(self, tag_id: int) -> None:
+        name = self._by_id.pop(tag_id, None)
+        if name is None:
+            return
+        if self._by_name.get(tag_name_key(name)) == tag_id:
+            del self._by_name[tag_name_key(name)]
+        self._trie.delete(name.lower(), ("tag", tag_id))
+        self._listing = None
+
+    def _advance(self, version: Optional[int]) -> None:
+        # 바로 다음 버전일 때만 따라감. 중간에 다른 워커의 변경이 끼어 있으면 버전을 그대로 둬서 sync가 다시 로드하게 함
+        if version is not None and version == self.version + 1:
+            self.version = version
+
+    def put(self, tag_id: int, name: str, version: Optional[int] = None) -> None:
+        if self.ready:
+            self._put(tag_id, name)
+            self._advance(version)
+
+    def put_many(self, tags: Iterable) -> None:
+        """다른 쓰기 경로(문장 저장 중 생성된 태그 등)에서 커밋된 태그 추가. 버전은 sync에 맡김."""
+        if self.ready:
+            for tag in tags:
+                if tag.id not in self._by_id:
+                    self._put(tag.id, tag.name)
+
+    def remove(self, tag_id: int, version: Optional[int] = None) -> None:
+        if self.ready:
+            self._remove(tag_id)
+            self._advance(version)
+
+    # ----- queries -----
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, tag_id: int) -> Optional[TagEntry]:
+        name = self._by_id.get(tag_id)
+        return TagEntry(tag_id, name) if name is not None else None
+
+    def get_many(self, tag_ids: List[int]) -> List[TagEntry]:
+        """ids 순서, 없는 id는 빠짐 (BaseRepository.get_many와 같은 규칙)."""
+        return [TagEntry(tag_id, self._by_id[tag_id]) for tag_id in tag_ids if tag_id in self._by_id]
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, int]:
+        """알고 있는 이름만 name -> id (대소문자 무시, tag_name_key 기준)."""
+        ids = {name: self._by_name.get(tag_name_key(name)) for name in names}
+        return {name: tag_id for name, tag_id in ids.items() if tag_id is not None}
+
+    def all(self) -> Tuple[TagEntry, ...]:
+        if self._listing is None:
+            self._listing = tuple(TagEntry(tag_id, self._by_id[tag_id]) for tag_id in sorted(self._by_id))
+        return self._listing
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[TagEntry]:
+        """이름이 prefix로 시작하는 태그 (대소문자 무시, 짧은 이름 우선)."""
+        entries = self._trie.top(prefix.lower(), lambda entry: (len(self._by_id[entry[1]]), self._by_id[entry[1]]))
+        return [TagEntry(tag_id, self._by_id[tag_id]) for _, tag_id in entries[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> List[TagEntry]:
+        """이름에 query가 포함된 태그 (ILIKE '%q%'와 같은 의미), id순."""
+        needle = query.lower()
+        return [entry for entry in self.all() if needle in entry.name.lower()][:limit]
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, "tags": len(self._by_id), "version": self.version, "loaded_at": self.loaded_at}
+
+
+tag_registry = TagRegistry()
@@ -0,0 +1,234 @@
+import asyncio
+import heapq
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories import trending_score_repository
+
+logger = logging.getLogger(__name__)
+
+ScopeKey = Tuple[str, str]  # (scope, DB에 저장하는 문자열 key)
+
+
+class DecayedTopK:
+    """key별 점수 dict + 지연 삭제 최대 힙.
+
+    점수가 바뀔 때마다 (-score, key)를 힙에 새로 넣고, 예전 항목은 dict 값과 다르면 무시합니다 (갱신 O(log n)).
+    상위 N개는 힙 배열을 best-first로 따라가서 O(N log N)에 구함. 무효 항목이 많아지면 dict에서 힙을 다시 만듦.
+    """
+
+    __slots__ = ("_scores", "_heap")
+
+    def __init__(self):
+        self._scores: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, key: Hashable) -> float:
+        return self._scores.get(key, 0.0)
+
+    def add(self, key: Hashable, weight: float) -> None:
+        score = self._scores.get(key, 0.0) + weight
+        if score <= 0:
+            self._scores.pop(key, None)
+            return
+        self._scores[key] = score
+        heapq.heappush(self._heap, (-score, key))
+        if len(self._heap) > 2 * len(self._scores) + 64:
+            self._rebuild_heap()
+
+    def discard(self, key: Hashable) -> None:
+        self._scores.pop(key, None)
+
+    def scale(self, factor: float) -> None:
+        self._scores = {key: score * factor for key, score in self._scores.items()}
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(-score, key) for key, score in self._scores.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: int) -> List[Tuple[Hashable, float]]:
+        heap, scores = self._heap, self._scores
+        result, seen = [], set()
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(result) < n:
+            (neg_score, key), i = heapq.heappop(frontier)
+            if key not in seen and scores.get(key) == -neg_score:
+                seen.add(key)
+                result.append((key, -neg_score))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
+
+
+class TrendingService:
+    """북마크 이벤트로 갱신하는 지수 감쇠 트렌딩 점수 (문장 / source_type별 문장 / 태그 / source_type).
+
+    점수는 기준 시각 t0로 정규화해서 저장합니다: 시각 t의 이벤트는 exp(rate * (t - t0))를 더하고,
+    읽을 때 exp(-rate * (now - t0))를 곱함. 그래서 이벤트마다 기존 점수를 건드리지 않고 scope별 O(1) 덧셈만 함.
+    프로세스(워커)마다 따로 존재하고, 마지막 스냅샷 이후 쌓인 증분만 주기적으로 DB(trending_scores)에 더한 뒤
+    합쳐진 점수를 다시 읽어서 다른 워커의 이벤트도 반영합니다.
+    """
+
+    MAX_EXPONENT = 50.0  # 정규화 점수가 너무 커지기 전에 t0를 옮김
+    MIN_SCORE = 0.01  # 로드 시 이보다 작은 점수는 버림
+    PRUNE_HALF_LIVES = 20  # 이만큼 갱신이 없던 스냅샷 행은 삭제 (점수 1/2^20 이하)
+
+    def __init__(self, half_life_hours: float):
+        self.half_life_seconds = half_life_hours * 3600
+        self.rate = math.log(2) / self.half_life_seconds
+        self.snapshot_at: Optional[float] = None
+        self.reset()
+
+    def reset(self) -> None:
+        self._tables: Dict[str, DecayedTopK] = {}
+        self._pending: Dict[ScopeKey, float] = {}
+        self._t0 = time.time()
+
+    # ----- updates -----
+    def _weight(self, now: float) -> float:
+        exponent = self.rate * (now - self._t0)
+        if exponent > self.MAX_EXPONENT:
+            self._rebase(now)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rebase(self, now: float) -> None:
+        factor = math.exp(-self.rate * (now - self._t0))
+        for table in self._tables.values():
+            table.scale(factor)
+        self._pending = {key: weight * factor for key, weight in self._pending.items()}
+        self._t0 = now
+
+    @staticmethod
+    def _scope_keys(quote_id: int, source_type: Optional[str], tag_ids: Iterable[int]) -> List[Tuple[str, Hashable]]:
+        keys = [("quote", quote_id)]
+        if source_type:
+            keys += [(f"quote:{source_type}", quote_id), ("source_type", source_type)]
+        keys += [("tag", tag_id) for tag_id in tag_ids]
+        return keys
+
+    def _apply(self, scope: str, key: Hashable, weight: float) -> None:
+        table = self._tables.get(scope)
+        if table is None:
+            table = self._tables[scope] = DecayedTopK()
+        table.add(key, weight)
+
+    def record(
+        self, quote_id: int, source_type: Optional[str], tag_ids: Iterable[int] = (), delta: int = 1,
+        now: Optional[float] = None,
+    ) -> None:
+        """북마크 추가(delta=1)/삭제(delta=-1) 이벤트 반영 (커밋 후 호출). scope마다 O(1)."""
+        weight = delta * self._weight(time.time() if now is None else now)
+        for scope, key in self._scope_keys(quote_id, source_type, tag_ids):
+            self._apply(scope, key, weight)
+            pending_key = (scope, str(key))
+            self._pending[pending_key] = self._pending.get(pending_key, 0.0) + weight
+
+    def remove_quote(self, quote_id: int) -> None:
+        """삭제된 문장을 문장 순위에서 뺌. 아직 스냅샷되지 않은 증분도 버려서 다시 저장되지 않게 함.
+
+        스냅샷 행은 삭제 경로에서 trending_score_repository.delete_quote로 지움.
+        """
+        for scope, table in self._tables.items():
+            if scope == "quote" or scope.startswith("quote:"):
+                table.discard(quote_id)
+        key = str(quote_id)
+        self._pending = {
+            (scope, pending_key): weight for (scope, pending_key), weight in self._pending.items()
+            if not (pending_key == key and (scope == "quote" or scope.startswith("quote:")))
+        }
+
+    # ----- queries -----
+    def top(self, scope: str, limit: int = 10, now: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """scope의 상위 limit개 (key, 현재 시각 기준 점수)."""
+        table = self._tables.get(scope)
+        if table is None:
+            return []
+        factor = math.exp(-self.rate * ((time.time() if now is None else now) - self._t0))
+        return [(key, score * factor) for key, score in table.top(limit)]
+
+    def top_quotes(self, limit: int = 10, source_type: Optional[str] = None) -> List[Tuple[int, float]]:
+        return self.top(f"quote:{source_type}" if source_type else "quote", limit)
+
+    def top_tags(self, limit: int = 10) -> List[Tuple[int, float]]:
+        return self.top("tag", limit)
+
+    def top_source_types(self, limit: int = 10) -> List[Tuple[str, float]]:
+        return self.top("source_type", limit)
+
+    # ----- persistence -----
+    @staticmethod
+    def _parse_key(scope: str, key: str) -> Hashable:
+        return key if scope == "source_type" else int(key)
+
+    async def load(self, db: AsyncSession) -> None:
+        """스냅샷을 읽어서 메모리 점수를 교체. 읽는 동안 들어온 이벤트(_pending)는 새 점수에 다시 더함."""
+        rows = await trending_score_repository.get_all_scores(db)
+        now, now_dt = time.time(), datetime.utcnow()
+        tables: Dict[str, DecayedTopK] = {}
+        for scope, key, score, updated_at in rows:
+            value = score * math.exp(-self.rate * max(0.0, (now_dt - updated_at).total_seconds()))
+            if value >= self.MIN_SCORE:
+                tables.setdefault(scope, DecayedTopK()).add(self._parse_key(scope, key), value)
+
+        factor = math.exp(-self.rate * (now - self._t0))
+        self._tables, self._t0 = tables, now
+        self._pending = {key: weight * factor for key, weight in self._pending.items()}
+        for (scope, key), weight in self._pending.items():
+            self._apply(scope, self._parse_key(scope, key), weight)
+
+    async def snapshot(self, db: AsyncSession) -> int:
+        """마지막 스냅샷 이후의 증분을 DB에 더하고 (다른 워커 몫 포함) 합쳐진 점수를 다시 로드. 합친 행 수 반환."""
+        pending, self._pending = self._pending, {}
+        now_dt = datetime.utcnow()
+        factor = math.exp(-self.rate * (time.time() - self._t0))
+        try:
+            for (scope, key), weight in pending.items():
+                await trending_score_repository.merge(
+                    db, scope=scope, key=key, delta=weight * factor, at=now_dt, decay_rate=self.rate
+                )
+            await trending_score_repository.prune(
+                db, before=now_dt - timedelta(seconds=self.PRUNE_HALF_LIVES * self.half_life_seconds)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            # 다음 스냅샷에서 다시 시도하도록 증분을 되돌려 둠
+            for key, weight in pending.items():
+                self._pending[key] = self._pending.get(key, 0.0) + weight
+            raise
+        await self.load(db)
+        self.snapshot_at = time.time()
+        return len(pending)
+
+    async def snapshot_periodically(self, session_factory, interval: float) -> None:
+        """interval초마다 스냅샷 (lifespan에서 태스크로 실행)."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as db:
+                    await self.snapshot(db)
+            except Exception as e:
+                logger.warning(f"Trending snapshot failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "half_life_hours": self.half_life_seconds / 3600,
+            "scopes": {scope: len(table) for scope, table in self._tables.items()},
+            "pending": len(self._pending),
+            "snapshot_at": self.snapshot_at,
+        }
+
+
+trending_service = TrendingService(settings.trending_half_life_hours)
@@ -1,25 +1,119 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
 from fastapi import FastAPI
 from app.routers import router as api_router
+from app.core.ai import init_ai_services, close_ai_services
 from fastapi.middleware.cors import CORSMiddleware
-import subprocess
 import uvicorn
 from contextlib import asynccontextmanager
-from sqlalchemy_utils import create_database, database_exists
-from sqlalchemy import create_engine
 from app.core.config import settings
+from app.core.startup_timing import startup_timer
+
+startup_timer.record("imports", time.perf_counter() - _import_started)
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create database if it doesn't exist
-    engine = create_engine(settings.sync_database_url)
-    if not database_exists(engine.url):
-        create_database(engine.url)
+    if settings.run_migrations_on_startup:
+        from app.core.migrations import ensure_database, run_migrations
+
+        # Create database if it doesn't exist, then run alembic migrations
+        with startup_timer.measure("create_database"):
+            await asyncio.to_thread(ensure_database)
+        with startup_timer.measure("migrations"):
+            await asyncio.to_thread(run_migrations, check=False)
+
+    # Application-wide HTTP connection pool shared by the llm/ clients (Aladin 등)
+    from http_session import create_http_session
+    with startup_timer.measure("http_session"):
+        http_session = create_http_session(
+            limit=settings.http_pool_limit,
+            limit_per_host=settings.http_pool_limit_per_host,
+            keepalive_timeout=settings.http_keepalive_timeout,
+            dns_cache_ttl=settings.http_dns_cache_ttl,
+            total_timeout=settings.http_timeout,
+        )
+    app.state.http_session = http_session
+
+    # One AIService (Vertex client, caches) shared by every router
+    with startup_timer.measure("ai_services"):
+        init_ai_services(app.state, http_session=http_session)
+
+    search_refresh_task = None
+    if settings.search_backend == "memory":
+        from app.database import AsyncSessionLocal
+        from app.services.search_index import search_index
+
+        with startup_timer.measure("search_index"):
+            async with AsyncSessionLocal() as db:
+                await search_index.build(db)
+        if settings.search_index_refresh_seconds > 0:
+            search_refresh_task = asyncio.create_task(
+                search_index.rebuild_periodically(AsyncSessionLocal, settings.search_index_refresh_seconds)
+            )
+
+    from app.database import AsyncSessionLocal
+    from app.services.suggest import suggest_service
+    from app.services.tag_registry import tag_registry
+    from app.services.trending import trending_service
+
+    # 자동완성 트라이는 첫 요청에서 빌드하고, 그 뒤로 주기적으로 재빌드
+    suggest_refresh_task = None
+    if settings.suggest_refresh_seconds > 0:
+        suggest_refresh_task = asyncio.create_task(
+            suggest_service.rebuild_periodically(AsyncSessionLocal, settings.suggest_refresh_seconds)
+        )
+
+    with startup_timer.measure("tag_registry"):
+        try:
+            async with AsyncSessionLocal() as db:
+                await tag_registry.load(db)
+        except Exception as e:
+            logger.warning(f"Tag registry load failed, loading on first use: {e}")
+    tag_sync_task = None
+    if settings.tag_registry_sync_seconds > 0:
+        tag_sync_task = asyncio.create_task(
+            tag_registry.sync_periodically(AsyncSessionLocal, settings.tag_registry_sync_seconds)
+        )
+
+    with startup_timer.measure("trending"):
+        try:
+            async with AsyncSessionLocal() as db:
+                await trending_service.load(db)
+        except Exception as e:
+            logger.warning(f"Trending snapshot load failed: {e}")
+    trending_snapshot_task = None
+    if settings.trending_snapshot_seconds > 0:
+        trending_snapshot_task = asyncio.create_task(
+            trending_service.snapshot_periodically(AsyncSessionLocal, settings.trending_snapshot_seconds)
+        )
+
+    app.state.startup_timings = startup_timer.as_dict()
+    logger.info(startup_timer.report(since=_import_started))
 
-    # Run alembic migrations
-    subprocess.run(["alembic", "upgrade", "head"])
     yield
 
+    if search_refresh_task:
+        search_refresh_task.cancel()
+    if suggest_refresh_task:
+        suggest_refresh_task.cancel()
+    if tag_sync_task:
+        tag_sync_task.cancel()
+    if trending_snapshot_task:
+        trending_snapshot_task.cancel()
+        try:
+            async with AsyncSessionLocal() as db:
+                await trending_service.snapshot(db)
+        except Exception as e:
+            logger.warning(f"Final trending snapshot failed: {e}")
+    await close_ai_services(app.state)
+    await http_session.close()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -0,0 +1,18 @@
+"""DB 생성 + Alembic 마이그레이션을 한 번 실행하고 종료하는 엔트리포인트.
+
+RUN_MIGRATIONS_ON_STARTUP=false 로 서버를 띄울 때 배포 단계(Cloud Run Job 등)에서 먼저 실행합니다.
+
+Usage:
+    python migrate.py
+"""
+import logging
+import time
+
+from app.core.migrations import ensure_database, run_migrations
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    ensure_database()
+    run_migrations()
+    logging.info(f"Migrations finished in {time.perf_counter() - started:.2f}s")
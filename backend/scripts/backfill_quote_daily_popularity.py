@@ -0,0 +1,32 @@
+"""quote_daily_popularity 집계 테이블을 bookmarks 기준으로 다시 계산합니다.
+
+증분 갱신 경로를 거치지 않고 북마크가 변경된 경우(직접 SQL 수정, 사용자 삭제에 의한 CASCADE 등)
+집계가 어긋날 수 있으므로 필요할 때 한 번씩 실행합니다.
+
+Usage:
+    python scripts/backfill_quote_daily_popularity.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Add paths
+base_dir = os.path.dirname(os.path.abspath(__file__)) # backend/scripts
+backend_dir = os.path.abspath(os.path.join(base_dir, "..")) # backend
+sys.path.append(backend_dir)
+
+from app.database import AsyncSessionLocal
+from app.repositories import quote_daily_popularity_repository
+
+
+async def run_backfill():
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        rows = await quote_daily_popularity_repository.rebuild(db)
+        await db.commit()
+    print(f"quote_daily_popularity rebuilt: {rows} rows in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_backfill())
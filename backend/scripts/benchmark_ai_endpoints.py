@@ -0,0 +1,156 @@
+"""AI 엔드포인트 부하 테스트 (가짜 Vertex/알라딘 클라이언트 사용, Gemini 할당량 소모 없음).
+
+FastAPI 앱을 httpx ASGITransport로 직접 구동하며, 엔드포인트별 p50/p95/p99 지연시간과 처리량을 출력합니다.
+DB는 설정된 DATABASE_URL을 그대로 사용합니다 (/recommendations/ai 용 벤치마크 사용자를 하나 생성합니다).
+
+Usage:
+    python scripts/benchmark_ai_endpoints.py --requests 200 --concurrency 20
+    python scripts/benchmark_ai_endpoints.py --latency-ms 1500 --error-rate 0.05 --malformed-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+# Add paths
+base_dir = os.path.dirname(os.path.abspath(__file__)) # backend/scripts
+backend_dir = os.path.abspath(os.path.join(base_dir, "..")) # backend
+sys.path.append(backend_dir)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark AI endpoints against fake Vertex/Aladin clients")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--endpoints", nargs="+", default=["recommendations", "ai", "related", "popular_today"],
+                        choices=["recommendations", "ai", "related", "popular_today"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=800, help="median fake Vertex latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal sigma of fake Vertex latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--aladin-latency-ms", type=float, default=150)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args()
+
+
+def configure_fake_backend(args):
+    # Must run before the app (and its settings) are imported
+    os.environ["AI_BACKEND"] = "fake"
+    os.environ["FAKE_AI_SEED"] = str(args.seed)
+    os.environ["FAKE_AI_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_AI_LATENCY_SIGMA"] = str(args.latency_sigma)
+    os.environ["FAKE_AI_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_AI_MALFORMED_RATE"] = str(args.malformed_rate)
+    os.environ["FAKE_ALADIN_LATENCY_MS"] = str(args.aladin_latency_ms)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def get_bench_token(client) -> str:
+    user = {"email": "ai_bench@example.com", "username": "aibench", "password": "benchmark"}
+    response = await client.post("/auth/register", json=user)
+    if response.status_code != 200:
+        response = await client.post("/auth/login", data={"username": user["email"], "password": user["password"]})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def build_requests(token: str):
+    auth = {"Authorization": f"Bearer {token}"}
+    return {
+        "recommendations": lambda c: c.get("/recommendations/", params={"limit": 3}),
+        "ai": lambda c: c.post("/recommendations/ai", headers=auth),
+        "related": lambda c: c.post("/recommendations/related", json={"current_quote_content": "새는 알에서 나오려고 투쟁한다."}),
+        "popular_today": lambda c: c.get("/quote/popular/today/book"),
+    }
+
+
+async def run_endpoint(client, name, send, total, concurrency):
+    latencies = []
+    statuses = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await send(client)
+                statuses[response.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "endpoint": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2),
+        "statuses": {str(k): v for k, v in statuses.items()},
+    }
+
+
+async def run_benchmark(args):
+    import httpx
+    from main import app
+    from app.database import engine
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        token = await get_bench_token(client)
+        senders = build_requests(token)
+        report = []
+        for name in args.endpoints:
+            report.append(await run_endpoint(client, name, senders[name], args.requests, args.concurrency))
+    await engine.dispose()
+
+    ai_service = getattr(app.state, "ai_service", None)
+    stats = {
+        "cache": ai_service.cache_stats() if ai_service else {},
+        "vertex_calls": getattr(getattr(ai_service, "vertex", None), "calls", None),
+        "aladin_calls": getattr(getattr(ai_service, "aladin", None), "calls", None),
+    }
+    return report, stats
+
+
+def print_report(report, stats):
+    header = f"{'endpoint':<16}{'req':>6}{'conc':>6}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  statuses"
+    print(header)
+    print("-" * len(header))
+    for row in report:
+        print(
+            f"{row['endpoint']:<16}{row['requests']:>6}{row['concurrency']:>6}{row['throughput_rps']:>10}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}  {row['statuses']}"
+        )
+    print()
+    print(f"vertex calls: {stats['vertex_calls']}, aladin calls: {stats['aladin_calls']}")
+    print(f"cache: {json.dumps(stats['cache'], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_fake_backend(args)
+    report, stats = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps({"report": report, "stats": stats}, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, stats)
@@ -0,0 +1,127 @@
+"""랜덤 문장 조회 벤치마크: 기존 ORDER BY RANDOM() 쿼리 vs 메모리 id 배열 샘플러 (app/services/quote_sampler.py).
+
+문장 수를 단계별로 늘려가며 (기본 1만 / 10만 / 100만) 같은 source_type에서 k개를 뽑는 지연시간을 비교합니다.
+가짜 데이터는 하나의 트랜잭션 안에서만 쓰고 마지막에 롤백합니다 (DB에 남지 않음).
+
+Usage:
+    python scripts/benchmark_random_sampling.py
+    python scripts/benchmark_random_sampling.py --sizes 10000 100000 --repeat 20 --k 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add paths
+base_dir = os.path.dirname(os.path.abspath(__file__)) # backend/scripts
+backend_dir = os.path.abspath(os.path.join(base_dir, "..")) # backend
+sys.path.append(backend_dir)
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.database import engine
+from app.models import Quote, Source, User
+from app.services.quote_sampler import QuoteSampler
+
+SOURCE_TYPES = ["book", "movie", "drama", "tv", "speech", "other"]
+INSERT_BATCH = 10000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ORDER BY RANDOM() with the in-memory quote sampler")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="total fake quotes per step")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per method and size")
+    parser.add_argument("--k", type=int, default=3, help="quotes per sample")
+    parser.add_argument("--source-type", default="book")
+    return parser.parse_args()
+
+
+async def seed_quotes(db: AsyncSession, start: int, stop: int) -> None:
+    """bench quote {start}..{stop-1} 삽입 (출처는 source_type별로 돌아가며 배정)."""
+    if start == 0:
+        await db.execute(insert(User).values(email="bench_random@example.com", username="benchrandom", hashed_password="x"))
+        await db.execute(insert(Source), [
+            {"title": f"Bench Source {i}", "creator": "Bench", "source_type": SOURCE_TYPES[i % len(SOURCE_TYPES)]}
+            for i in range(60)
+        ])
+    user_id = (await db.execute(select(User.id).where(User.username == "benchrandom"))).scalar_one()
+    source_ids = (await db.execute(
+        select(Source.id).where(Source.title.like("Bench Source %")).order_by(Source.id)
+    )).scalars().all()
+    for batch_start in range(start, stop, INSERT_BATCH):
+        await db.execute(insert(Quote), [
+            {"user_id": user_id, "source_id": source_ids[i % len(source_ids)], "content": f"bench quote {i}"}
+            for i in range(batch_start, min(stop, batch_start + INSERT_BATCH))
+        ])
+
+
+def order_by_random_statement(dialect: str, source_type: str, k: int):
+    # 교체 전 QuoteRepository.get_random_by_source_type 쿼리 (MySQL은 RANDOM()이 없어 RAND())
+    random = func.rand() if dialect == "mysql" else func.random()
+    return (
+        select(Quote)
+        .join(Source)
+        .filter(Source.source_type == source_type)
+        .options(selectinload(Quote.source), selectinload(Quote.tags))
+        .order_by(random)
+        .limit(k)
+    )
+
+
+async def measure(call, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def summary(timings: list) -> str:
+    return f"p50 {statistics.median(timings):9.2f} ms   max {timings[-1]:9.2f} ms"
+
+
+async def run_benchmark(args) -> None:
+    dialect = engine.dialect.name
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            seeded = 0
+            for size in sorted(args.sizes):
+                started = time.perf_counter()
+                await seed_quotes(db, seeded, size)
+                seeded = size
+                print(f"\n== {size:,} quotes (seeded in {time.perf_counter() - started:.1f} s) ==")
+
+                statement = order_by_random_statement(dialect, args.source_type, args.k)
+
+                async def order_by_random():
+                    (await db.execute(statement)).scalars().all()
+                    db.expunge_all()
+
+                sampler = QuoteSampler(refresh_seconds=float("inf"))
+                await sampler.refresh(db)
+                full_load = sampler.load_seconds
+                await sampler.refresh(db)  # 새 문장이 없을 때의 증분 갱신
+
+                async def sample():
+                    await sampler.sample(db, source_type=args.source_type, k=args.k)
+                    db.expunge_all()
+
+                print(f"  ORDER BY RANDOM()   {summary(await measure(order_by_random, args.repeat))}")
+                print(f"  sampler             {summary(await measure(sample, args.repeat))}")
+                print(f"  sampler full load   {full_load * 1000:9.2f} ms (first request, then every 12th refresh)")
+                print(f"  sampler refresh     {sampler.load_seconds * 1000:9.2f} ms (new ids only, every QUOTE_SAMPLER_REFRESH_SECONDS)")
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark(parse_args()))
@@ -0,0 +1,241 @@
+"""리포지토리 쿼리 실행 계획 점검 (EXPLAIN). 인덱스를 못 타고 테이블 전체를 읽는 쿼리가 있으면 exit 1.
+
+각 리포지토리 메서드를 실제로 호출해서 나가는 SQL(selectinload 후속 쿼리 포함)을 그대로 잡아 EXPLAIN 합니다.
+- MySQL: EXPLAIN의 type=ALL 인 실제 테이블 (파생 테이블 <derivedN> 제외)
+- SQLite: EXPLAIN QUERY PLAN의 "SCAN <table>" (USING INDEX / COVERING INDEX 없이)
+
+데이터가 적으면 옵티마이저가 인덱스 대신 전체 스캔을 고르므로 --seed로 가짜 데이터를 넣고 점검합니다.
+--seed 데이터는 하나의 트랜잭션 안에서만 쓰고 마지막에 롤백합니다 (DB에 남지 않음).
+
+Usage:
+    python scripts/check_query_plans.py --seed 5000
+    python scripts/check_query_plans.py --verbose
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+from datetime import datetime, timedelta
+
+# Add paths
+base_dir = os.path.dirname(os.path.abspath(__file__)) # backend/scripts
+backend_dir = os.path.abspath(os.path.join(base_dir, "..")) # backend
+sys.path.append(backend_dir)
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base, engine
+from app.models import Bookmark, Quote, QuoteDailyPopularity, Source, Tag, User
+from app.models.quote_tag import quote_tags
+from app.repositories import (
+    bookmark_repository,
+    quote_repository,
+    source_repository,
+    tag_repository,
+)
+
+SOURCE_TYPES = ["book", "movie", "drama", "tv", "speech", "other"]
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(.*)$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="EXPLAIN every repository query and fail on full table scans")
+    parser.add_argument("--seed", type=int, default=0, help="insert N fake quotes/bookmarks first (rolled back at the end)")
+    parser.add_argument("--verbose", action="store_true", help="print the full plan of every query")
+    return parser.parse_args()
+
+
+async def seed(db: AsyncSession, n: int) -> None:
+    # MySQL은 INSERT ... RETURNING이 없으므로 넣은 뒤 접두어로 id를 다시 읽음
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    await db.execute(insert(User), [
+        {"email": f"plan{i}@example.com", "username": f"plan{i}", "hashed_password": "x"} for i in range(max(10, n // 100))
+    ])
+    user_ids = (await db.execute(select(User.id).where(User.username.like("plan%")))).scalars().all()
+    await db.execute(insert(Source), [
+        {"title": f"Plan Source {i}", "creator": f"Plan Creator {i % 97}", "source_type": SOURCE_TYPES[i % len(SOURCE_TYPES)]}
+        for i in range(max(10, n // 20))
+    ])
+    source_types = dict((await db.execute(
+        select(Source.id, Source.source_type).where(Source.title.like("Plan Source %"))
+    )).all())
+    await db.execute(insert(Quote), [
+        {
+            "user_id": rng.choice(user_ids),
+            "source_id": rng.choice(list(source_types)),
+            "content": f"plan quote {i}",
+            "created_at": now - timedelta(minutes=rng.randrange(60 * 24 * 365)),
+        }
+        for i in range(n)
+    ])
+    quote_sources = dict((await db.execute(
+        select(Quote.id, Quote.source_id).where(Quote.content.like("plan quote %"))
+    )).all())
+    await db.execute(insert(Tag), [{"name": f"plan-tag-{i}"} for i in range(max(10, n // 50))])
+    tag_ids = (await db.execute(select(Tag.id).where(Tag.name.like("plan-tag-%")))).scalars().all()
+    await db.execute(insert(quote_tags), [
+        {"quote_id": quote_id, "tag_id": tag_id}
+        for quote_id in quote_sources
+        for tag_id in rng.sample(tag_ids, 2)
+    ])
+    quote_ids = list(quote_sources)
+    pairs = {(rng.choice(user_ids), rng.choice(quote_ids)) for _ in range(n)}
+    bookmarks = [
+        {"user_id": user_id, "quote_id": quote_id, "created_at": now - timedelta(minutes=rng.randrange(60 * 24 * 365))}
+        for user_id, quote_id in pairs
+    ]
+    await db.execute(insert(Bookmark), bookmarks)
+    await quote_repository.reconcile_bookmark_counts(db)
+    daily = {}
+    for bookmark in bookmarks:
+        key = (bookmark["created_at"].date(), source_types[quote_sources[bookmark["quote_id"]]], bookmark["quote_id"])
+        daily[key] = daily.get(key, 0) + 1
+    await db.execute(insert(QuoteDailyPopularity), [
+        {"date": day, "source_type": source_type, "quote_id": quote_id, "bookmark_count": count}
+        for (day, source_type, quote_id), count in daily.items()
+    ])
+
+
+async def sample_args(db: AsyncSession) -> dict:
+    """실제 데이터에서 쿼리에 넣을 값 고르기 (행이 가장 많은 유저/출처)."""
+    user_id = (await db.execute(
+        select(Bookmark.user_id).group_by(Bookmark.user_id).order_by(func.count().desc()).limit(1)
+    )).scalar()
+    uploader_id = (await db.execute(
+        select(Quote.user_id).group_by(Quote.user_id).order_by(func.count().desc()).limit(1)
+    )).scalar()
+    source = (await db.execute(select(Source).order_by(Source.id).limit(1))).scalar()
+    quote_ids = (await db.execute(select(Quote.id).order_by(Quote.id).limit(10))).scalars().all()
+    if user_id is None or uploader_id is None or source is None:
+        raise SystemExit("No data to check against; run with --seed N")
+    return {
+        "user_id": user_id,
+        "uploader_id": uploader_id,
+        "source_id": source.id,
+        "source_type": source.source_type,
+        "title": source.title,
+        "creator": source.creator,
+        "quote_ids": quote_ids,
+        "after": (datetime.utcnow() - timedelta(days=30), 2**31 - 1),
+    }
+
+
+def repository_queries(a: dict, mysql: bool) -> list:
+    """(이름, 호출, 전체 스캔이 예상되는 이유 또는 None)."""
+    ilike = None if mysql else "ILIKE '%q%' 검색, FULLTEXT 인덱스는 MySQL 전용"
+    return [
+        ("bookmark.get_by_user_id", lambda db: bookmark_repository.get_by_user_id(db, user_id=a["user_id"], limit=10), None),
+        ("bookmark.get_by_user_id(skip)", lambda db: bookmark_repository.get_by_user_id(db, user_id=a["user_id"], skip=20, limit=10), None),
+        ("bookmark.get_by_user_id(after)", lambda db: bookmark_repository.get_by_user_id(db, user_id=a["user_id"], limit=10, after=a["after"]), None),
+        ("bookmark.count_by_user_id", lambda db: bookmark_repository.count_by_user_id(db, user_id=a["user_id"]), None),
+        ("quote.get_by_user_id", lambda db: quote_repository.get_by_user_id(db, user_id=a["uploader_id"], limit=10), None),
+        ("quote.get_by_user_id(after)", lambda db: quote_repository.get_by_user_id(db, user_id=a["uploader_id"], limit=10, after=a["after"]), None),
+        ("quote.count_by_user_id", lambda db: quote_repository.count_by_user_id(db, user_id=a["uploader_id"]), None),
+        ("quote.get_by_source_id", lambda db: quote_repository.get_by_source_id(db, source_id=a["source_id"]), None),
+        ("quote.get_many", lambda db: quote_repository.get_many(db, a["quote_ids"]), None),
+        ("quote.get_by_content", lambda db: quote_repository.get_by_content(db, "plan quote 1"), None),
+        ("quote.get_latest_by_source_type", lambda db: quote_repository.get_latest_by_source_type(db, source_type=a["source_type"]), None),
+        ("quote.get_ids_with_source_type", lambda db: quote_repository.get_ids_with_source_type(db, after_id=a["quote_ids"][-1]), None),
+        ("quote.get_todays_most_popular_by_source_type", lambda db: quote_repository.get_todays_most_popular_by_source_type(db, source_type=a["source_type"]), None),
+        ("quote.get_most_bookmarked", lambda db: quote_repository.get_most_bookmarked(db), None),
+        ("quote.get_trending_keys", lambda db: quote_repository.get_trending_keys(db, quote_id=a["quote_ids"][0]), None),
+        ("source.get_by_title_and_creator", lambda db: source_repository.get_by_title_and_creator(db, title=a["title"], creator=a["creator"]), None),
+        ("source.get_many", lambda db: source_repository.get_many(db, [a["source_id"]]), None),
+        ("quote.search", lambda db: quote_repository.search(db, query="plan", limit=10), ilike),
+        ("source.search", lambda db: source_repository.search(db, query="plan", limit=10), ilike),
+        ("tag.get_id_names", lambda db: tag_repository.get_id_names(db), "태그 레지스트리 로드, 전체 태그를 읽음"),
+        ("tag.search", lambda db: tag_repository.search(db, query="plan", limit=10), ilike),
+    ]
+
+
+def full_scans(dialect: str, plan: list, tables: set) -> list:
+    scans = []
+    for row in plan:
+        if dialect == "mysql":
+            table = row.get("table") or ""
+            if row.get("type") == "ALL" and not table.startswith("<"):
+                scans.append(table)
+        else:
+            match = SQLITE_SCAN.match(row.get("detail", ""))
+            if match and match.group(1) in tables and "INDEX" not in match.group(2):
+                scans.append(match.group(1))
+    return scans
+
+
+def format_plan(dialect: str, plan: list) -> str:
+    if dialect == "mysql":
+        return "\n".join(
+            f"      {row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')} {row.get('Extra') or ''}"
+            for row in plan
+        )
+    return "\n".join(f"      {row.get('detail')}" for row in plan)
+
+
+async def run_check(args) -> int:
+    dialect = engine.dialect.name
+    explain = "EXPLAIN " if dialect == "mysql" else "EXPLAIN QUERY PLAN "
+    tables = set(Base.metadata.tables)
+
+    captured = []
+    capturing = False
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    failures = 0
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            if args.seed:
+                await seed(db, args.seed)
+            if dialect == "mysql":
+                for table in ("users", "sources", "quotes", "tags", "quote_tags", "bookmarks", "quote_daily_popularity"):
+                    await conn.exec_driver_sql(f"ANALYZE TABLE {table}")
+            a = await sample_args(db)
+
+            for name, call, expected in repository_queries(a, dialect == "mysql"):
+                captured.clear()
+                capturing = True
+                try:
+                    await call(db)
+                finally:
+                    capturing = False
+                db.expunge_all()  # 다음 호출의 selectinload가 identity map에 막히지 않도록
+
+                scans, plans = [], []
+                for statement, parameters in captured:
+                    result = await conn.exec_driver_sql(explain + statement, parameters)
+                    plan = [dict(row) for row in result.mappings()]
+                    plans.append(plan)
+                    scans += full_scans(dialect, plan, tables)
+
+                if not scans:
+                    status = "ok"
+                elif expected:
+                    status = f"expected ({expected})"
+                else:
+                    status = "FULL SCAN: " + ", ".join(sorted(set(scans)))
+                    failures += 1
+                print(f"{'FAIL' if status.startswith('FULL') else 'ok  '}  {name:<46} {status}")
+                if args.verbose or status.startswith("FULL"):
+                    for plan in plans:
+                        print(format_plan(dialect, plan))
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+    print()
+    print(f"{failures} quer{'y' if failures == 1 else 'ies'} fell back to a full table scan" if failures else "All repository queries use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_check(parse_args())))
@@ -0,0 +1,33 @@
+"""quotes.bookmark_count를 bookmarks 기준으로 보정합니다.
+
+북마크 추가/삭제 경로에서는 증분 갱신되지만, 경로를 거치지 않은 변경(직접 SQL 수정, 사용자 삭제에 의한 CASCADE 등)으로
+어긋날 수 있으므로 cron 등으로 주기적으로 실행합니다. 어긋난 행만 UPDATE 합니다.
+
+Usage:
+    python scripts/reconcile_quote_bookmark_counts.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Add paths
+base_dir = os.path.dirname(os.path.abspath(__file__)) # backend/scripts
+backend_dir = os.path.abspath(os.path.join(base_dir, "..")) # backend
+sys.path.append(backend_dir)
+
+from app.database import AsyncSessionLocal, engine
+from app.repositories import quote_repository
+
+
+async def run_reconcile():
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        fixed = await quote_repository.reconcile_bookmark_counts(db)
+        await db.commit()
+    await engine.dispose()
+    print(f"quotes.bookmark_count reconciled: {fixed} rows fixed in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_reconcile())
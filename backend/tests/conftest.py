@@ -10,6 +10,7 @@ from sqlalchemy_utils import create_database, database_exists, drop_database
 from main import app
 from app.database import Base, get_async_db
 from app.core.config import settings
+from app.services.tag_registry import tag_registry
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -23,6 +24,14 @@ def setup_test_db():
     drop_database(engine.url)
 
 
+@pytest.fixture(autouse=True)
+def reset_tag_registry():
+    # 테스트마다 DB를 새로 만들므로 프로세스 전역 레지스트리도 비움 (첫 사용 때 다시 로드)
+    tag_registry.reset()
+    yield
+    tag_registry.reset()
+
+
 @pytest.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     engine = create_async_engine(settings.database_url)
@@ -0,0 +1,235 @@
+import unicodedata
+
+import pytest
+import httpx
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, Source, Quote, Bookmark, QuoteDailyPopularity
+from app.core.auth import hash_password
+from app.repositories import quote_repository
+
+
+async def _bookmark_count(db_session: AsyncSession, quote_id: int) -> int:
+    quote = await db_session.get(Quote, quote_id, populate_existing=True)
+    return quote.bookmark_count
+
+
+@pytest.mark.asyncio
+async def test_bookmark_count_follows_toggle_and_delete(client: httpx.AsyncClient, db_session: AsyncSession):
+    user1 = User(email="countuser1@example.com", username="countuser1", hashed_password=hash_password("pw"))
+    user2 = User(email="countuser2@example.com", username="countuser2", hashed_password=hash_password("pw"))
+    source = Source(title="Count Book", source_type="book", creator="Count Author")
+    db_session.add_all([user1, user2, source])
+    await db_session.commit()
+    quote = Quote(user_id=user1.id, source_id=source.id, content="Count Quote")
+    db_session.add(quote)
+    await db_session.commit()
+
+    for user_id in [user1.id, user2.id]:
+        response = await client.post("/bookmark/toggle", json={"user_id": user_id, "quote_id": quote.id})
+        assert response.json()["bookmarked"] is True
+    assert await _bookmark_count(db_session, quote.id) == 2
+
+    response = await client.get("/recommendations/popular")
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [quote.id]
+    assert data[0]["bookmark_count"] == 2
+    assert data[0]["source_title"] == "Count Book"
+
+    response = await client.post("/bookmark/toggle", json={"user_id": user1.id, "quote_id": quote.id})
+    assert response.json()["bookmarked"] is False
+    assert await _bookmark_count(db_session, quote.id) == 1
+
+    response = await client.delete("/bookmark/", params={"user_id": user2.id, "quote_id": quote.id})
+    assert response.status_code == 200
+    assert await _bookmark_count(db_session, quote.id) == 0
+
+    response = await client.get("/recommendations/popular")
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_daily_popularity_uses_bookmark_created_at(client: httpx.AsyncClient, db_session: AsyncSession, monkeypatch):
+    user = User(email="dayuser@example.com", username="dayuser", hashed_password=hash_password("pw"))
+    source = Source(title="Day Book", source_type="book", creator="Day Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+    quote = Quote(user_id=user.id, source_id=source.id, content="Day Quote")
+    db_session.add(quote)
+    await db_session.commit()
+
+    # 앱 서버 시계가 DB 시계와 날짜가 어긋난 상황
+    class SkewedDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime(1999, 12, 31, 23, 59)
+
+    monkeypatch.setattr("app.services.bookmark.datetime", SkewedDatetime)
+
+    response = await client.post("/bookmark/toggle", json={"user_id": user.id, "quote_id": quote.id})
+    assert response.json()["bookmarked"] is True
+    bookmark = await db_session.get(Bookmark, (user.id, quote.id))
+
+    async def daily_counts():
+        rows = await db_session.execute(
+            select(QuoteDailyPopularity.date, QuoteDailyPopularity.bookmark_count)
+            .filter(QuoteDailyPopularity.quote_id == quote.id)
+            .execution_options(populate_existing=True)
+        )
+        return dict(rows.all())
+
+    assert await daily_counts() == {bookmark.created_at.date(): 1}
+
+    response = await client.post("/bookmark/toggle", json={"user_id": user.id, "quote_id": quote.id})
+    assert response.json()["bookmarked"] is False
+    assert await daily_counts() == {bookmark.created_at.date(): 0}
+
+
+@pytest.mark.asyncio
+async def test_reconcile_bookmark_counts_fixes_drift(db_session: AsyncSession):
+    user = User(email="driftuser@example.com", username="driftuser", hashed_password=hash_password("pw"))
+    source = Source(title="Drift Book", source_type="book", creator="Drift Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+    quote1 = Quote(user_id=user.id, source_id=source.id, content="Drift Quote 1")
+    quote2 = Quote(user_id=user.id, source_id=source.id, content="Drift Quote 2")
+    db_session.add_all([quote1, quote2])
+    await db_session.commit()
+    db_session.add(Bookmark(user_id=user.id, quote_id=quote1.id))
+    await db_session.commit()
+
+    # 카운터를 거치지 않은 쓰기로 어긋난 상태를 만듦
+    await db_session.execute(update(Quote).where(Quote.id == quote1.id).values(bookmark_count=5))
+    await db_session.execute(update(Quote).where(Quote.id == quote2.id).values(bookmark_count=3))
+    await db_session.commit()
+
+    fixed = await quote_repository.reconcile_bookmark_counts(db_session)
+    await db_session.commit()
+    assert fixed == 2
+    assert await _bookmark_count(db_session, quote1.id) == 1
+    assert await _bookmark_count(db_session, quote2.id) == 0
+
+    assert await quote_repository.reconcile_bookmark_counts(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_ai_quote_bookmark_updates_search_and_suggest(client: httpx.AsyncClient, db_session: AsyncSession):
+    from app.services.search_index import search_index
+    from app.services.suggest import suggest_service
+
+    user = User(email="aiindex@example.com", username="aiindexuser", hashed_password=hash_password("pw"))
+    db_session.add(user)
+    await db_session.commit()
+    await search_index.build(db_session)
+    await suggest_service.build(db_session)
+    try:
+        response = await client.post("/bookmark/toggle", json={
+            "user_id": user.id, "quote_id": 0,
+            "quote_data": {"content": "Stars shine brightest in darkness", "source_title": "Nightfall", "author": "AI Author"},
+        })
+        assert response.json()["bookmarked"] is True
+
+        # 새 문장/출처가 커밋 직후 인메모리 인덱스와 자동완성에 반영됨
+        quote = await quote_repository.get_by_content(db_session, "Stars shine brightest in darkness")
+        assert search_index.search_quotes("darkness") == [quote.id]
+        assert search_index.search_sources("nightfall") == [quote.source_id]
+        assert [item.id for item in suggest_service.suggest("nightf", kind="source")] == [quote.source_id]
+        response = await client.get("/search/", params={"q": "darkness"})
+        assert [item["id"] for item in response.json()["quotes"]] == [quote.id]
+    finally:
+        search_index.ready = False
+        suggest_service.ready = False
+
+
+@pytest.mark.asyncio
+async def test_ai_quote_bookmarks_reuse_one_row(client: httpx.AsyncClient, db_session: AsyncSession, monkeypatch):
+    users = [User(email=f"aidup{i}@example.com", username=f"aidup{i}", hashed_password=hash_password("pw")) for i in range(4)]
+    db_session.add_all(users)
+    await db_session.commit()
+
+    def ai_bookmark(user, content, title="Dup Title"):
+        return client.post("/bookmark/toggle", json={
+            "user_id": user.id, "quote_id": 0,
+            "quote_data": {"content": content, "source_title": title, "author": "Dup Author"},
+        })
+
+    async def quote_ids(content):
+        rows = await db_session.execute(select(Quote.id).filter(Quote.content.contains(content)))
+        return rows.scalars().all()
+
+    async def source_count():
+        return (await db_session.execute(select(func.count()).select_from(Source))).scalar_one()
+
+    # 같은 문구를 여러 번 (공백/정규화만 다르게) 북마크해도 문장/출처는 하나
+    assert (await ai_bookmark(users[0], "Be the change")).json()["bookmarked"] is True
+    assert (await ai_bookmark(users[1], "  Be   the change ")).json()["bookmarked"] is True
+    [quote_id] = await quote_ids("change")
+    assert await source_count() == 1
+    assert await _bookmark_count(db_session, quote_id) == 2
+
+    # 동시 토글에서 진 쪽: 조회 시점엔 없었지만 삽입은 unique 인덱스에 막힘 -> savepoint(새 출처 포함) 롤백 후 재조회
+    original_get_by_content = quote_repository.get_by_content
+    calls = []
+
+    async def get_by_content_losing_race(db, content):
+        calls.append(content)
+        if len(calls) == 1:
+            return None
+        return await original_get_by_content(db, content)
+
+    monkeypatch.setattr(quote_repository, "get_by_content", get_by_content_losing_race)
+    assert (await ai_bookmark(users[2], "Be the change", title="Race Title")).json()["bookmarked"] is True
+    monkeypatch.undo()
+    assert len(calls) == 2
+    assert await quote_ids("change") == [quote_id]
+    assert await source_count() == 1
+    assert await _bookmark_count(db_session, quote_id) == 3
+
+
+@pytest.mark.asyncio
+async def test_content_hash_moves_to_remaining_duplicate(client: httpx.AsyncClient, db_session: AsyncSession):
+    user = User(email="handover@example.com", username="handoveruser", hashed_password=hash_password("pw"))
+    source = Source(title="Handover Book", source_type="book", creator="Handover Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+
+    async def upload(content):
+        response = await client.post("/quote/", json={"content": content, "user_id": user.id, "source_id": source.id})
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    async def representative(content):
+        quote = await quote_repository.get_by_content(db_session, content)
+        return quote and quote.id
+
+    first = await upload("Stay hungry, stay foolish")
+    duplicate = await upload("Stay hungry,  stay foolish")
+    assert await representative("Stay hungry, stay foolish") == first
+
+    # 대표 문장의 내용을 바꾸면 남은 중복 문장이 대표가 됨
+    response = await client.put(f"/quote/{first}", json={"content": "Stay curious"})
+    assert response.status_code == 200
+    assert await representative("Stay hungry, stay foolish") == duplicate
+    assert await representative("Stay curious") == first
+
+    # 공백만 바뀐 수정은 대표 자리를 유지
+    response = await client.put(f"/quote/{first}", json={"content": "Stay  curious "})
+    assert await representative("Stay curious") == first
+
+    # 대표 문장을 지워도 남은 중복 문장이 대표가 됨
+    another = await upload("Stay hungry, stay foolish")
+    response = await client.delete(f"/quote/{duplicate}")
+    assert response.status_code == 200
+    assert await representative("Stay hungry, stay foolish") == another
+
+    # NFD로 저장된 중복 문장(macOS 입력 등)에도 대표 자리를 넘김
+    composed = unicodedata.normalize("NFC", "별 헤는 밤")
+    first = await upload(composed)
+    decomposed = await upload(unicodedata.normalize("NFD", composed))
+    assert await representative(composed) == first
+    response = await client.delete(f"/quote/{first}")
+    assert response.status_code == 200
+    assert await representative(composed) == decomposed
@@ -0,0 +1,294 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+import app.core.ai  # noqa: F401  (llm 폴더를 sys.path에 추가)
+import vertex_client
+from ai_service import AIService
+from aladin_cache import AladinCache
+from fake_clients import FakeAladinClient, FakeVertexAIClient
+from resilience import CircuitBreaker, TokenBucket
+from response_cache import CacheBackend, NamespacePolicy, TTLLRUCache
+from singleflight import SingleFlight
+from vertex_client import VertexAIClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+    class GetOnly(CacheBackend):
+        def get(self, namespace, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_ttl_lru_cache_expiry():
+    clock = FakeClock()
+    cache = TTLLRUCache(policies={"ns": NamespacePolicy(ttl=10, stale_ttl=5)}, clock=clock)
+    cache.set("ns", "k", "v")
+
+    clock.now += 9
+    assert cache.get("ns", "k") == "v"
+    # TTL이 지나면 get()은 miss, stale 창 안에서는 get_entry()가 (값, stale) 반환
+    clock.now += 2
+    assert cache.get("ns", "k") is None
+    assert cache.get_entry("ns", "k") == ("v", True)
+    # stale 창까지 지나면 삭제
+    clock.now += 5
+    assert cache.get_entry("ns", "k") is None
+    stats = cache.stats()["ns"]
+    assert stats["entries"] == 0
+    assert stats["expirations"] == 1
+    assert stats["stale_hits"] == 1
+
+    # set(ttl=...)은 네임스페이스 TTL보다 우선
+    cache.set("ns", "short", "v", ttl=1)
+    clock.now += 2
+    assert cache.get("ns", "short") is None
+
+
+def test_ttl_lru_cache_eviction():
+    clock = FakeClock()
+    cache = TTLLRUCache(policies={"ns": NamespacePolicy(ttl=60, max_entries=2, max_bytes=20)}, clock=clock)
+    cache.set("ns", "a", "1")
+    cache.set("ns", "b", "2")
+    assert cache.get("ns", "a") == "1"  # a가 최근 사용으로 이동
+
+    cache.set("ns", "c", "3")
+    assert cache.get("ns", "b") is None
+    assert cache.get("ns", "a") == "1"
+    assert cache.get("ns", "c") == "3"
+    assert cache.stats()["ns"]["evictions"] == 1
+
+    # 바이트 예산을 넘는 값은 저장하지 않고, 예산을 채우면 오래된 것부터 내보냄
+    cache.set("ns", "huge", "x" * 100)
+    assert cache.get("ns", "huge") is None
+    cache.set("ns", "d", "x" * 16)
+    assert cache.get("ns", "d") == "x" * 16
+    assert cache.stats()["ns"]["entries"] == 1
+    assert cache.stats()["ns"]["bytes"] <= 20
+
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[flight.do("key", load) for _ in range(5)])
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+    # 예외도 함께 기다리던 호출 모두에게 전달
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flight.do("bad", fail), flight.do("bad", fail), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+    # 먼저 시작한 호출이 취소돼도 작업은 계속되어 나머지가 결과를 받음
+    leader = asyncio.ensure_future(flight.do("shared", load))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("shared", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "value"
+    assert not flight.is_running("shared")
+
+
+@pytest.mark.asyncio
+async def test_ai_service_serves_stale_while_revalidating():
+    clock = FakeClock()
+    vertex = FakeVertexAIClient(latency_ms=10, latency_sigma=0, payloads={"daily": {"content": "first"}})
+    service = AIService(
+        project_id="test",
+        vertex_client=vertex,
+        aladin_client=FakeAladinClient(),
+        cache=TTLLRUCache(policies={"daily": NamespacePolicy(ttl=60, stale_ttl=10 ** 6)}, clock=clock),
+    )
+
+    # 처음 채울 때는 동시 요청이 LLM 호출 하나를 공유
+    results = await asyncio.gather(*[service.get_daily_quote("book") for _ in range(3)])
+    assert [result["content"] for result in results] == ["first"] * 3
+    assert vertex.calls == 1
+
+    # 만료 후에는 예전 값을 바로 돌려주고 백그라운드에서 한 번만 갱신
+    clock.now += 2 * 24 * 60 * 60
+    vertex.payloads["daily"] = {"content": "second"}
+    results = await asyncio.gather(*[service.get_daily_quote("book") for _ in range(3)])
+    assert [result["content"] for result in results] == ["first"] * 3
+    await asyncio.gather(*service._refresh_tasks)
+    assert vertex.calls == 2
+    assert (await service.get_daily_quote("book"))["content"] == "second"
+    await service.close()
+
+
+def test_circuit_breaker_transitions():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    # reset_timeout 후 probe 하나만 통과, 실패하면 다시 open
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # probe가 판정 없이 끝나면 슬롯을 돌려받고, 성공하면 closed
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+class FlakyModel:
+    """앞의 failures번은 503, 그 뒤로는 성공하는 가짜 모델. block=True면 응답 없이 대기."""
+
+    def __init__(self, failures: int = 0, block: bool = False):
+        self.failures = failures
+        self.block = block
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        if self.block:
+            await asyncio.Event().wait()
+        if self.calls <= self.failures:
+            raise ConnectionError("503 unavailable")
+        return type("Response", (), {"text": " ok "})()
+
+
+def _vertex_client(monkeypatch, model, clock, **kwargs) -> VertexAIClient:
+    monkeypatch.setattr(vertex_client, "_ensure_vertex_libs", lambda: (None, None, None, None))
+    client = VertexAIClient("test", rate_per_second=0, backoff_base=0, **kwargs)
+    client.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    client._model_cache[("m", client.location)] = model
+    return client
+
+
+@pytest.mark.asyncio
+async def test_vertex_client_counts_one_failure_per_call(monkeypatch):
+    clock = FakeClock()
+    model = FlakyModel(failures=3)
+    client = _vertex_client(monkeypatch, model, clock, max_retries=2)
+
+    # 재시도 세 번이 모두 실패해도 호출 하나의 실패로만 셈
+    assert await client.generate_content("p", model_name="m") is None
+    assert model.calls == 3
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert await client.generate_content("p", model_name="m") == "ok"
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+    model.failures, model.calls = 7, 0
+    assert await client.generate_content("p", model_name="m") is None
+    assert await client.generate_content("p", model_name="m") is None
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # half-open probe는 재시도하지 않고 실패하면 바로 다시 open
+    clock.now += 30
+    calls = model.calls
+    assert await client.generate_content("p", model_name="m") is None
+    assert model.calls == calls + 1
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_vertex_client_releases_cancelled_probe(monkeypatch):
+    clock = FakeClock()
+    model = FlakyModel(block=True)
+    client = _vertex_client(monkeypatch, model, clock, max_retries=0)
+    client.breaker.record_failure()
+    client.breaker.record_failure()
+    clock.now += 30
+
+    probe = asyncio.ensure_future(client.generate_content("p", model_name="m"))
+    await asyncio.sleep(0.01)
+    assert model.calls == 1
+    assert await client.generate_content("p", model_name="m") is None  # probe 진행 중에는 거절
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # 취소된 probe가 슬롯을 돌려줘서 다음 호출이 probe가 되고, 성공하면 closed
+    model.block = False
+    assert await client.generate_content("p", model_name="m") == "ok"
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=2)
+    started = time.monotonic()
+    await bucket.acquire()
+    await bucket.acquire()
+    assert time.monotonic() - started < 0.02  # 버스트는 토큰 하나 채우는 시간(20ms)보다 빨리 통과
+
+    # 버스트를 다 쓰면 초당 rate개로 제한 (3개 더 -> 약 60ms)
+    started = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.05
+
+    # rate=0이면 제한 없음
+    unlimited = TokenBucket(rate=0, capacity=0)
+    await asyncio.wait_for(unlimited.acquire(), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_aladin_cache_purges_expired_rows(tmp_path):
+    path = str(tmp_path / "aladin.sqlite3")
+
+    def row_count():
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM aladin_books").fetchone()[0]
+
+    # miss_ttl=0: 못 찾은 책은 저장하자마자 만료
+    cache = AladinCache(path, miss_ttl=0, purge_every=3)
+    await cache.set("Found", "Author", {"image": "cover.jpg", "link": "book.html"})
+    await cache.set("Missing 1", "Author", {})
+    assert row_count() == 2
+    assert await cache.get("Missing 1", "Author") is None
+
+    # purge_every번째 쓰기에서 만료 행 정리
+    await cache.set("Missing 2", "Author", {})
+    assert row_count() == 1
+    assert await cache.get("Found", "Author") == {"image": "cover.jpg", "link": "book.html"}
+
+    # 파일을 다시 열 때도 정리
+    await cache.set("Missing 3", "Author", {})
+    cache.close()
+    assert row_count() == 2
+    reopened = AladinCache(path, miss_ttl=0)
+    assert await reopened.get("Found", "Author") is not None
+    assert row_count() == 1
+    assert reopened.purge_expired() == 0
+    reopened.close()
@@ -1,9 +1,19 @@
+import asyncio
+import random
+import time
+
 import pytest
 import httpx
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
 
-from app.models import User, Source, Quote, Bookmark
+from app.models import User, Source, Quote, Bookmark, Tag, TrendingScore
 from app.core.auth import hash_password
+from app.repositories import quote_repository, tag_repository
+from app.services.quote_sampler import QuoteSampler
+from app.services.trending import trending_service
 
 @pytest.mark.asyncio
 async def test_get_popular_quotes(client: httpx.AsyncClient, db_session: AsyncSession):
@@ -83,4 +93,335 @@ async def test_create_quote_with_existing_source(client: httpx.AsyncClient):
     data = response.json()
     assert data["content"] == quote_data["content"]
     assert data["user_id"] == quote_data["user_id"]
-    assert data["source_id"] == source_id
\ No newline at end of file
+    assert data["source_id"] == source_id
+
+@pytest.mark.asyncio
+async def test_get_todays_popular_quote(client: httpx.AsyncClient, db_session: AsyncSession):
+    user1 = User(email="todayuser1@example.com", username="todayuser1", hashed_password=hash_password("pw"))
+    user2 = User(email="todayuser2@example.com", username="todayuser2", hashed_password=hash_password("pw"))
+    source = Source(title="Today Book", source_type="book", creator="Today Author")
+    db_session.add_all([user1, user2, source])
+    await db_session.commit()
+
+    quote1 = Quote(user_id=user1.id, source_id=source.id, content="Today Quote 1")
+    quote2 = Quote(user_id=user1.id, source_id=source.id, content="Today Quote 2")
+    db_session.add_all([quote1, quote2])
+    await db_session.commit()
+
+    # quote2 is bookmarked twice, quote1 once
+    for user_id, quote_id in [(user1.id, quote2.id), (user2.id, quote2.id), (user1.id, quote1.id)]:
+        response = await client.post("/bookmark/toggle", json={"user_id": user_id, "quote_id": quote_id})
+        assert response.status_code == 200
+        assert response.json()["bookmarked"] is True
+
+    response = await client.get("/quote/popular/today/book")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == quote2.id
+    assert data["title"] == "Today Book"
+
+    # Removing both bookmarks of quote2 makes quote1 the most popular one
+    for user_id in [user1.id, user2.id]:
+        response = await client.post("/bookmark/toggle", json={"user_id": user_id, "quote_id": quote2.id})
+        assert response.json()["bookmarked"] is False
+
+    response = await client.get("/quote/popular/today/book")
+    assert response.status_code == 200
+    assert response.json()["id"] == quote1.id
+
+
+@pytest.mark.asyncio
+async def test_get_user_quotes_cursor(client: httpx.AsyncClient, db_session: AsyncSession):
+    user = User(email="cursor@example.com", username="cursoruser", hashed_password=hash_password("password"))
+    source = Source(title="Cursor Book", source_type="book", creator="Cursor Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+
+    # 같은 created_at이 섞여 있어도 id로 순서가 고정되어야 함
+    same_time = datetime(2024, 1, 1, 12, 0, 0)
+    quotes = [
+        Quote(user_id=user.id, source_id=source.id, content=f"Cursor Quote {i}",
+              created_at=same_time if i < 3 else same_time + timedelta(minutes=i))
+        for i in range(5)
+    ]
+    db_session.add_all(quotes)
+    await db_session.commit()
+    expected = [q.id for q in sorted(quotes, key=lambda q: (q.created_at, q.id), reverse=True)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"size": 2, "with_total": True}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"/quote/user/{user.id}/cursor", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        assert data["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+    assert seen == expected
+
+    response = await client.get(f"/quote/user/{user.id}/cursor")
+    assert response.json()["total"] is None
+
+    response = await client.get(f"/quote/user/{user.id}/cursor", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_quote_created_at_is_required(db_session: AsyncSession):
+    # 커서 페이지의 정렬 키라서 NULL이면 커서로 인코딩할 수도, 다음 페이지 조건에 걸릴 수도 없음
+    user = User(email="nullcreated@example.com", username="nullcreateduser", hashed_password=hash_password("password"))
+    source = Source(title="Null Created Book", source_type="book", creator="Null Created Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+
+    quote = Quote(user_id=user.id, source_id=source.id, content="Default Created")
+    db_session.add(quote)
+    await db_session.commit()
+    assert quote.created_at is not None
+
+    with pytest.raises(IntegrityError):
+        await db_session.execute(
+            insert(Quote).values(user_id=user.id, source_id=source.id, content="Null Created", created_at=None)
+        )
+    await db_session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_get_trending_quotes(client: httpx.AsyncClient, db_session: AsyncSession):
+    trending_service.reset()
+    user1 = User(email="trenduser1@example.com", username="trenduser1", hashed_password=hash_password("pw"))
+    user2 = User(email="trenduser2@example.com", username="trenduser2", hashed_password=hash_password("pw"))
+    book = Source(title="Trend Book", source_type="book", creator="Trend Author")
+    movie = Source(title="Trend Movie", source_type="movie", creator="Trend Director")
+    tag = Tag(name="트렌드")
+    db_session.add_all([user1, user2, book, movie, tag])
+    await db_session.commit()
+    quote1 = Quote(user_id=user1.id, source_id=book.id, content="Trend Quote 1", tags=[tag])
+    quote2 = Quote(user_id=user1.id, source_id=movie.id, content="Trend Quote 2")
+    db_session.add_all([quote1, quote2])
+    await db_session.commit()
+
+    for user_id, quote_id in [(user1.id, quote2.id), (user2.id, quote2.id), (user1.id, quote1.id), (user2.id, quote1.id)]:
+        response = await client.post("/bookmark/toggle", json={"user_id": user_id, "quote_id": quote_id})
+        assert response.json()["bookmarked"] is True
+    # quote1의 북마크 하나 취소 -> quote2(2) > quote1(1)
+    response = await client.post("/bookmark/toggle", json={"user_id": user2.id, "quote_id": quote1.id})
+    assert response.json()["bookmarked"] is False
+
+    response = await client.get("/quote/trending")
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [quote2.id, quote1.id]
+    assert data[0]["score"] == pytest.approx(2, rel=1e-3)
+    assert data[1]["score"] == pytest.approx(1, rel=1e-3)
+
+    response = await client.get("/quote/trending", params={"source_type": "book"})
+    assert [item["id"] for item in response.json()] == [quote1.id]
+
+    response = await client.get("/quote/trending/tags")
+    assert response.json() == [{"id": tag.id, "name": "트렌드", "score": pytest.approx(1, rel=1e-3)}]
+
+    # 스냅샷 후 새 워커처럼 비운 상태에서 다시 로드해도 순위 유지
+    assert await trending_service.snapshot(db_session) > 0
+    trending_service.reset()
+    await trending_service.load(db_session)
+    response = await client.get("/quote/trending")
+    assert [item["id"] for item in response.json()] == [quote2.id, quote1.id]
+
+    # 반감기 전의 이벤트는 절반 가중치
+    trending_service.reset()
+    now = time.time()
+    trending_service.record(quote1.id, "book", delta=1, now=now - trending_service.half_life_seconds)
+    trending_service.record(quote2.id, "movie", delta=1, now=now)
+    assert trending_service.top_quotes(2) == [
+        (quote2.id, pytest.approx(1, rel=1e-3)),
+        (quote1.id, pytest.approx(0.5, rel=1e-3)),
+    ]
+
+    response = await client.delete(f"/quote/{quote2.id}")
+    assert response.status_code == 200
+    assert [quote_id for quote_id, _ in trending_service.top_quotes(2)] == [quote1.id]
+    trending_service.reset()
+
+
+@pytest.mark.asyncio
+async def test_deleted_quote_stays_out_of_trending(client: httpx.AsyncClient, db_session: AsyncSession):
+    trending_service.reset()
+    user = User(email="trenddel@example.com", username="trenddeluser", hashed_password=hash_password("pw"))
+    book = Source(title="Trend Delete Book", source_type="book", creator="Trend Delete Author")
+    db_session.add_all([user, book])
+    await db_session.commit()
+    quotes = [Quote(user_id=user.id, source_id=book.id, content=f"Trend Delete {i}") for i in range(4)]
+    db_session.add_all(quotes)
+    await db_session.commit()
+    kept, deleted, orphan, ghost = quotes
+
+    for i, quote in enumerate(quotes):
+        trending_service.record(quote.id, "book", delta=i + 1)
+    await trending_service.snapshot(db_session)
+    # 스냅샷 전의 증분이 남아 있는 상태에서 삭제
+    trending_service.record(deleted.id, "book", delta=5)
+
+    response = await client.delete(f"/quote/{deleted.id}")
+    assert response.status_code == 200
+    keys = (await db_session.execute(select(TrendingScore.scope).filter(TrendingScore.key == str(deleted.id)))).scalars()
+    assert list(keys) == []
+
+    # 다른 경로로 지워져 스냅샷 행이 남은 문장은 로드할 때 빠짐
+    await db_session.execute(delete(Quote).where(Quote.id == orphan.id))
+    await db_session.commit()
+    await trending_service.snapshot(db_session)
+    trending_service.reset()
+    await trending_service.load(db_session)
+    assert [quote_id for quote_id, _ in trending_service.top_quotes(10)] == [ghost.id, kept.id]
+    assert [quote_id for quote_id, _ in trending_service.top_quotes(10, source_type="book")] == [ghost.id, kept.id]
+
+    # 다른 워커에서 지워져 메모리에만 남은 문장은 빼고 limit을 채움
+    await db_session.execute(delete(Quote).where(Quote.id == ghost.id))
+    await db_session.commit()
+    trending_service.record(deleted.id, "book", delta=10)
+    response = await client.get("/quote/trending", params={"limit": 1})
+    assert [item["id"] for item in response.json()] == [kept.id]
+    trending_service.reset()
+
+
+@pytest.mark.asyncio
+async def test_random_quote_sampler(db_session: AsyncSession):
+    user = User(email="sampler@example.com", username="sampleruser", hashed_password=hash_password("pw"))
+    book = Source(title="Sampler Book", source_type="book", creator="Sampler Author")
+    movie = Source(title="Sampler Movie", source_type="movie", creator="Sampler Director")
+    db_session.add_all([user, book, movie])
+    await db_session.commit()
+    books = [Quote(user_id=user.id, source_id=book.id, content=f"Sampler Book Quote {i}") for i in range(6)]
+    movies = [Quote(user_id=user.id, source_id=movie.id, content=f"Sampler Movie Quote {i}") for i in range(2)]
+    db_session.add_all(books + movies)
+    await db_session.commit()
+    book_ids = {q.id for q in books}
+
+    sampler = QuoteSampler(refresh_seconds=3600, rng=random.Random(0))
+    for _ in range(10):
+        quotes = await sampler.sample(db_session, source_type="book", k=3)
+        assert len({q.id for q in quotes}) == 3
+        assert {q.id for q in quotes} <= book_ids
+    # 문장 수보다 많이 요청하면 있는 만큼
+    assert {q.id for q in await sampler.sample(db_session, source_type="movie", k=5)} == {q.id for q in movies}
+    assert await sampler.sample(db_session, source_type="drama", k=3) == []
+
+    # 새 문장은 증분 갱신 때 추가, 삭제된 문장은 뽑혔을 때 배열에서 빠짐
+    new_quote = Quote(user_id=user.id, source_id=movie.id, content="Sampler Movie Quote new")
+    db_session.add(new_quote)
+    await db_session.delete(movies[0])
+    await db_session.commit()
+    await sampler.refresh(db_session)
+    quotes = await sampler.sample(db_session, source_type="movie", k=5)
+    assert {q.id for q in quotes} == {movies[1].id, new_quote.id}
+    assert sampler.stats()["source_types"] == {"book": 6, "movie": 2}
+
+
+@pytest.mark.asyncio
+async def test_random_quote_sampler_concurrent_refresh(db_session: AsyncSession, monkeypatch):
+    user = User(email="samplerrace@example.com", username="samplerrace", hashed_password=hash_password("pw"))
+    book = Source(title="Race Book", source_type="book", creator="Race Author")
+    db_session.add_all([user, book])
+    await db_session.commit()
+    db_session.add_all([Quote(user_id=user.id, source_id=book.id, content=f"Race Quote {i}") for i in range(2)])
+    await db_session.commit()
+
+    sampler = QuoteSampler(refresh_seconds=3600, rng=random.Random(0))
+    await sampler.refresh(db_session)
+    db_session.add(Quote(user_id=user.id, source_id=book.id, content="Race Quote new"))
+    await db_session.commit()
+
+    # 두 요청이 동시에 만료를 보고 증분 갱신: DB 조회 중에 서로 끼어들도록 지연
+    original = quote_repository.get_ids_with_source_type
+    calls = []
+
+    async def slow_get_ids(db, *, after_id=0):
+        calls.append(after_id)
+        rows = await original(db, after_id=after_id)
+        await asyncio.sleep(0.01)
+        return rows
+
+    monkeypatch.setattr(quote_repository, "get_ids_with_source_type", slow_get_ids)
+    sampler.loaded_at = None
+    await asyncio.gather(sampler.refresh_if_stale(db_session), sampler.refresh_if_stale(db_session))
+    assert len(calls) == 1
+    assert sorted(sampler._ids["book"]) == sorted(set(sampler._ids["book"]))
+    assert sampler.stats()["source_types"] == {"book": 3}
+
+    # 배열에 중복이 있어도 sample_ids는 서로 다른 id만 돌려줌
+    sampler._ids["book"].append(sampler._ids["book"][0])
+    for _ in range(20):
+        ids = sampler.sample_ids("book", 4)
+        assert len(ids) == len(set(ids))
+
+
+@pytest.mark.asyncio
+async def test_create_and_update_quote_tags(client: httpx.AsyncClient, db_session: AsyncSession, monkeypatch):
+    user = User(email="taguser@example.com", username="taguser", hashed_password=hash_password("pw"))
+    source = Source(title="Tag Book", source_type="book", creator="Tag Author")
+    existing = Tag(name="기존")
+    db_session.add_all([user, source, existing])
+    await db_session.commit()
+
+    # 기존 태그 + 새 태그 + 중복 이름
+    response = await client.post("/quote/", json={
+        "content": "Tagged Quote", "user_id": user.id, "source_id": source.id, "tags": ["기존", "새태그", "기존"],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(tag["name"] for tag in data["tags"]) == ["기존", "새태그"]
+    assert existing.id in [tag["id"] for tag in data["tags"]]
+
+    response = await client.put(f"/quote/{data['id']}", json={"tags": ["새태그", "또다른"]})
+    assert response.status_code == 200
+    assert sorted(tag["name"] for tag in response.json()["tags"]) == ["또다른", "새태그"]
+
+    # 조회와 삽입 사이에 다른 요청이 같은 이름을 먼저 만든 경우: 충돌 후 재조회로 기존 행을 씀
+    original = tag_repository._get_by_names
+    calls = []
+
+    async def stale_first_lookup(db, names):
+        calls.append(names)
+        return [] if len(calls) == 1 else await original(db, names)
+
+    monkeypatch.setattr(tag_repository, "_get_by_names", stale_first_lookup)
+    tags = await tag_repository.get_or_create_many(db_session, ["기존", "경합"])
+    assert [tag.name for tag in tags] == ["기존", "경합"]
+    assert tags[0].id == existing.id
+
+
+@pytest.mark.asyncio
+async def test_quote_tags_ignore_name_case(client: httpx.AsyncClient, db_session: AsyncSession, monkeypatch):
+    from sqlalchemy import func, select
+
+    user = User(email="casetag@example.com", username="casetaguser", hashed_password=hash_password("pw"))
+    source = Source(title="Case Book", source_type="book", creator="Case Author")
+    hope = Tag(name="hope")
+    db_session.add_all([user, source, hope])
+    await db_session.commit()
+
+    # 대소문자만 다른 이름은 기존 태그를 재사용하고, 요청 안의 중복도 하나로
+    response = await client.post("/quote/", json={
+        "content": "Case Quote", "user_id": user.id, "source_id": source.id, "tags": ["Hope", "HOPE", "New", "new"],
+    })
+    assert response.status_code == 200
+    tags = sorted((tag["id"], tag["name"]) for tag in response.json()["tags"])
+    assert len(tags) == 2
+    assert tags[0] == (hope.id, "hope")
+
+    # 레지스트리를 거치지 않는 경로 + 대소문자 무시 콜레이션(MySQL 기본)의 IN 조회
+    async def collation_lookup(db, names):
+        statement = select(Tag).filter(func.lower(Tag.name).in_([name.lower() for name in names]))
+        return (await db.execute(statement)).scalars().all()
+
+    monkeypatch.setattr(tag_repository, "_get_by_names", collation_lookup)
+    created = await tag_repository.get_or_create_many(db_session, ["HoPe", "Fresh", "FRESH"])
+    assert created[0].id == hope.id
+    assert [tag.name for tag in created] == ["hope", "Fresh"]
+    await db_session.rollback()
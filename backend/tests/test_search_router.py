@@ -118,3 +118,337 @@ async def test_search(client: AsyncClient, db_session: AsyncSession):
     data = response.json()
     assert len(data["sources"]) == 1
     assert data["sources"][0]["title"] == "The Great Drama"
+
+
+@pytest.mark.asyncio
+async def test_search_suggest(client: AsyncClient, db_session: AsyncSession):
+    from app.services.suggest import suggest_service
+    suggest_service.ready = False  # 다른 테스트 DB로 빌드된 트라이 버리기
+
+    user = User(email="suggest@example.com", username="suggestuser", hashed_password=hash_password("password"))
+    db_session.add(user)
+    await db_session.commit()
+
+    source_prince = Source(title="어린 왕자", source_type="book", creator="생텍쥐페리")
+    source_demian = Source(title="데미안", source_type="book", creator="헤르만 헤세")
+    tag = Tag(name="우정")
+    db_session.add_all([source_prince, source_demian, tag])
+    await db_session.commit()
+    db_session.add(Quote(user_id=user.id, source_id=source_demian.id, content="새는 알에서 나오려고 투쟁한다."))
+    await db_session.commit()
+
+    # 초성만 입력
+    response = await client.get("/search/suggest", params={"q": "ㅇㄹㅇㅈ"})
+    assert response.status_code == 200
+    assert [item["text"] for item in response.json()] == ["어린 왕자"]
+
+    # 단어 중간부터 초성 입력
+    response = await client.get("/search/suggest", params={"q": "ㅇㅈ"})
+    assert {item["text"] for item in response.json()} == {"어린 왕자", "우정"}
+
+    # 조합 중인 음절 ("왕"을 치는 중의 "오")
+    response = await client.get("/search/suggest", params={"q": "어린 오"})
+    assert [item["text"] for item in response.json()] == ["어린 왕자"]
+
+    # 작가 이름으로 찾기
+    response = await client.get("/search/suggest", params={"q": "헤르"})
+    assert [item["id"] for item in response.json()] == [source_demian.id]
+
+    # 종류 필터
+    response = await client.get("/search/suggest", params={"q": "ㅇㅈ", "kind": "tag"})
+    assert [item["text"] for item in response.json()] == ["우정"]
+
+    # 태그 생성 시 증분 반영
+    response = await client.post("/tag/", json={"name": "우주"})
+    assert response.status_code == 200
+    response = await client.get("/search/suggest", params={"q": "ㅇㅈ", "kind": "tag"})
+    assert {item["text"] for item in response.json()} == {"우정", "우주"}
+
+    # 출처가 상위 K개(20)를 다 채워도 kind=tag 결과는 잘리지 않음
+    db_session.add_all([Source(title=f"우주 {i}", source_type="book", creator="Space Author") for i in range(25)])
+    await db_session.commit()
+    suggest_service.ready = False
+    response = await client.get("/search/suggest", params={"q": "ㅇㅈ", "kind": "tag", "limit": 20})
+    assert {item["text"] for item in response.json()} == {"우정", "우주"}
+    response = await client.get("/search/suggest", params={"q": "ㅇㅈ", "kind": "source", "limit": 20})
+    assert len(response.json()) == 20
+
+
+@pytest.mark.asyncio
+async def test_suggest_build_is_serialized_and_keeps_concurrent_writes(db_session: AsyncSession, monkeypatch):
+    import asyncio
+    from app.services.suggest import suggest_service
+
+    user = User(email="orbit@example.com", username="orbituser", hashed_password=hash_password("password"))
+    book = Source(title="Orbit Book", source_type="book", creator="Orbit Author")
+    atlas = Source(title="Orbital Atlas", source_type="book", creator="Atlas Author")
+    dropped = Source(title="Orbit Dropped", source_type="book", creator="Dropped Author")
+    db_session.add_all([user, book, atlas, dropped])
+    await db_session.commit()
+    db_session.add(Quote(user_id=user.id, source_id=atlas.id, content="orbital quote"))
+    await db_session.commit()
+
+    original_load_rows = suggest_service._load_rows
+    loads = []
+
+    async def load_rows_with_concurrent_writes(db):
+        loads.append(True)
+        await asyncio.sleep(0)  # 다른 첫 요청이 끼어들 틈
+        rows = await original_load_rows(db)
+        # DB를 읽은 뒤 교체 전에 다른 요청의 쓰기가 들어온 상황
+        suggest_service.index_source(99999, "Orbit Late", "Late Author", "book")
+        suggest_service.remove("source", dropped.id)
+        return rows
+
+    monkeypatch.setattr(suggest_service, "_load_rows", load_rows_with_concurrent_writes)
+    suggest_service.ready = False
+    try:
+        # 동시에 들어온 첫 요청들은 빌드를 한 번만 함
+        await asyncio.gather(suggest_service.ensure_built(db_session), suggest_service.ensure_built(db_session))
+        assert len(loads) == 1
+        ids = [item.id for item in suggest_service.suggest("orbit", kind="source")]
+        assert ids[0] == atlas.id  # 문장 수(weight) 순
+        assert set(ids) == {atlas.id, book.id, 99999}
+
+        # 재빌드하면 바뀐 문장 수가 순위에 반영됨
+        db_session.add_all([Quote(user_id=user.id, source_id=book.id, content=f"orbit quote {i}") for i in range(2)])
+        await db_session.commit()
+        monkeypatch.setattr(suggest_service, "_load_rows", original_load_rows)
+        await suggest_service.build(db_session)
+        assert [item.id for item in suggest_service.suggest("orbit", kind="source")][:2] == [book.id, atlas.id]
+    finally:
+        suggest_service.ready = False
+
+
+@pytest.mark.asyncio
+async def test_search_cache_invalidated_on_write(client: AsyncClient):
+    response = await client.post("/tag/", json={"name": "캐시테스트"})
+    assert response.status_code == 200
+
+    before = (await client.get("/search/cache/stats")).json()
+    response = await client.get("/search/", params={"q": "캐시테스"})
+    assert [tag["name"] for tag in response.json()["tags"]] == ["캐시테스트"]
+
+    # 같은 검색어(공백/대소문자만 다름)는 캐시에서 응답
+    response = await client.get("/search/", params={"q": " 캐시테스 "})
+    assert [tag["name"] for tag in response.json()["tags"]] == ["캐시테스트"]
+    after = (await client.get("/search/cache/stats")).json()
+    assert after["hits"] == before["hits"] + 1
+
+    # 태그가 추가되면 캐시 항목이 무효화되어 새 결과가 보임
+    response = await client.post("/tag/", json={"name": "캐시테스트2"})
+    assert response.status_code == 200
+    response = await client.get("/search/", params={"q": "캐시테스"})
+    assert {tag["name"] for tag in response.json()["tags"]} == {"캐시테스트", "캐시테스트2"}
+
+
+@pytest.mark.asyncio
+async def test_search_cache_bump_runs_off_event_loop(tmp_path):
+    import threading
+    from app.services.search_cache import SearchCache, SqliteSearchCacheBackend
+
+    # 두 워커가 같은 SQLite 파일을 공유하는 상황
+    path = str(tmp_path / "search_cache.sqlite3")
+    worker1 = SearchCache(SqliteSearchCacheBackend(path, max_entries=10), ttl=60)
+    worker2 = SearchCache(SqliteSearchCacheBackend(path, max_entries=10), ttl=60)
+    await worker1.set("key", "value", await worker1.versions())
+    assert await worker2.get("key") == "value"
+
+    bump_threads = []
+    original_bump = worker1.backend.bump
+
+    def recording_bump(entity):
+        bump_threads.append(threading.get_ident())
+        original_bump(entity)
+
+    worker1.backend.bump = recording_bump
+    await worker1.bump("quote", "tag")
+    assert len(bump_threads) == 2
+    assert threading.get_ident() not in bump_threads  # SQLite I/O는 이벤트 루프 밖에서
+    # 다른 워커의 bump로 무효화됨
+    assert await worker2.get("key") is None
+    assert (await worker2.versions())["quote"] == 1
+
+
+def test_inverted_index_bm25_ranking_and_updates():
+    from app.services.search_index import InvertedIndex
+
+    index = InvertedIndex()
+    index.add(1, "사랑은 모든 것을 견디고 모든 것을 바라며 끝까지 함께 간다", attr=1)
+    index.add(2, "사랑 사랑 사랑", attr=2)
+    index.add(3, "이별의 노래", attr=1)
+
+    # 짧고 검색어가 자주 나오는 문서가 먼저, 모든 토큰을 포함한 문서만 (AND)
+    assert index.search("사랑") == [2, 1]
+    assert index.search("사랑 노래") == []
+    assert index.search("사랑", attr=1) == [1]
+    # 동점이면 최신 id 우선, offset/limit
+    index.add(4, "사랑 사랑 사랑", attr=2)
+    assert index.search("사랑", limit=2) == [4, 2]
+    assert index.search("사랑", limit=2, offset=2) == [1]
+
+    # 수정(다시 add)과 삭제
+    index.add(2, "이별 이별", attr=2)
+    assert index.search("사랑") == [4, 1]
+    assert index.search("이별") == [2, 3]
+    index.remove(4)
+    assert index.search("사랑") == [1]
+    assert len(index) == 3
+
+    # compact 후에도 결과는 같음
+    index.compact()
+    assert index.stats()["deleted"] == 0
+    assert index.search("사랑") == [1]
+    assert index.search("이별") == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_search_index_incremental_refresh(db_session: AsyncSession, monkeypatch):
+    import asyncio
+    from app.services.search_index import search_index
+
+    user = User(email="index@example.com", username="indexuser", hashed_password=hash_password("password"))
+    source = Source(title="Index Book", source_type="book", creator="Index Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+    kept = Quote(user_id=user.id, source_id=source.id, content="lighthouse keeper")
+    removed = Quote(user_id=user.id, source_id=source.id, content="lighthouse storm")
+    db_session.add_all([kept, removed])
+    await db_session.commit()
+
+    try:
+        await search_index.build(db_session)
+        assert search_index.search_quotes("lighthouse") == [removed.id, kept.id]
+
+        # 커밋 후 refresh/remove가 바로 반영됨
+        kept.content = "lighthouse keeper at dawn"
+        await db_session.commit()
+        await search_index.refresh_quote(db_session, kept.id)
+        assert search_index.search_quotes("dawn") == [kept.id]
+        await db_session.delete(removed)
+        await db_session.commit()
+        search_index.remove_quote(removed.id)
+        assert search_index.search_quotes("lighthouse") == [kept.id]
+        source.title = "Harbor Book"
+        await db_session.commit()
+        await search_index.refresh_source(db_session, source.id)
+        assert search_index.search_sources("harbor") == [source.id]
+        search_index.refresh_tag(999, "beacon")
+        assert search_index.search_tags("beacon") == [999]
+
+        # 재빌드가 DB를 읽은 뒤 새 인덱스로 교체하기 전에 다른 요청의 쓰기가 들어온 상황
+        added = Quote(user_id=user.id, source_id=source.id, content="lighthouse beam")
+        original_to_thread = asyncio.to_thread
+        injected = []
+
+        async def to_thread_with_concurrent_writes(func, *args, **kwargs):
+            if not injected:
+                injected.append(True)
+                db_session.add(added)
+                await db_session.commit()
+                await search_index.refresh_quote(db_session, added.id)
+                await db_session.delete(kept)
+                await db_session.commit()
+                search_index.remove_quote(kept.id)
+            return await original_to_thread(func, *args, **kwargs)
+
+        monkeypatch.setattr(asyncio, "to_thread", to_thread_with_concurrent_writes)
+        await search_index.build(db_session)
+        monkeypatch.undo()
+        assert injected
+        assert search_index.search_quotes("lighthouse") == [added.id]
+    finally:
+        search_index.ready = False
+
+
+async def _seed_deadline_data(db_session: AsyncSession):
+    user = User(email="deadline@example.com", username="deadlineuser", hashed_password=hash_password("password"))
+    source = Source(title="Deadline Book", source_type="book", creator="Deadline Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+    db_session.add(Quote(user_id=user.id, source_id=source.id, content="Deadline Quote"))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_partial_on_timeout_and_error(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    import asyncio
+    from app.core.config import settings
+    from app.repositories import quote_repository, source_repository
+
+    await _seed_deadline_data(db_session)
+    monkeypatch.setattr(settings, "search_timeout_seconds", 0.2)
+    original_quote_search = quote_repository.search
+
+    # 기한을 넘긴 하위 쿼리는 취소되고 나머지 결과만 partial로 반환
+    async def slow_search(*args, **kwargs):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(quote_repository, "search", slow_search)
+    response = await client.get("/search/", params={"q": "Deadline"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["partial"] is True
+    assert data["quotes"] == []
+    assert [source["title"] for source in data["sources"]] == ["Deadline Book"]
+
+    # 예외가 난 하위 쿼리도 빈 결과 + partial (500이 아님)
+    monkeypatch.setattr(quote_repository, "search", original_quote_search)
+
+    async def broken_search(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(source_repository, "search", broken_search)
+    response = await client.get("/search/", params={"q": "Deadline"})
+    data = response.json()
+    assert data["partial"] is True
+    assert [quote["content"] for quote in data["quotes"]] == ["Deadline Quote"]
+    assert [source["title"] for source in data["sources"]] == ["Deadline Book"]  # 문장의 출처로는 포함
+
+    # partial 결과는 캐시되지 않아서 복구 후 바로 전체 결과
+    monkeypatch.undo()
+    response = await client.get("/search/", params={"q": "Deadline"})
+    assert response.json()["partial"] is False
+
+
+@pytest.mark.asyncio
+async def test_search_on_connection_bound_session(db_session: AsyncSession, monkeypatch):
+    import asyncio
+    from app.core.config import settings
+    from app.repositories import quote_repository
+    from app.services.search import search_service
+
+    # 바깥 트랜잭션 안에서(커밋 전 데이터) 커넥션에 묶인 세션으로 검색하면 같은 세션에서 순서대로 실행
+    async with db_session.bind.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            user = User(email="bound@example.com", username="bounduser", hashed_password=hash_password("password"))
+            source = Source(title="Bound Book", source_type="book", creator="Bound Author")
+            session.add_all([user, source])
+            await session.flush()
+            session.add_all([Quote(user_id=user.id, source_id=source.id, content="Bound Quote"), Tag(name="bound")])
+            await session.flush()
+
+            result = await search_service._search(session, "bound", None, 1, 10)
+            assert result.partial is False
+            assert [quote.content for quote in result.quotes] == ["Bound Quote"]
+            assert [source.title for source in result.sources] == ["Bound Book"]
+            assert [tag.name for tag in result.tags] == ["bound"]
+
+            # 순차 실행에서는 기한이 지나면 남은 하위 쿼리를 건너뜀
+            monkeypatch.setattr(settings, "search_timeout_seconds", 0.05)
+            original_quote_search = quote_repository.search
+
+            async def slow_search(*args, **kwargs):
+                await asyncio.sleep(0.1)
+                return await original_quote_search(*args, **kwargs)
+
+            monkeypatch.setattr(quote_repository, "search", slow_search)
+            result = await search_service._search(session, "bound", None, 1, 10)
+            assert result.partial is True
+            assert [quote.content for quote in result.quotes] == ["Bound Quote"]
+            assert result.tags == []
+        finally:
+            await session.close()
+            await transaction.rollback()
@@ -0,0 +1,125 @@
+import pytest
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, Source, Quote, Tag
+from app.core.auth import hash_password
+from app.repositories import registry_version_repository
+from app.services.tag_registry import tag_registry
+
+
+class StatementCounter:
+    def __init__(self, db_session: AsyncSession):
+        self.engine = db_session.bind.sync_engine
+        self.statements = []
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._capture)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._capture)
+
+
+@pytest.mark.asyncio
+async def test_tag_registry_serves_reads_from_memory(client: httpx.AsyncClient, db_session: AsyncSession):
+    for name in ["사랑", "사람", "우정"]:
+        response = await client.post("/tag/", json={"name": name})
+        assert response.status_code == 200
+    love_id = response.json()["id"] - 2
+
+    # 첫 조회 때 로드된 뒤로는 목록/단건/접두어 조회가 SQL을 내보내지 않음
+    await client.get("/tag/")
+    with StatementCounter(db_session) as counter:
+        response = await client.get("/tag/")
+        assert [tag["name"] for tag in response.json()] == ["사랑", "사람", "우정"]
+        response = await client.get(f"/tag/{love_id}")
+        assert response.json()["name"] == "사랑"
+        response = await client.get("/tag/", params={"prefix": "사"})
+        assert sorted(tag["name"] for tag in response.json()) == ["사람", "사랑"]
+        assert (await client.get("/tag/999")).status_code == 404
+    assert counter.statements == []
+
+    # 라우트의 쓰기는 바로 반영 (write-through)되고 버전도 따라감
+    response = await client.put(f"/tag/{love_id}", json={"name": "연애"})
+    assert response.status_code == 200
+    response = await client.delete(f"/tag/{love_id + 2}")
+    assert response.status_code == 200
+    assert [tag["name"] for tag in (await client.get("/tag/")).json()] == ["연애", "사람"]
+    assert tag_registry.version == await registry_version_repository.get_version(db_session, name="tags")
+
+
+@pytest.mark.asyncio
+async def test_tag_registry_syncs_changes_from_other_workers(client: httpx.AsyncClient, db_session: AsyncSession):
+    response = await client.post("/tag/", json={"name": "기쁨"})
+    assert response.status_code == 200
+    await tag_registry.ensure_loaded(db_session)
+
+    # 다른 워커가 태그를 만든 상황: DB와 버전만 바뀌고 이 워커의 레지스트리는 모름
+    db_session.add(Tag(name="슬픔"))
+    await registry_version_repository.bump(db_session, name="tags")
+    await db_session.commit()
+    assert [tag["name"] for tag in (await client.get("/tag/")).json()] == ["기쁨"]
+
+    assert await tag_registry.sync(db_session) is True
+    assert [tag["name"] for tag in (await client.get("/tag/")).json()] == ["기쁨", "슬픔"]
+    assert await tag_registry.sync(db_session) is False
+
+    # 문장 저장 시 태그 이름은 레지스트리로 해석하고, 새로 만든 태그는 커밋 후 추가됨
+    user = User(email="registry@example.com", username="registryuser", hashed_password=hash_password("pw"))
+    source = Source(title="Registry Book", source_type="book", creator="Registry Author")
+    db_session.add_all([user, source])
+    await db_session.commit()
+    response = await client.post("/quote/", json={
+        "content": "Registry Quote", "user_id": user.id, "source_id": source.id, "tags": ["슬픔", "분노"],
+    })
+    assert response.status_code == 200
+    assert sorted(tag["name"] for tag in response.json()["tags"]) == ["분노", "슬픔"]
+    assert [tag["name"] for tag in (await client.get("/tag/")).json()] == ["기쁨", "슬픔", "분노"]
+
+
+@pytest.mark.asyncio
+async def test_search_reads_tags_from_registry(client: httpx.AsyncClient, db_session: AsyncSession):
+    db_session.add_all([Tag(name="Hope"), Tag(name="hopeless"), Tag(name="fear")])
+    await db_session.commit()
+    await tag_registry.ensure_loaded(db_session)
+
+    with StatementCounter(db_session) as counter:
+        response = await client.get("/search/", params={"q": "hope"})
+    assert response.status_code == 200
+    assert [tag["name"] for tag in response.json()["tags"]] == ["Hope", "hopeless"]
+    assert not any("FROM tags" in statement for statement in counter.statements)
+
+
+@pytest.mark.asyncio
+async def test_tag_endpoints_statement_upper_bound(client: httpx.AsyncClient, db_session: AsyncSession):
+    # 태그 하나에 문장 30개, 각 문장에 다른 태그도 달려 있어도 엔드포인트별 SQL 수는 일정해야 함
+    user = User(email="lean@example.com", username="leanuser", hashed_password=hash_password("pw"))
+    source = Source(title="Lean Book", source_type="book", creator="Lean Author")
+    tag = Tag(name="popular")
+    others = [Tag(name=f"other{i}") for i in range(3)]
+    db_session.add_all([user, source, tag, *others])
+    await db_session.commit()
+    db_session.add_all([
+        Quote(user_id=user.id, source_id=source.id, content=f"Lean Quote {i}", tags=[tag, *others])
+        for i in range(30)
+    ])
+    await db_session.commit()
+    db_session.expunge_all()
+
+    async def count(method, url, **kwargs):
+        tag_registry.reset()  # 레지스트리 로드까지 포함한 최악의 경우
+        with StatementCounter(db_session) as counter:
+            response = await client.request(method, url, **kwargs)
+        assert response.status_code == 200, response.text
+        return len(counter.statements)
+
+    assert await count("GET", "/tag/") <= 2
+    assert await count("GET", f"/tag/{tag.id}") <= 2
+    assert await count("GET", "/search/", params={"q": "popular"}) <= 8
+    assert await count("PUT", f"/tag/{tag.id}", json={"name": "popular!"}) <= 9
+    assert await count("DELETE", f"/tag/{tag.id}") <= 7
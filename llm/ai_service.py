@@ -1,14 +1,18 @@
 import logging
 import json
 import asyncio
+import aiohttp
 import hashlib
 import random
 import urllib.parse
-from datetime import datetime
-from typing import Any, Optional, List, Dict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, List, Dict, Hashable, Set
 
 from vertex_client import VertexAIClient, _ensure_vertex_libs
 from aladin_client import AladinClient
+from aladin_cache import AladinCache
+from response_cache import CacheBackend, TTLLRUCache
+from singleflight import SingleFlight
 from prompts import (
     BOOK_RECOMMENDATION_PROMPT,
     DAILY_QUOTE_PROMPT,
@@ -19,17 +23,95 @@ from prompts import (
 logger = logging.getLogger(__name__)
 
 class AIService:
-    def __init__(self, project_id: str, location: str = "us-central1", aladin_api_key: str = ""):
+    def __init__(
+        self,
+        project_id: str,
+        location: str = "us-central1",
+        aladin_api_key: str = "",
+        cache: Optional[CacheBackend] = None,
+        http_session: Optional[aiohttp.ClientSession] = None,
+        aladin_cache: Optional[AladinCache] = None,
+        vertex_options: Optional[Dict[str, Any]] = None,
+        vertex_client: Optional[Any] = None,
+        aladin_client: Optional[Any] = None,
+    ):
         # Force us-central1 for Gemini 2.0 stability as per user's previous stable state
-        self.vertex = VertexAIClient(project_id, "us-central1")
-        self.aladin = AladinClient(aladin_api_key)
-        self._cache = {}
+        # vertex_client/aladin_client allow stand-ins (e.g. fake_clients for load tests)
+        self.vertex = vertex_client or VertexAIClient(project_id, "us-central1", **(vertex_options or {}))
+        self.aladin = aladin_client or AladinClient(aladin_api_key, session=http_session, cache=aladin_cache)
+        # Bounded TTL/LRU cache; namespaces: "books", "daily", "recom_pool"
+        self.cache = cache or TTLLRUCache()
+        # Identical in-flight prompts/cache fills share one Vertex call
+        self._inflight = SingleFlight()
+        # Background stale-while-revalidate refreshes (kept referenced until done)
+        self._refresh_tasks: Set[asyncio.Task] = set()
         logger.info("AIService Initialized (Refactored).")
 
-    def _get_cache_key(self, prefix: str, *args) -> tuple:
-        return (prefix, *args)
+    def is_available(self) -> bool:
+        """False while Vertex is failing fast (circuit open); callers should use DB fallbacks."""
+        return self.vertex.is_available()
+
+    def set_http_session(self, session: Optional[aiohttp.ClientSession]) -> None:
+        """Attach the application-wide HTTP session to every HTTP client used by the service."""
+        self.aladin.session = session
+
+    async def close(self) -> None:
+        """Cancel pending background refreshes and release the Aladin cache file. The HTTP session is owned by the caller."""
+        tasks = list(self._refresh_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        aladin_cache = getattr(self.aladin, "cache", None)
+        if aladin_cache is not None:
+            aladin_cache.close()
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        return {**self.cache.stats(), "singleflight": self._inflight.stats()}
+
+    async def _cached(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        bypass_cache: bool = False,
+    ) -> Any:
+        """Serve from cache with stale-while-revalidate; fill misses through single-flight.
+
+        A stale entry is returned immediately and refreshed in the background, so only keys
+        that have never been cached (or fell out of the stale window) wait on the LLM.
+        The loader is responsible for writing successful results to the cache.
+        """
+        flight_key = (namespace, key)
+        if not bypass_cache:
+            hit = self.cache.get_entry(namespace, key)
+            if hit is not None:
+                value, is_stale = hit
+                if is_stale:
+                    self._schedule_refresh(flight_key, loader)
+                return value
+        return await self._inflight.do(flight_key, loader)
+
+    def _schedule_refresh(self, flight_key: tuple, loader: Callable[[], Awaitable[Any]]) -> None:
+        if self._inflight.is_running(flight_key):
+            return
+        task = asyncio.ensure_future(self._inflight.do(flight_key, loader))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
 
     async def _generate_json(self, prompt: str, model_name: str = "gemini-2.0-flash") -> Any:
+        """Generate and parse JSON, coalescing identical concurrent prompts."""
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        return await self._inflight.do(
+            ("json", model_name, digest),
+            lambda: self._generate_json_once(prompt, model_name),
+        )
+
+    async def _generate_json_once(self, prompt: str, model_name: str) -> Any:
         """Helper to generate and parse JSON safely."""
         logger.info(f"Generating JSON with model {model_name}. Prompt length: {len(prompt)}")
         try:
@@ -49,11 +131,13 @@ class AIService:
             if text.startswith("```json"): text = text[7:]
             if text.endswith("```"): text = text[:-3]
             
-            # Find JSON boundaries
-            start = text.find('[') if '[' in text else text.find('{')
-            end = text.rfind(']') if ']' in text else text.rfind('}')
-            if start != -1 and end != -1:
-                text = text[start : end + 1]
+            # Find JSON boundaries (whichever bracket opens first, so an object holding a list stays whole)
+            starts = [i for i in (text.find('['), text.find('{')) if i != -1]
+            if starts:
+                start = min(starts)
+                end = text.rfind(']' if text[start] == '[' else '}')
+                if end != -1:
+                    text = text[start : end + 1]
             
             parsed = json.loads(text)
             logger.info(f"Successfully parsed AI response. Type: {type(parsed)}")
@@ -65,16 +149,21 @@ class AIService:
             return None
 
     async def generate_book_recommendations(self, user_context: str, bypass_cache: bool = False) -> List[Dict]:
-        time_window = datetime.now().strftime("%Y-%m-%d-%H")
-        cache_key = self._get_cache_key("books", time_window, user_context[:100])
-        
-        if not bypass_cache and cache_key in self._cache:
-            return self._cache[cache_key]
+        # Expiry is handled by the cache TTL (about an hour, jittered per key)
+        cache_key = (user_context[:100],)
+        books = await self._cached(
+            "books",
+            cache_key,
+            lambda: self._load_book_recommendations(user_context, cache_key),
+            bypass_cache=bypass_cache,
+        )
+        return books or []
 
+    async def _load_book_recommendations(self, user_context: str, cache_key: tuple) -> List[Dict]:
         prompt = BOOK_RECOMMENDATION_PROMPT.format(
             user_context=user_context or "신규 사용자입니다. 명작을 추천해주세요."
         )
-        
+
         books = await self._generate_json(prompt, model_name="gemini-2.0-flash")
         if not books:
             return []
@@ -82,29 +171,32 @@ class AIService:
         if not isinstance(books, list):
             books = [books] if isinstance(books, dict) else []
 
-        # Enrich with Aladin info in parallel
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            tasks = [self.aladin.fetch_book_info(b.get('title', ''), b.get('author', ''), session) for b in books]
-            aladin_results = await asyncio.gather(*tasks)
-            
-            for book, info in zip(books, aladin_results):
-                book['image'] = info.get('image', '')
-                book['link'] = info.get('link') or f"https://www.aladin.co.kr/search/wsearchresult.aspx?SearchWord={urllib.parse.quote(book.get('title', ''))}"
+        # Enrich with Aladin info in parallel (over the shared keep-alive session)
+        tasks = [self.aladin.fetch_book_info(b.get('title', ''), b.get('author', '')) for b in books]
+        aladin_results = await asyncio.gather(*tasks)
+
+        for book, info in zip(books, aladin_results):
+            book['image'] = info.get('image', '')
+            book['link'] = info.get('link') or f"https://www.aladin.co.kr/search/wsearchresult.aspx?SearchWord={urllib.parse.quote(book.get('title', ''))}"
 
-        self._cache[cache_key] = books
+        self.cache.set("books", cache_key, books)
         return books
 
     async def get_daily_quote(self, source_type: str) -> Dict:
-        today = datetime.now().strftime("%Y-%m-%d")
-        cache_key = self._get_cache_key("daily", source_type, today)
-        
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        # Keyed without the date so yesterday's quote can be served while today's is generated
+        cache_key = (source_type,)
+        return await self._cached(
+            "daily",
+            cache_key,
+            lambda: self._load_daily_quote(source_type, cache_key),
+        )
 
+    async def _load_daily_quote(self, source_type: str, cache_key: tuple) -> Dict:
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
         prompt = DAILY_QUOTE_PROMPT.format(source_type=source_type, today=today)
         quote = await self._generate_json(prompt)
-        
+
         if not quote:
             # Absolute fallback
             return {
@@ -115,25 +207,22 @@ class AIService:
                 "tags": ["희망", "시"]
             }
 
-        self._cache[cache_key] = quote
+        # Expire at the next local midnight
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self.cache.set("daily", cache_key, quote, ttl=(next_midnight - now).total_seconds())
         return quote
 
     async def get_recommendations(self, source_type: str, limit: int = 3, user_context: str = "") -> List[Dict]:
-        time_window = datetime.now().strftime("%Y-%m-%d-%H")
         context_hash = hashlib.md5(user_context.encode()).hexdigest() if user_context else "default"
-        cache_key = self._get_cache_key("recom_pool", source_type, time_window, context_hash)
+        # Expiry is handled by the cache TTL (about an hour, jittered per key)
+        cache_key = (source_type, context_hash)
 
-        if cache_key in self._cache:
-            pool = self._cache[cache_key]
-        else:
-            prompt = GENERIC_RECOMMENDATION_PROMPT.format(
-                pool_size=limit, # Match limit for precise mixture ratio
-                user_context=user_context or "General audience", 
-                source_type=source_type
-            )
-            pool = await self._generate_json(prompt)
-            if not pool: return []
-            self._cache[cache_key] = pool
+        pool = await self._cached(
+            "recom_pool",
+            cache_key,
+            lambda: self._load_recommendation_pool(source_type, limit, user_context, cache_key),
+        )
+        if not pool: return []
 
         if not isinstance(pool, list): pool = [pool] if isinstance(pool, dict) else []
         
@@ -151,6 +240,17 @@ class AIService:
             
         return selected
 
+    async def _load_recommendation_pool(self, source_type: str, limit: int, user_context: str, cache_key: tuple) -> Any:
+        prompt = GENERIC_RECOMMENDATION_PROMPT.format(
+            pool_size=limit, # Match limit for precise mixture ratio
+            user_context=user_context or "General audience", 
+            source_type=source_type
+        )
+        pool = await self._generate_json(prompt)
+        if pool:
+            self.cache.set("recom_pool", cache_key, pool)
+        return pool
+
     async def get_related_quotes(self, current_quote_content: str, limit: int = 3) -> List[Dict]:
         prompt = RELATED_QUOTE_PROMPT.format(
             current_quote_content=current_quote_content,
@@ -165,7 +265,8 @@ class AIService:
             q = f"{item.get('source_title', '')} {item.get('author', '')}".strip()
             item['link'] = f"https://www.aladin.co.kr/search/wsearchresult.aspx?SearchWord={urllib.parse.quote(q)}"
             item['image'] = ""
-            
+        return related
+
     async def evaluate_relevance(self, user_context: str, recommendation: Dict) -> Dict:
         """Evaluates the relevance of a recommendation for a given user context."""
         prompt = f"""
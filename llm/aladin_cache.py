@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_book_key(title: str, author: str) -> str:
+    """Normalize (title, author) so trivial spacing/case/width differences share one cache row."""
+    def norm(value: str) -> str:
+        value = unicodedata.normalize("NFKC", value or "").lower()
+        return re.sub(r"\s+", " ", value).strip()
+
+    return f"{norm(title)}\x1f{norm(author)}"
+
+
+class AladinCache:
+    """Durable cover/link cache for Aladin lookups backed by a local SQLite file.
+
+    Found books are kept for `hit_ttl` seconds; lookups that returned no item are recorded as
+    misses (negative cache) for `miss_ttl` seconds so unknown books are not searched repeatedly.
+    Transport errors are never cached. The file can be shared by several worker processes.
+    Expired rows are purged when the file is opened and after every `purge_every` writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        hit_ttl: float = 30 * 24 * 60 * 60,
+        miss_ttl: float = 24 * 60 * 60,
+        purge_every: int = 500,
+    ):
+        self.path = path
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS aladin_books (
+                    book_key TEXT PRIMARY KEY,
+                    image TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    found INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_aladin_books_expires_at ON aladin_books (expires_at)")
+            self._purge(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _purge(conn: sqlite3.Connection) -> int:
+        deleted = conn.execute("DELETE FROM aladin_books WHERE expires_at <= ?", (time.time(),)).rowcount
+        conn.commit()
+        return deleted
+
+    def _get_sync(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT image, link, expires_at FROM aladin_books WHERE book_key = ?", (key,)
+            ).fetchone()
+        if row is None or row[2] <= time.time():
+            return None
+        return {"image": row[0], "link": row[1]}
+
+    def _set_sync(self, key: str, info: dict, found: bool) -> None:
+        ttl = self.hit_ttl if found else self.miss_ttl
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO aladin_books (book_key, image, link, found, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, info.get("image", ""), info.get("link", ""), int(found), time.time() + ttl),
+            )
+            conn.commit()
+            self._writes += 1
+            if self.purge_every and self._writes % self.purge_every == 0:
+                self._purge(conn)
+
+    async def get(self, title: str, author: str) -> Optional[dict]:
+        """Return the cached {"image", "link"} (empty strings for a recorded miss), or None."""
+        try:
+            return await asyncio.to_thread(self._get_sync, normalize_book_key(title, author))
+        except sqlite3.Error as e:
+            logger.warning(f"Aladin cache read failed: {e}")
+            return None
+
+    async def set(self, title: str, author: str, info: dict) -> None:
+        found = bool(info.get("image") or info.get("link"))
+        try:
+            await asyncio.to_thread(self._set_sync, normalize_book_key(title, author), info, found)
+        except sqlite3.Error as e:
+            logger.warning(f"Aladin cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(self._connect())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -3,18 +3,34 @@ import json
 import aiohttp
 from typing import Any, Optional
 
+from aladin_cache import AladinCache
+
 logger = logging.getLogger(__name__)
 
 class AladinClient:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[AladinCache] = None,
+    ):
         self.api_key = api_key
         self.base_url = "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx"
+        # Shared, application-owned session (see http_session.create_http_session)
+        self.session = session
+        # Durable (title, author) -> cover/link cache; only cache misses go to the network
+        self.cache = cache
 
     async def fetch_book_info(self, title: str, author: str, session: Optional[aiohttp.ClientSession] = None) -> dict:
         """Fetch book cover and link from Aladin API."""
         if not self.api_key:
             return {"image": "", "link": ""}
-        
+
+        if self.cache:
+            cached = await self.cache.get(title, author)
+            if cached is not None:
+                return cached
+
         query = f"{title} {author}".strip()
         params = {
             "ttbkey": self.api_key,
@@ -27,20 +43,30 @@ class AladinClient:
             "Version": "20131101"
         }
 
+        session = session or self.session
         try:
-            if session:
-                return await self._do_fetch(session, params)
+            if session and not session.closed:
+                info = await self._do_fetch(session, params)
             else:
+                # Fallback for scripts that run without the app lifespan
                 async with aiohttp.ClientSession() as new_session:
-                    return await self._do_fetch(new_session, params)
+                    info = await self._do_fetch(new_session, params)
         except Exception as e:
             logger.warning(f"Aladin API error for {query}: {e}")
             return {"image": "", "link": ""}
 
-    async def _do_fetch(self, session: aiohttp.ClientSession, params: dict) -> dict:
+        if info is None:
+            # Transport/HTTP error: not cached so the next request retries
+            return {"image": "", "link": ""}
+        if self.cache:
+            await self.cache.set(title, author, info)
+        return info
+
+    async def _do_fetch(self, session: aiohttp.ClientSession, params: dict) -> Optional[dict]:
+        """Return cover/link info (empty strings when no item matched), or None on HTTP errors."""
         async with session.get(self.base_url, params=params, timeout=5) as response:
             if response.status != 200:
-                return {"image": "", "link": ""}
+                return None
             
             data = await response.json()
             items = data.get("item", [])
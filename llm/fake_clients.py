@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Deterministic stand-ins for VertexAIClient / AladinClient, used for load testing the AI
+# endpoints without spending Gemini quota (AI_BACKEND=fake).
+
+CANNED_QUOTES: List[Dict[str, Any]] = [
+    {"content": "우리는 모두 시궁창에 있지만, 우리 중 몇몇은 별을 바라보고 있다.", "source_title": "윈더미어 부인의 부채", "author": "오스카 와일드", "tags": ["희망", "별"]},
+    {"content": "새는 알에서 나오려고 투쟁한다. 알은 세계이다.", "source_title": "데미안", "author": "헤르만 헤세", "tags": ["성장", "용기"]},
+    {"content": "어른들은 누구나 처음엔 어린이였다. 그러나 그것을 기억하는 어른은 별로 없다.", "source_title": "어린 왕자", "author": "생텍쥐페리", "tags": ["동심", "기억"]},
+    {"content": "가장 훌륭한 시는 아직 쓰여지지 않았다.", "source_title": "진정한 여행", "author": "나짐 히크메트", "tags": ["희망", "시"]},
+    {"content": "너의 장미꽃을 그토록 소중하게 만든 건 그 꽃을 위해 네가 소비한 시간이란다.", "source_title": "어린 왕자", "author": "생텍쥐페리", "tags": ["사랑", "시간"]},
+    {"content": "인간은 패배하도록 만들어지지 않았다. 파괴될 수는 있어도 패배하지는 않는다.", "source_title": "노인과 바다", "author": "어니스트 헤밍웨이", "tags": ["의지", "용기"]},
+]
+
+CANNED_BOOKS: List[Dict[str, Any]] = [
+    {"title": "데미안", "author": "헤르만 헤세", "reason": "자기 자신에게 이르는 길을 그린 성장 소설입니다."},
+    {"title": "채식주의자", "author": "한강", "reason": "폭력과 욕망에 대한 강렬한 질문을 던집니다."},
+    {"title": "아몬드", "author": "손원평", "reason": "감정을 배우는 소년의 따뜻한 이야기입니다."},
+    {"title": "노인과 바다", "author": "어니스트 헤밍웨이", "reason": "짧지만 깊은 인간 의지의 기록입니다."},
+    {"title": "달러구트 꿈 백화점", "author": "이미예", "reason": "꿈을 사고파는 상상력이 돋보이는 판타지입니다."},
+]
+
+MALFORMED_PAYLOADS: List[str] = [
+    '```json\n[{"content": "잘린 응답입니다", "source_title": ',
+    "죄송합니다. 요청하신 내용을 처리할 수 없습니다.",
+    '{"content": "따옴표가 닫히지 않은 응답}',
+    "",
+]
+
+
+class LatencyModel:
+    """Log-normal latency around `median_ms`; `sigma=0` gives a fixed delay."""
+
+    def __init__(self, median_ms: float, sigma: float = 0.0, rng: Optional[random.Random] = None):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.rng = rng or random.Random(0)
+
+    def sample(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return self.median_ms * math.exp(self.rng.gauss(0, self.sigma)) / 1000
+
+
+class FakeVertexAIClient:
+    """Drop-in replacement for VertexAIClient returning canned JSON after a simulated delay.
+
+    error_rate: fraction of calls that fail (returns None, like the real client after retries).
+    malformed_rate: fraction of calls that return text the JSON parser must reject or repair.
+    payloads: optional overrides keyed by prompt kind ("books", "daily", "recom_pool", "related").
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_ms: float = 800,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        payloads: Optional[Dict[str, Any]] = None,
+    ):
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency_ms, latency_sigma, self.rng)
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.payloads = payloads or {}
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    @staticmethod
+    def _prompt_kind(prompt: str) -> str:
+        if "book curator" in prompt:
+            return "books"
+        if "creative muse" in prompt:
+            return "related"
+        if "for today" in prompt:
+            return "daily"
+        return "recom_pool"
+
+    def _payload(self, kind: str) -> Any:
+        if kind in self.payloads:
+            return self.payloads[kind]
+        if kind == "books":
+            return [dict(b) for b in CANNED_BOOKS]
+        if kind == "daily":
+            return dict(self.rng.choice(CANNED_QUOTES))
+        return [dict(q, source_type="book") for q in self.rng.sample(CANNED_QUOTES, 3)]
+
+    async def generate_content(self, prompt: str, model_name: str = "gemini-2.0-flash", **kwargs) -> Optional[str]:
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+
+        roll = self.rng.random()
+        if roll < self.error_rate:
+            logger.warning("FakeVertexAIClient: simulated generation error")
+            return None
+        if roll < self.error_rate + self.malformed_rate:
+            return self.rng.choice(MALFORMED_PAYLOADS)
+
+        payload = self._payload(self._prompt_kind(prompt))
+        return payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+
+
+class FakeAladinClient:
+    """Drop-in replacement for AladinClient returning deterministic cover/link URLs."""
+
+    def __init__(self, seed: int = 0, latency_ms: float = 150, latency_sigma: float = 0.3, error_rate: float = 0.0):
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency_ms, latency_sigma, self.rng)
+        self.error_rate = error_rate
+        self.session = None
+        self.cache = None
+        self.calls = 0
+
+    async def fetch_book_info(self, title: str, author: str, session: Any = None) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+        if self.rng.random() < self.error_rate:
+            return {"image": "", "link": ""}
+        digest = hashlib.md5(f"{title}|{author}".encode()).hexdigest()[:12]
+        return {
+            "image": f"https://image.aladin.co.kr/product/fake/cover500/{digest}.jpg",
+            "link": f"https://www.aladin.co.kr/shop/wproduct.aspx?ItemId={int(digest, 16) % 10**9}",
+        }
@@ -0,0 +1,32 @@
+import logging
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_session(
+    limit: int = 100,
+    limit_per_host: int = 20,
+    keepalive_timeout: float = 30,
+    dns_cache_ttl: int = 300,
+    total_timeout: float = 10,
+) -> aiohttp.ClientSession:
+    """Create the long-lived, application-wide aiohttp session used by the llm/ HTTP clients.
+
+    Must be called from a running event loop (e.g. the FastAPI lifespan) and closed on shutdown.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+        use_dns_cache=True,
+    )
+    logger.info(
+        f"Shared HTTP session created: limit={limit}, limit_per_host={limit_per_host}, "
+        f"keepalive={keepalive_timeout}s, dns_ttl={dns_cache_ttl}s"
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=total_timeout),
+    )
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_GRPC_CODES = {"UNAVAILABLE", "RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED", "INTERNAL", "ABORTED"}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "BadGateway",
+    "GatewayTimeout",
+    "DeadlineExceeded",
+    "Aborted",
+}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether an LLM/API error is transient (rate limit, 5xx, timeout, connection reset)."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    code = getattr(error, "code", None)
+    if callable(code):  # grpc errors expose code() returning a StatusCode
+        return getattr(code(), "name", "") in RETRYABLE_GRPC_CODES
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `capacity` burst."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed -> open after `failure_threshold` consecutive failures; while open every call is
+    rejected immediately. After `reset_timeout` seconds one probe call is let through
+    (half-open); its success closes the circuit, its failure re-opens it.
+
+    Callers report one verdict per logical call (after their own retries), so
+    `failure_threshold` counts failed calls, not attempts.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info("Circuit breaker closed.")
+        self._failures = 0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(f"Circuit breaker opened after {self._failures} consecutive failures.")
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot that ended without a success/failure verdict."""
+        self._probe_in_flight = False
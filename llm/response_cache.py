@@ -0,0 +1,205 @@
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NamespacePolicy:
+    """TTL and size limits applied to a single cache namespace.
+
+    stale_ttl: how long after expiry an entry may still be served (stale-while-revalidate).
+    jitter: fraction of the TTL randomly added/subtracted per entry so keys don't expire together.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None,
+        stale_ttl: float = 0,
+        jitter: float = 0,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.jitter = jitter
+
+
+# Namespaces used by AIService
+DEFAULT_POLICIES: Dict[str, NamespacePolicy] = {
+    "books": NamespacePolicy(
+        ttl=60 * 60, max_entries=512, max_bytes=4 * 1024 * 1024, stale_ttl=6 * 60 * 60, jitter=0.1
+    ),
+    "daily": NamespacePolicy(ttl=24 * 60 * 60, max_entries=32, stale_ttl=2 * 60 * 60, jitter=0.01),
+    "recom_pool": NamespacePolicy(
+        ttl=60 * 60, max_entries=1024, max_bytes=8 * 1024 * 1024, stale_ttl=6 * 60 * 60, jitter=0.1
+    ),
+}
+
+
+class CacheBackend(ABC):
+    """Interface for AIService response caches."""
+
+    @abstractmethod
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        ...
+
+    def get_entry(self, namespace: str, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """Return (value, is_stale), or None. Backends without stale support never report stale."""
+        value = self.get(namespace, key)
+        return None if value is None else (value, False)
+
+    @abstractmethod
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, namespace: str, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        ...
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until", "size")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory cost of a JSON-like LLM payload."""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class TTLLRUCache(CacheBackend):
+    """In-process cache with per-namespace TTL, entry/byte budgets and LRU eviction."""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, NamespacePolicy]] = None,
+        default_policy: Optional[NamespacePolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.default_policy = default_policy or NamespacePolicy(ttl=60 * 60, max_entries=256)
+        self._clock = clock
+        self._data: Dict[str, "OrderedDict[Hashable, _Entry]"] = {}
+        self._bytes: Dict[str, int] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _policy(self, namespace: str) -> NamespacePolicy:
+        return self.policies.get(namespace, self.default_policy)
+
+    def _bucket(self, namespace: str) -> "OrderedDict[Hashable, _Entry]":
+        if namespace not in self._data:
+            self._data[namespace] = OrderedDict()
+            self._bytes[namespace] = 0
+            self._counters[namespace] = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        return self._data[namespace]
+
+    def _drop(self, namespace: str, key: Hashable) -> None:
+        entry = self._data[namespace].pop(key)
+        self._bytes[namespace] -= entry.size
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        hit = self.get_entry(namespace, key, allow_stale=False)
+        return None if hit is None else hit[0]
+
+    def get_entry(self, namespace: str, key: Hashable, allow_stale: bool = True) -> Optional[Tuple[Any, bool]]:
+        bucket = self._bucket(namespace)
+        counters = self._counters[namespace]
+        entry = bucket.get(key)
+        if entry is None:
+            counters["misses"] += 1
+            return None
+        now = self._clock()
+        if entry.stale_until <= now:
+            self._drop(namespace, key)
+            counters["expirations"] += 1
+            counters["misses"] += 1
+            return None
+        is_stale = entry.expires_at <= now
+        if is_stale and not allow_stale:
+            counters["misses"] += 1
+            return None
+        bucket.move_to_end(key)
+        counters["stale_hits" if is_stale else "hits"] += 1
+        return entry.value, is_stale
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        policy = self._policy(namespace)
+        bucket = self._bucket(namespace)
+        if key in bucket:
+            self._drop(namespace, key)
+
+        size = _estimate_size(value)
+        if policy.max_bytes is not None and size > policy.max_bytes:
+            logger.warning(f"Cache value for namespace '{namespace}' exceeds byte budget ({size} bytes). Not cached.")
+            return
+
+        ttl = policy.ttl if ttl is None else ttl
+        if policy.jitter:
+            ttl *= 1 + random.uniform(-policy.jitter, policy.jitter)
+        expires_at = self._clock() + ttl
+        bucket[key] = _Entry(value, expires_at, expires_at + policy.stale_ttl, size)
+        self._bytes[namespace] += size
+        self._evict(namespace, policy)
+
+    def _evict(self, namespace: str, policy: NamespacePolicy) -> None:
+        bucket = self._data[namespace]
+        counters = self._counters[namespace]
+
+        def over_budget() -> bool:
+            return len(bucket) > policy.max_entries or (
+                policy.max_bytes is not None and self._bytes[namespace] > policy.max_bytes
+            )
+
+        if not over_budget():
+            return
+
+        # Expired entries go first so they don't push out live ones
+        now = self._clock()
+        for key in [k for k, e in bucket.items() if e.stale_until <= now]:
+            self._drop(namespace, key)
+            counters["expirations"] += 1
+
+        while bucket and over_budget():
+            oldest = next(iter(bucket))
+            self._drop(namespace, oldest)
+            counters["evictions"] += 1
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        if key in self._bucket(namespace):
+            self._drop(namespace, key)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        namespaces = [namespace] if namespace else list(self._data)
+        for ns in namespaces:
+            if ns in self._data:
+                self._data[ns].clear()
+                self._bytes[ns] = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            ns: {**self._counters[ns], "entries": len(bucket), "bytes": self._bytes[ns]}
+            for ns, bucket in self._data.items()
+        }
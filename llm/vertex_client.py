@@ -2,6 +2,8 @@ import logging
 import asyncio
 from typing import Any, Optional
 
+from resilience import CircuitBreaker, TokenBucket, backoff_delay, is_retryable_error
+
 logger = logging.getLogger(__name__)
 
 # Cache for libraries to avoid repeated imports
@@ -30,11 +32,37 @@ def _ensure_vertex_libs():
         return False
 
 class VertexAIClient:
-    def __init__(self, project_id: str, location: str = "us-central1"):
+    def __init__(
+        self,
+        project_id: str,
+        location: str = "us-central1",
+        max_concurrency: int = 8,
+        rate_per_second: float = 5,
+        burst: int = 10,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8,
+        request_timeout: float = 30,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 30,
+    ):
         self.project_id = project_id
         self.location = location
         self._model_cache = {}
 
+        # Resilience: bounded concurrency, rate limiting, retries, circuit breaker
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_timeout = request_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limiter = TokenBucket(rate_per_second, burst)
+        self.breaker = CircuitBreaker(breaker_failure_threshold, breaker_reset_timeout)
+
+    def is_available(self) -> bool:
+        """False while the circuit is open, so callers can skip straight to their fallback."""
+        return self.breaker.state != CircuitBreaker.OPEN
+
     def get_model(self, model_name: str = "gemini-2.0-flash") -> Optional[Any]:
         """Initialize and return a GenerativeModel instance."""
         libs = _ensure_vertex_libs()
@@ -67,14 +95,54 @@ class VertexAIClient:
             return None
 
     async def generate_content(self, prompt: str, model_name: str = "gemini-2.0-flash", **kwargs) -> Optional[str]:
-        """Wrapper for async content generation."""
-        model = self.get_model(model_name)
-        if not model:
+        """Wrapper for async content generation.
+
+        Returns None immediately while the circuit breaker is open. Transient errors
+        (429/5xx/timeouts) are retried with jittered exponential backoff; the breaker sees
+        one success/failure per call, not per attempt. A half-open probe is not retried,
+        and a probe that ends without a verdict (bad request, cancellation) gives its slot back.
+        """
+        if not self.breaker.allow():
+            logger.warning("Vertex AI circuit open. Skipping generation.")
             return None
-        
+        probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+        settled = False
+
         try:
-            response = await model.generate_content_async(prompt, **kwargs)
-            return response.text.strip()
-        except Exception as e:
-            logger.error(f"Vertex AI generation error: {e}")
+            model = self.get_model(model_name)
+            if not model:
+                return None
+
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with self._semaphore:
+                        await self._rate_limiter.acquire()
+                        response = await asyncio.wait_for(
+                            model.generate_content_async(prompt, **kwargs), timeout=self.request_timeout
+                        )
+                    text = response.text.strip()
+                except Exception as e:
+                    if not is_retryable_error(e):
+                        # Bad request, blocked response, etc. Vertex itself is healthy.
+                        logger.error(f"Vertex AI generation error: {e}")
+                        return None
+
+                    # Stop early if this is the probe or another call has already opened the circuit
+                    if attempt >= self.max_retries or probe or self.breaker.state != CircuitBreaker.CLOSED:
+                        logger.error(f"Vertex AI generation failed after {attempt + 1} attempt(s): {e!r}")
+                        settled = True
+                        self.breaker.record_failure()
+                        return None
+
+                    delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                    logger.warning(f"Vertex AI transient error ({e!r}). Retrying in {delay:.2f}s.")
+                    await asyncio.sleep(delay)
+                else:
+                    settled = True
+                    self.breaker.record_success()
+                    return text
             return None
+        finally:
+            # CancelledError is a BaseException, so this also covers a cancelled probe
+            if probe and not settled:
+                self.breaker.release_probe()